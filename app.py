@@ -1,84 +1,193 @@
-import requests
+import math
 import random
 import os
-from flask import Flask, render_template, jsonify
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context
 from datetime import datetime, timedelta
 import json
 from dotenv import load_dotenv
+import threading
 import time
+from functools import partial
+from utils.cache import TTLCache, make_cache_key
+from utils.cache_backends import build_cache
+from utils.singleflight import SingleFlight, fetch_with_cache
+from utils.refresher import MarketDataRefresher, RefreshJob
+from utils.crypto_api import fetch_prices_batch
+from utils import http_client
+from utils.fanout import fan_out
+from utils.scoring import SentimentScorer
+from utils.twitter_collector import TwitterCollector
+from utils.sentiment_stream import CallableSource, ReplaySource, SentimentStream
+from utils.broadcast import Broadcaster
+from utils.shared_snapshot import SharedPriceSnapshot
+from utils.render_cache import RenderCache, conditional_response
+from utils.rate_budget import BACKGROUND, CRITICAL, priority, with_priority
+from utils import lazy
+from utils import metrics
+from utils.responses import FastJSONProvider, columnar, init_compression
+from models.timeseries import PriceHistoryStore, upstream_resolution_ms
+from models.portfolio import PortfolioBook
+from models.price_matrix import BASE_CURRENCY, PriceMatrix
+from models.records import NewsArticle, ScoredPost, TradingSignal, Tweet
+from utils import analytics
+from utils import backtest
 
 # Charger les variables d'environnement
 load_dotenv()
 
 app = Flask(__name__)
+# Durée et statut de chaque requête (exportés sur /metrics)
+metrics.instrument_app(app)
 
-# Initialiser l'IA
-analyzer = SentimentIntensityAnalyzer()
+# JSON rapide (orjson si installé) ; les enregistrements compacts (models.records)
+# sont sérialisés via leur to_dict()
+app.json = FastJSONProvider(app)
 
-# Cache simple pour éviter trop de requêtes API
-price_cache = {'timestamp': None, 'data': None}
-history_cache = {'timestamp': None, 'data': None}
+# Compression gzip/brotli des réponses selon l'Accept-Encoding du client
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+if COMPRESSION_ENABLED:
+    init_compression(app, min_size=COMPRESS_MIN_SIZE, level=COMPRESS_LEVEL)
+
+# Initialiser l'IA (scores VADER mémorisés et calculés en lot) ; le lexique
+# n'est chargé qu'au premier texte scoré
+scorer = SentimentScorer.from_env()
+
+# Cache par crypto (clé : endpoint, coin_id, paramètres) pour éviter trop de requêtes API
 CACHE_DURATION = 10  # 10 secondes pour plus de réactivité
 HISTORY_CACHE_DURATION = 300  # 5 minutes pour l'historique
+MARKET_CACHE_SIZE = int(os.getenv('MARKET_CACHE_SIZE', 256))
+# Backend : 'memory' (par processus), 'filesystem' (par serveur) ou 'redis' (partagé entre serveurs)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory').lower()
+market_cache = build_cache(CACHE_BACKEND, max_size=MARKET_CACHE_SIZE, default_ttl=CACHE_DURATION,
+                           directory=os.getenv('CACHE_DIR'), redis_url=os.getenv('REDIS_URL'),
+                           prefix=os.getenv('CACHE_KEY_PREFIX', 'crypto-saas:'))
+
+# Stale-while-revalidate : durée pendant laquelle une valeur expirée reste servie
+# pendant qu'un seul rafraîchissement tourne en arrière-plan
+PRICE_STALE_DURATION = int(os.getenv('PRICE_STALE_DURATION', 60))
+HISTORY_STALE_DURATION = int(os.getenv('HISTORY_STALE_DURATION', 900))
+
+# Un seul appel CoinGecko en cours par clé de cache
+upstream_flight = SingleFlight()
+
+# Dernière valeur obtenue par clé, gardée après la fenêtre stale : servie quand
+# l'amont échoue (ou que son disjoncteur est ouvert) plutôt que le fallback simulé
+LAST_GOOD_TTL = int(os.getenv('LAST_GOOD_TTL', 86400))
+last_good = TTLCache(max_size=MARKET_CACHE_SIZE, default_ttl=LAST_GOOD_TTL)
+
+def remember_good(key, value):
+    """Mémorise la dernière valeur valide de `key` et la retourne"""
+    last_good.set(key, value)
+    return value
+
+# Stockage local des séries de prix (SQLite par défaut) : seules les plages manquantes
+# sont demandées à CoinGecko, et l'historique survit aux redémarrages
+HISTORY_STORE_ENABLED = os.getenv('HISTORY_STORE_ENABLED', 'true').lower() == 'true'
+HISTORY_MAX_POINTS = int(os.getenv('HISTORY_MAX_POINTS', 1000))
+HISTORY_SYNC_TOLERANCE_MS = HISTORY_CACHE_DURATION * 1000
+history_store = PriceHistoryStore(os.getenv('DATABASE_URL', 'sqlite:///crypto_saas.db')) if HISTORY_STORE_ENABLED else None
 
 # --- FONCTION NOUVELLE : HISTORIQUE RÉEL ---
-def get_real_history(coin_id='bitcoin'):
-    """Récupère l'historique réel des prix avec CoinGecko"""
-    global history_cache
-    
-    # Vérifier le cache
-    now = datetime.now()
-    if history_cache['timestamp'] and (now - history_cache['timestamp']).seconds < HISTORY_CACHE_DURATION:
-        return history_cache['data']
-    
-    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
+def build_history_points(prices, time_format='%H:%M'):
+    """Convertit des points [ts_ms, prix] en points du graphique (heure, prix, sentiment)"""
+    # Calcul vectorisé (variations, sentiment et formatage des heures en une passe)
+    return analytics.history_points(prices, time_format)
+
+def _fetch_market_chart_range(coin_id, start_ms, end_ms):
+    """Appel CoinGecko market_chart/range ; lève une exception en cas d'échec"""
+    url = f"{http_client.COINGECKO_API_URL}/coins/{coin_id}/market_chart/range"
     params = {
         'vs_currency': 'usd',
-        'days': '1',
-        'interval': 'hourly'
+        'from': start_ms // 1000,
+        'to': end_ms // 1000
     }
+    response = http_client.get(url, params=params, timeout=10)
+    data = response.json()
     
+    if 'prices' not in data:
+        raise ValueError(f"Réponse sans historique pour '{coin_id}'")
+    return data['prices']
+
+def sync_history(coin_id, start_ms, end_ms):
+    """Complète le stockage local en ne récupérant que les plages manquantes"""
+    added = 0
+    for range_start, range_end in history_store.missing_ranges(coin_id, start_ms, end_ms,
+                                                              HISTORY_SYNC_TOLERANCE_MS):
+        added += history_store.append(coin_id, _fetch_market_chart_range(coin_id, range_start, range_end))
+        history_store.mark_fetched(coin_id, range_start, range_end, upstream_resolution_ms(range_end - range_start))
+    return added
+
+@metrics.timed('get_history_range')
+def get_history_range(coin_id, start_ms, end_ms, max_points=HISTORY_MAX_POINTS):
+    """Historique d'une plage quelconque, lu depuis le stockage local et agrégé à `max_points`"""
     try:
-        response = requests.get(url, params=params, timeout=10)
-        data = response.json()
-        
-        if 'prices' in data:
-            prices = data['prices']
-            historical_data = []
-            
-            for i, price_point in enumerate(prices):
-                timestamp = price_point[0] / 1000  # Convert to seconds
-                price = price_point[1]
-                
-                # Calculer le sentiment basé sur la tendance du prix
-                sentiment_score = 0
-                if i > 0:
-                    prev_price = prices[i-1][1]
-                    price_change = (price - prev_price) / prev_price * 100
-                    
-                    if price_change > 0.5:
-                        sentiment_score = min(0.8, 0.2 + (price_change / 10))
-                    elif price_change < -0.5:
-                        sentiment_score = max(-0.8, -0.2 + (price_change / 10))
-                    else:
-                        sentiment_score = price_change / 20  # Neutre avec légère variation
-                
-                historical_data.append({
-                    'time': datetime.fromtimestamp(timestamp).strftime('%H:%M'),
-                    'price': round(price, 2),
-                    'sentiment': round(sentiment_score, 3)
-                })
-            
-            # Mettre en cache
-            history_cache = {'timestamp': now, 'data': historical_data}
-            return historical_data
-            
+        sync_history(coin_id, start_ms, end_ms)
+    except Exception as e:
+        # On sert ce qui est déjà stocké ; l'erreur n'est propagée que sans données
+        print(f"Erreur synchronisation historique {coin_id}: {e}")
+        metrics.record_error('coingecko_history')
+    
+    bucket_ms = max(1, (end_ms - start_ms) // max(1, max_points))
+    # L'alignement des intervalles peut produire un point de plus : on garde les plus récents
+    series = history_store.query_series(coin_id, start_ms, end_ms, bucket_ms=bucket_ms).tail(max_points)
+    if not len(series):
+        raise ValueError(f"Aucun historique disponible pour '{coin_id}'")
+    
+    time_format = '%H:%M' if end_ms - start_ms <= 2 * 86400 * 1000 else '%d/%m %H:%M'
+    return series.points(time_format)
+
+def _fetch_real_history(coin_id, params):
+    """Historique 24h (horaire) ; lève une exception en cas d'échec"""
+    if history_store is not None:
+        end_ms = int(time.time() * 1000)
+        return get_history_range(coin_id, end_ms - 24 * 3600 * 1000, end_ms, max_points=24)
+    
+    url = f"{http_client.COINGECKO_API_URL}/coins/{coin_id}/market_chart"
+    response = http_client.get(url, params=params, timeout=10)
+    data = response.json()
+    
+    if 'prices' not in data:
+        raise ValueError(f"Réponse sans historique pour '{coin_id}'")
+    
+    return build_history_points(data['prices'])
+
+HISTORY_PARAMS = {
+    'vs_currency': 'usd',
+    'days': '1',
+    'interval': 'hourly'
+}
+
+def refresh_real_history(coin_id):
+    """Force le rafraîchissement de l'historique (utilisé par le thread de fond)"""
+    cache_key = make_cache_key('market_chart', coin_id, HISTORY_PARAMS)
+    
+    def refresh():
+        value = remember_good(cache_key, _fetch_real_history(coin_id, HISTORY_PARAMS))
+        market_cache.set(cache_key, value, ttl=HISTORY_CACHE_DURATION,
+                         stale_ttl=HISTORY_STALE_DURATION)
+        return value
+    
+    return upstream_flight.do(cache_key, refresh)
+
+@metrics.timed('get_real_history')
+def get_real_history(coin_id='bitcoin'):
+    """Récupère l'historique réel des prix avec CoinGecko"""
+    # Cache + coalescence des requêtes concurrentes
+    cache_key = make_cache_key('market_chart', coin_id, HISTORY_PARAMS)
+    try:
+        return fetch_with_cache(market_cache, upstream_flight, cache_key,
+                                lambda: remember_good(cache_key, _fetch_real_history(coin_id, HISTORY_PARAMS)),
+                                ttl=HISTORY_CACHE_DURATION,
+                                stale_ttl=HISTORY_STALE_DURATION)
     except Exception as e:
         print(f"Erreur API CoinGecko History: {e}")
+        metrics.record_error('coingecko_history')
     
-    # Fallback sur données simulées
-    return generate_historical_data(24)
+    # Dernier historique obtenu, sinon données simulées
+    last = last_good.get(cache_key)
+    return last if last is not None else generate_historical_data(24)
 
 # --- DONNÉES SIMULÉES AMÉLIORÉES ---
 CRYPTO_POSTS = {
@@ -119,59 +228,180 @@ CRYPTO_POSTS = {
 }
 
 # --- FONCTION 1 : PRIX CRYPTO AVEC CACHE ---
-def get_crypto_data(crypto_id='bitcoin'):
-    """Récupère les données crypto avec système de cache"""
-    global price_cache
+def _fetch_crypto_data(crypto_id, params):
+    """Appel CoinGecko /coins/{id} ; lève une exception en cas d'échec"""
+    url = f"{http_client.COINGECKO_API_URL}/coins/{crypto_id}"
+    response = http_client.get(url, params=params, timeout=5)
+    data = response.json()
     
-    # Vérifier le cache
-    now = datetime.now()
-    if price_cache['timestamp'] and (now - price_cache['timestamp']).seconds < CACHE_DURATION:
-        return price_cache['data']
-    
-    url = f"https://api.coingecko.com/api/v3/coins/{crypto_id}"
-    params = {
-        'localization': 'false',
-        'tickers': 'false',
-        'community_data': 'false',
-        'developer_data': 'false'
+    return {
+        'name': data['name'],
+        'symbol': data['symbol'].upper(),
+        'price': data['market_data']['current_price']['usd'],
+        'change_24h': round(data['market_data']['price_change_percentage_24h'], 2),
+        'market_cap': data['market_data']['market_cap']['usd'],
+        'volume_24h': data['market_data']['total_volume']['usd'],
+        'high_24h': data['market_data']['high_24h']['usd'],
+        'low_24h': data['market_data']['low_24h']['usd'],
+        'image': data['image']['small']
     }
+
+COIN_PARAMS = {
+    'localization': 'false',
+    'tickers': 'false',
+    'community_data': 'false',
+    'developer_data': 'false'
+}
+
+def refresh_crypto_data(crypto_id):
+    """Force le rafraîchissement du prix (utilisé par le thread de fond)"""
+    cache_key = make_cache_key('coin', crypto_id, COIN_PARAMS)
+    
+    def refresh():
+        value = remember_good(cache_key, _fetch_crypto_data(crypto_id, COIN_PARAMS))
+        market_cache.set(cache_key, value, ttl=CACHE_DURATION,
+                         stale_ttl=PRICE_STALE_DURATION)
+        return value
     
+    return upstream_flight.do(cache_key, refresh)
+
+@metrics.timed('get_crypto_data')
+def get_crypto_data(crypto_id='bitcoin'):
+    """Récupère les données crypto avec système de cache"""
+    # Cache + coalescence des requêtes concurrentes
+    cache_key = make_cache_key('coin', crypto_id, COIN_PARAMS)
     try:
-        response = requests.get(url, params=params, timeout=5)
-        data = response.json()
-        
-        result = {
-            'name': data['name'],
-            'symbol': data['symbol'].upper(),
-            'price': data['market_data']['current_price']['usd'],
-            'change_24h': round(data['market_data']['price_change_percentage_24h'], 2),
-            'market_cap': data['market_data']['market_cap']['usd'],
-            'volume_24h': data['market_data']['total_volume']['usd'],
-            'high_24h': data['market_data']['high_24h']['usd'],
-            'low_24h': data['market_data']['low_24h']['usd'],
-            'image': data['image']['small']
-        }
-        
-        # Mettre en cache
-        price_cache = {'timestamp': now, 'data': result}
-        return result
-        
+        return fetch_with_cache(market_cache, upstream_flight, cache_key,
+                                lambda: remember_good(cache_key, _fetch_crypto_data(crypto_id, COIN_PARAMS)),
+                                ttl=CACHE_DURATION,
+                                stale_ttl=PRICE_STALE_DURATION)
     except Exception as e:
         print(f"Erreur API CoinGecko: {e}")
-        return {
-            'name': 'Bitcoin',
-            'symbol': 'BTC',
-            'price': 0,
-            'change_24h': 0,
-            'market_cap': 0,
-            'volume_24h': 0,
-            'high_24h': 0,
-            'low_24h': 0,
-            'image': None,
-            'error': True
+        metrics.record_error('coingecko_price')
+        # Dernier prix obtenu (marqué périmé), sinon valeurs par défaut
+        last = last_good.get(cache_key)
+        return dict(last, stale=True) if last is not None else crypto_fallback()
+
+def crypto_fallback():
+    """Données crypto par défaut quand CoinGecko est indisponible"""
+    return {
+        'name': 'Bitcoin',
+        'symbol': 'BTC',
+        'price': 0,
+        'change_24h': 0,
+        'market_cap': 0,
+        'volume_24h': 0,
+        'high_24h': 0,
+        'low_24h': 0,
+        'image': None,
+        'error': True
+    }
+
+# --- FONCTION 1 BIS : PRIX EN LOT (WATCHLISTS) ---
+SIMPLE_PRICE_PARAMS = {'vs_currencies': 'usd', 'include_24hr_change': 'true'}
+MAX_BATCH_IDS = int(os.getenv('MAX_BATCH_IDS', 500))
+
+@metrics.timed('get_prices_batch')
+def get_prices_batch(crypto_ids):
+    """Prix de plusieurs cryptos : cache par crypto, puis un appel par lot pour les manquantes"""
+    prices = {}
+    missing = []
+    
+    for crypto_id in dict.fromkeys(crypto_ids):
+        cached = market_cache.get(make_cache_key('simple_price', crypto_id, SIMPLE_PRICE_PARAMS))
+        if cached is not None:
+            prices[crypto_id] = cached
+        else:
+            missing.append(crypto_id)
+    
+    errors = {}
+    if missing:
+        fetched, errors = fetch_prices_batch(missing)
+        for crypto_id, price_data in fetched.items():
+            market_cache.set(make_cache_key('simple_price', crypto_id, SIMPLE_PRICE_PARAMS),
+                             price_data, ttl=CACHE_DURATION, stale_ttl=PRICE_STALE_DURATION)
+        prices.update(fetched)
+    price_matrix.update_prices({crypto_id: price_data.get(BASE_CURRENCY) for crypto_id, price_data in prices.items()})
+    
+    return {
+        'prices': prices,
+        'errors': errors,
+        'stats': {
+            'requested': len(prices) + len(errors),
+            'from_cache': len(prices) + len(errors) - len(missing),
+            'fetched': len(missing) - len(errors)
         }
+    }
+
+# --- FONCTION 1 TER : PRIX MULTI-DEVISES ---
+# Les prix sont toujours demandés en USD ; les autres devises sont dérivées
+# localement d'une table de change (un seul appel /exchange_rates, cache long)
+PRICE_CURRENCIES = [c.strip().lower() for c in os.getenv('PRICE_CURRENCIES', 'usd,eur,gbp').split(',') if c.strip()]
+FX_CACHE_DURATION = int(os.getenv('FX_CACHE_DURATION', 600))
+price_matrix = PriceMatrix(PRICE_CURRENCIES, base=BASE_CURRENCY)
+
+# Champs monétaires convertis dans la devise demandée
+MONEY_FIELDS = ('price', 'market_cap', 'volume_24h', 'high_24h', 'low_24h')
+
+def _fetch_exchange_rates():
+    """Appel CoinGecko /exchange_rates (valeur de 1 BTC par devise) ; lève une exception en cas d'échec"""
+    response = http_client.get(f"{http_client.COINGECKO_API_URL}/exchange_rates", timeout=5)
+    response.raise_for_status()
+    return response.json()
+
+@metrics.timed('get_fx_rates')
+def get_fx_rates():
+    """Met à jour la table de change de la matrice (cache long, dernière table valide en repli)"""
+    cache_key = make_cache_key('exchange_rates', BASE_CURRENCY)
+    try:
+        payload = fetch_with_cache(market_cache, upstream_flight, cache_key,
+                                   lambda: remember_good(cache_key, _fetch_exchange_rates()),
+                                   ttl=FX_CACHE_DURATION, stale_ttl=FX_CACHE_DURATION)
+    except Exception as e:
+        print(f"Erreur API CoinGecko taux de change: {e}")
+        metrics.record_error('coingecko_fx')
+        payload = last_good.get(cache_key)
+    if payload is not None:
+        try:
+            price_matrix.update_from_exchange_rates(payload)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Taux de change invalides: {e}")
+            metrics.record_error('coingecko_fx')
+
+def requested_currency():
+    """
+    Devise demandée (`?vs=`) ; lève ValueError si elle n'est pas suivie ou sans taux
+
+    Returns:
+        str: Code de devise, la devise de base par défaut
+    """
+    vs = request.args.get('vs', BASE_CURRENCY).strip().lower()
+    if vs == BASE_CURRENCY:
+        return vs
+    if vs not in price_matrix.currencies:
+        raise ValueError(f"Devise '{vs}' non suivie (disponibles : {', '.join(price_matrix.currencies)})")
+    get_fx_rates()
+    if price_matrix.rate(vs) is None:
+        raise LookupError(f"Taux de change '{vs}' indisponible")
+    return vs
+
+def market_data_in(crypto_id, crypto_data, vs):
+    """Données d'une crypto converties dans la devise `vs` (lecture de la matrice, sans appel amont)"""
+    if not crypto_data.get('error'):
+        price_matrix.update_prices({crypto_id: crypto_data['price']})
+    if vs == BASE_CURRENCY:
+        return crypto_data
+    rate = price_matrix.rate(vs)
+    converted = dict(crypto_data, currency=vs)
+    for field in MONEY_FIELDS:
+        if converted.get(field) is not None:
+            converted[field] = converted[field] * rate
+    if not crypto_data.get('error'):
+        converted['price'] = price_matrix.price(crypto_id, vs)
+    return converted
 
 # --- FONCTION 2 : ANALYSE DE SENTIMENT AMÉLIORÉE ---
+@metrics.timed('get_sentiment_analysis')
 def get_sentiment_analysis(num_posts=10):
     """Analyse de sentiment avec statistiques détaillées"""
     
@@ -184,36 +414,9 @@ def get_sentiment_analysis(num_posts=10):
     
     selected_posts = all_posts[:num_posts]
     
-    # Analyser chaque post
-    scores = []
-    analyzed_posts = []
-    
-    for post in selected_posts:
-        sentiment = analyzer.polarity_scores(post)
-        compound_score = sentiment['compound']
-        scores.append(compound_score)
-        
-        # Classifier le post
-        if compound_score >= 0.05:
-            classification = 'Positif'
-            emoji = '<i class="fas fa-smile text-emerald-400"></i>'
-            color = 'emerald'
-        elif compound_score <= -0.05:
-            classification = 'Négatif'
-            emoji = '<i class="fas fa-frown text-red-400"></i>'
-            color = 'red'
-        else:
-            classification = 'Neutre'
-            emoji = '<i class="fas fa-meh text-gray-400"></i>'
-            color = 'gray'
-        
-        analyzed_posts.append({
-            'text': post,
-            'score': round(compound_score, 3),
-            'classification': classification,
-            'emoji': emoji,
-            'color': color
-        })
+    # Analyser chaque post (classification et affichage dérivés du score)
+    scores = scorer.score_batch(selected_posts)
+    analyzed_posts = [ScoredPost(post, score) for post, score in zip(selected_posts, scores)]
     
     # Calculer les statistiques
     average_score = sum(scores) / len(scores)
@@ -267,13 +470,10 @@ def generate_historical_data(hours=24):
     return data
 
 # --- FONCTION 4 : STEADY NEWS API ---
-def get_steady_news():
-    """Simule l'API Steady pour les actualités financières"""
-    # Récupérer la clé API depuis l'environnement
-    steady_api_key = os.getenv('STEADY_API_KEY')
-    
+def fetch_news_articles():
+    """Articles d'actualité bruts (simulation de l'API Steady)"""
     # Articles fictifs réalistes
-    news_articles = [
+    return [
         {
             'title': 'Bitcoin ETF approval drives institutional adoption surge',
             'source': 'Bloomberg',
@@ -300,39 +500,21 @@ def get_steady_news():
             'published_at': datetime.now() - timedelta(hours=12)
         }
     ]
+
+@metrics.timed('get_steady_news')
+def get_steady_news(news_articles=None):
+    """Simule l'API Steady pour les actualités financières"""
+    # Récupérer la clé API depuis l'environnement
+    steady_api_key = os.getenv('STEADY_API_KEY')
     
-    # Analyser le sentiment de chaque article
-    analyzed_articles = []
-    scores = []
+    if news_articles is None:
+        news_articles = fetch_news_articles()
     
-    for article in news_articles:
-        sentiment = analyzer.polarity_scores(article['title'])
-        compound_score = sentiment['compound']
-        scores.append(compound_score)
-        
-        # Classifier l'article
-        if compound_score >= 0.05:
-            classification = 'Positif'
-            badge_color = 'emerald'
-            icon = '<i class="fas fa-arrow-up text-emerald-500"></i>'
-        elif compound_score <= -0.05:
-            classification = 'Négatif'
-            badge_color = 'red'
-            icon = '<i class="fas fa-arrow-down text-red-500"></i>'
-        else:
-            classification = 'Neutre'
-            badge_color = 'amber'
-            icon = '<i class="fas fa-minus text-amber-500"></i>'
-        
-        analyzed_articles.append({
-            'title': article['title'],
-            'source': article['source'],
-            'published_at': article['published_at'].strftime('%H:%M'),
-            'sentiment_score': round(compound_score, 3),
-            'classification': classification,
-            'badge_color': badge_color,
-            'icon': icon
-        })
+    # Analyser le sentiment de chaque article
+    scores = scorer.score_batch(article['title'] for article in news_articles)
+    analyzed_articles = [NewsArticle(article['title'], score, article['source'],
+                                     article['published_at'].strftime('%H:%M'))
+                         for article, score in zip(news_articles, scores)]
     
     # Calculer le sentiment global
     average_score = sum(scores) / len(scores)
@@ -377,8 +559,40 @@ def get_steady_news():
     }
 
 # --- FONCTION 5 : TWITTER API ---
-def get_twitter_data():
-    """Récupère les tweets Bitcoin avec fallback sur mock data"""
+# Collecte incrémentale (since_id / next_token, IDs vus gardés dans un filtre de Bloom) :
+# l'API n'est interrogée qu'une fois par TWITTER_POLL_INTERVAL et seuls les nouveaux
+# tweets sont scorés, quel que soit le nombre de pages vues
+TWITTER_QUERY = os.getenv('TWITTER_QUERY', 'bitcoin OR BTC OR cryptocurrency')
+TWITTER_COLLECTOR_ENABLED = os.getenv('TWITTER_COLLECTOR_ENABLED', 'true').lower() == 'true'
+TWITTER_POLL_INTERVAL = float(os.getenv('TWITTER_POLL_INTERVAL', 15))
+TWITTER_MAX_RESULTS = int(os.getenv('TWITTER_MAX_RESULTS', 100))
+TWITTER_MAX_PAGES = int(os.getenv('TWITTER_MAX_PAGES', 3))
+TWITTER_STATE_PATH = os.getenv('TWITTER_STATE_PATH')
+
+def _fetch_tweet_page(params):
+    """Une page de /tweets/search/recent ; lève une exception en cas d'échec"""
+    response = http_client.get(
+        f'{http_client.TWITTER_API_URL}/tweets/search/recent',
+        headers={'Authorization': f"Bearer {os.getenv('TWITTER_BEARER_TOKEN')}"},
+        params=params,
+        timeout=10
+    )
+    if response.status_code != 200:
+        raise ValueError(f"Twitter API Error: {response.status_code}")
+    return response.json()
+
+twitter_collector = TwitterCollector(
+    _fetch_tweet_page,
+    scorer.score_batch,
+    [TWITTER_QUERY],
+    max_results=TWITTER_MAX_RESULTS,
+    max_pages=TWITTER_MAX_PAGES,
+    min_interval=TWITTER_POLL_INTERVAL,
+    state_path=TWITTER_STATE_PATH
+) if TWITTER_COLLECTOR_ENABLED and os.getenv('TWITTER_BEARER_TOKEN') else None
+
+def fetch_tweets():
+    """Récupère les tweets bruts (API Twitter ou mock) ; retourne (tweets, api_success)"""
     twitter_bearer_token = os.getenv('TWITTER_BEARER_TOKEN')
     
     # Mock tweets réalistes pour fallback
@@ -398,8 +612,18 @@ def get_twitter_data():
     tweets_data = []
     api_success = False
     
+    # Collecte incrémentale : derniers tweets collectés (déjà scorés)
+    if twitter_collector is not None:
+        try:
+            twitter_collector.poll_if_due()
+        except Exception as e:
+            print(f"Twitter API Exception: {e}")
+            metrics.record_error('twitter')
+        tweets_data = twitter_collector.recent(10)
+        api_success = bool(tweets_data)
+    
     # Tentative d'appel à l'API Twitter
-    if twitter_bearer_token:
+    elif twitter_bearer_token:
         try:
             headers = {
                 'Authorization': f'Bearer {twitter_bearer_token}',
@@ -412,8 +636,8 @@ def get_twitter_data():
                 'tweet.fields': 'created_at,author_id,public_metrics'
             }
             
-            response = requests.get(
-                'https://api.twitter.com/2/tweets/search/recent',
+            response = http_client.get(
+                f'{http_client.TWITTER_API_URL}/tweets/search/recent',
                 headers=headers,
                 params=params,
                 timeout=10
@@ -424,6 +648,7 @@ def get_twitter_data():
                 if 'data' in data:
                     for tweet in data['data'][:10]:
                         tweets_data.append({
+                            'id': tweet.get('id'),
                             'text': tweet['text'],
                             'created_at': tweet.get('created_at', ''),
                             'author_id': tweet.get('author_id', 'unknown'),
@@ -432,9 +657,11 @@ def get_twitter_data():
                     api_success = True
             else:
                 print(f"Twitter API Error: {response.status_code}")
+                metrics.record_error('twitter')
                 
         except Exception as e:
             print(f"Twitter API Exception: {e}")
+            metrics.record_error('twitter')
     
     # Fallback sur mock data si API échoue
     if not api_success or not tweets_data:
@@ -446,55 +673,54 @@ def get_twitter_data():
                 'is_mock': True
             })
     
-    # Analyser le sentiment de chaque tweet
-    analyzed_tweets = []
-    scores = []
+    return tweets_data, api_success
+
+@metrics.timed('get_twitter_data')
+def get_twitter_data(fetched=None):
+    """Récupère les tweets Bitcoin avec fallback sur mock data"""
+    tweets_data, api_success = fetched if fetched is not None else fetch_tweets()
+    return build_twitter_data(tweets_data, tweet_scores(tweets_data), api_success)
+
+def tweet_scores(tweets_data):
+    """Scores des tweets : ceux du collecteur sont déjà scorés, les autres le sont en lot"""
+    computed = iter(scorer.score_batch(tweet['text'] for tweet in tweets_data if 'score' not in tweet))
+    return [tweet['score'] if 'score' in tweet else next(computed) for tweet in tweets_data]
+
+def tweet_time_label(created_at):
+    """Heure affichée d'un tweet ('HH:MM', 'Maintenant' si inconnue)"""
+    try:
+        if created_at:
+            created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+            return created_time.strftime('%H:%M')
+    except:
+        pass
+    return 'Maintenant'
+
+def build_twitter_data(tweets_data, compound_scores, api_success, aggregate=None):
+    """Construit les données du dashboard Twitter à partir de tweets déjà scorés
     
-    for tweet in tweets_data:
-        sentiment = analyzer.polarity_scores(tweet['text'])
-        compound_score = sentiment['compound']
-        scores.append(compound_score)
-        
-        # Classifier le tweet
-        if compound_score >= 0.05:
-            classification = 'Positif'
-            color = 'emerald'
-            icon = '<i class="fas fa-arrow-up text-emerald-400"></i>'
-        elif compound_score <= -0.05:
-            classification = 'Négatif'
-            color = 'red'
-            icon = '<i class="fas fa-arrow-down text-red-400"></i>'
-        else:
-            classification = 'Neutre'
-            color = 'sky'
-            icon = '<i class="fas fa-minus text-sky-400"></i>'
-        
-        # Formater la date
-        try:
-            if tweet['created_at']:
-                created_time = datetime.fromisoformat(tweet['created_at'].replace('Z', '+00:00'))
-                time_ago = created_time.strftime('%H:%M')
-            else:
-                time_ago = 'Maintenant'
-        except:
-            time_ago = 'Maintenant'
-        
-        analyzed_tweets.append({
-            'text': tweet['text'],
-            'time_ago': time_ago,
-            'author_id': tweet['author_id'],
-            'sentiment_score': round(compound_score, 3),
-            'classification': classification,
-            'color': color,
-            'icon': icon,
-            'is_mock': tweet['is_mock']
-        })
+    `aggregate` (agrégat d'une fenêtre glissante du pipeline de sentiment)
+    remplace, s'il est fourni, les statistiques calculées sur les seuls tweets affichés.
+    """
+    # Analyser le sentiment de chaque tweet
+    scores = list(compound_scores)
+    analyzed_tweets = [Tweet(tweet['text'], score, tweet_time_label(tweet['created_at']),
+                             tweet['author_id'], tweet['is_mock'])
+                       for tweet, score in zip(tweets_data, scores)]
     
     # Calculer les statistiques
-    average_score = sum(scores) / len(scores) if scores else 0
-    positive_count = sum(1 for s in scores if s >= 0.05)
-    negative_count = sum(1 for s in scores if s <= -0.05)
-    neutral_count = len(scores) - positive_count - negative_count
+    if aggregate is not None and aggregate['count']:
+        average_score = aggregate['average_score']
+        positive_count = aggregate['positive']
+        negative_count = aggregate['negative']
+        neutral_count = aggregate['neutral']
+        total = aggregate['count']
+    else:
+        average_score = sum(scores) / len(scores) if scores else 0
+        positive_count = sum(1 for s in scores if s >= 0.05)
+        negative_count = sum(1 for s in scores if s <= -0.05)
+        neutral_count = len(scores) - positive_count - negative_count
+        total = len(scores)
     
     # Calculer le Hype Meter (0-100)
     hype_meter = max(0, min(100, int((average_score + 1) * 50)))
@@ -518,27 +744,17 @@ def get_twitter_data():
             'positive': positive_count,
             'negative': negative_count,
             'neutral': neutral_count,
-            'total': len(scores)
+            'total': total
         },
         'api_success': api_success,
         'is_simulation': not api_success
     }
 
 # --- FONCTION 6 : TELEGRAM SIGNALS ---
-def get_telegram_signals():
-    """Simule la réception de signaux Telegram de trading"""
-    
-    # Canaux fictifs
-    channels = [
-        {'name': 'Crypto Whales 🐋', 'members': '45.2K', 'status': 'active'},
-        {'name': 'Pump Signals 🚀', 'members': '23.8K', 'status': 'active'},
-        {'name': 'DeFi Alerts 🌐', 'members': '18.5K', 'status': 'active'},
-        {'name': 'Whale Movements', 'members': '67.1K', 'status': 'active'},
-        {'name': 'Technical Analysis', 'members': '31.4K', 'status': 'active'}
-    ]
-    
+def fetch_telegram_messages():
+    """Messages de signaux bruts (simulation des canaux Telegram)"""
     # Messages de signaux réalistes
-    signal_messages = [
+    return [
         {
             'text': '🟢 BUY SIGNAL: Bitcoin (BTC) - Strong bullish momentum detected! Entry: $44,500',
             'channel': 'Crypto Whales 🐋',
@@ -596,58 +812,36 @@ def get_telegram_signals():
             'time_ago': '22 min'
         }
     ]
+
+@metrics.timed('get_telegram_signals')
+def get_telegram_signals(signal_messages=None):
+    """Simule la réception de signaux Telegram de trading"""
     
-    # Analyser chaque signal
-    analyzed_signals = []
-    scores = []
+    # Canaux fictifs
+    channels = [
+        {'name': 'Crypto Whales 🐋', 'members': '45.2K', 'status': 'active'},
+        {'name': 'Pump Signals 🚀', 'members': '23.8K', 'status': 'active'},
+        {'name': 'DeFi Alerts 🌐', 'members': '18.5K', 'status': 'active'},
+        {'name': 'Whale Movements', 'members': '67.1K', 'status': 'active'},
+        {'name': 'Technical Analysis', 'members': '31.4K', 'status': 'active'}
+    ]
     
-    for signal in signal_messages:
-        sentiment = analyzer.polarity_scores(signal['text'])
-        compound_score = sentiment['compound']
-        scores.append(compound_score)
-        
-        # Calculer le score de confiance (0-100)
-        confidence_score = max(10, min(95, int((abs(compound_score) + 0.2) * 80)))
-        
-        # Déterminer la couleur selon le type de signal
-        if signal['signal_type'] == 'ACHAT':
-            color = 'emerald'
-            icon = '<i class="fas fa-arrow-up text-emerald-400"></i>'
-            bg_color = 'emerald-900/20'
-        elif signal['signal_type'] == 'VENTE':
-            color = 'red'
-            icon = '<i class="fas fa-arrow-down text-red-400"></i>'
-            bg_color = 'red-900/20'
-        elif signal['signal_type'] == 'ALERTE':
-            color = 'amber'
-            icon = '<i class="fas fa-exclamation-triangle text-amber-400"></i>'
-            bg_color = 'amber-900/20'
-        else:  # INFO
-            color = 'cyan'
-            icon = '<i class="fas fa-info-circle text-cyan-400"></i>'
-            bg_color = 'cyan-900/20'
-        
-        analyzed_signals.append({
-            'text': signal['text'],
-            'channel': signal['channel'],
-            'signal_type': signal['signal_type'],
-            'crypto': signal['crypto'],
-            'entry_price': signal['entry_price'],
-            'time_ago': signal['time_ago'],
-            'confidence_score': confidence_score,
-            'sentiment_score': round(compound_score, 3),
-            'color': color,
-            'icon': icon,
-            'bg_color': bg_color
-        })
+    if signal_messages is None:
+        signal_messages = fetch_telegram_messages()
+    
+    # Analyser chaque signal (confiance et affichage dérivés du score et du type)
+    compound_scores = scorer.score_batch(signal['text'] for signal in signal_messages)
+    analyzed_signals = [TradingSignal(signal['text'], score, signal['channel'], signal['signal_type'],
+                                      signal['crypto'], signal['entry_price'], signal['time_ago'])
+                        for signal, score in zip(signal_messages, compound_scores)]
     
     # Calculer les statistiques
-    buy_signals = sum(1 for s in analyzed_signals if s['signal_type'] == 'ACHAT')
-    sell_signals = sum(1 for s in analyzed_signals if s['signal_type'] == 'VENTE')
-    alert_signals = sum(1 for s in analyzed_signals if s['signal_type'] in ['ALERTE', 'INFO'])
+    buy_signals = sum(1 for s in analyzed_signals if s.signal_type == 'ACHAT')
+    sell_signals = sum(1 for s in analyzed_signals if s.signal_type == 'VENTE')
+    alert_signals = sum(1 for s in analyzed_signals if s.signal_type in ['ALERTE', 'INFO'])
     
     # Score de confiance global
-    avg_confidence = sum(s['confidence_score'] for s in analyzed_signals) / len(analyzed_signals)
+    avg_confidence = sum(s.confidence_score for s in analyzed_signals) / len(analyzed_signals)
     
     # Déterminer le sentiment global du marché
     if buy_signals > sell_signals:
@@ -687,19 +881,304 @@ def get_telegram_signals():
         }
     }
 
+# --- RAFRAÎCHISSEMENT EN ARRIÈRE-PLAN (OPTIONNEL) ---
+MARKET_REFRESHER_ENABLED = os.getenv('MARKET_REFRESHER_ENABLED', 'false').lower() == 'true'
+MARKET_REFRESH_COINS = [c.strip() for c in os.getenv('MARKET_REFRESH_COINS', 'bitcoin,ethereum,solana').split(',') if c.strip()]
+MARKET_REFRESH_INTERVAL = int(os.getenv('MARKET_REFRESH_INTERVAL', CACHE_DURATION))
+
+# Snapshot de prix partagé entre workers (gunicorn) : un seul processus interroge
+# CoinGecko et publie dans un fichier mappé en mémoire, les autres le lisent
+SHARED_SNAPSHOT_PATH = os.getenv('SHARED_SNAPSHOT_PATH')
+SHARED_SNAPSHOT_SIZE = int(os.getenv('SHARED_SNAPSHOT_SIZE', 1024 * 1024))
+SHARED_SNAPSHOT_MAX_AGE = int(os.getenv('SHARED_SNAPSHOT_MAX_AGE', 3 * MARKET_REFRESH_INTERVAL))
+shared_prices = SharedPriceSnapshot(SHARED_SNAPSHOT_PATH, SHARED_SNAPSHOT_SIZE) if SHARED_SNAPSHOT_PATH else None
+
+def publish_shared_prices(snapshot):
+    """Publie les prix du snapshot local dans le snapshot partagé"""
+    shared_prices.publish({key[1]: value for key, value in snapshot.items()
+                           if isinstance(key, tuple) and key[0] == 'price'})
+
+def build_market_refresher(coin_ids, interval=MARKET_REFRESH_INTERVAL, on_publish=None):
+    """Construit le rafraîchisseur pour les cryptos configurées"""
+    jobs = {'sentiment': RefreshJob(lambda: get_sentiment_analysis(10), interval)}
+    for coin_id in coin_ids:
+        # Appels CoinGecko de fond : priorité "background" dans le budget d'appels
+        jobs[('price', coin_id)] = RefreshJob(with_priority(BACKGROUND, partial(refresh_crypto_data, coin_id)),
+                                              interval)
+        jobs[('history', coin_id)] = RefreshJob(with_priority(BACKGROUND, partial(refresh_real_history, coin_id)),
+                                                HISTORY_CACHE_DURATION)
+    return MarketDataRefresher(jobs, on_publish=on_publish)
+
+# Construit et démarré par `start_background_tasks`, dans le processus qui sert les requêtes
+market_refresher = None
+
+def _take_over_shared_refresh():
+    """Reprend la publication si le snapshot partagé est absent ou trop ancien (propriétaire arrêté)"""
+    global market_refresher
+    age = shared_prices.age()
+    if (age is None or age > SHARED_SNAPSHOT_MAX_AGE) and shared_prices.try_acquire_owner():
+        if market_refresher is None:
+            market_refresher = build_market_refresher(MARKET_REFRESH_COINS, on_publish=publish_shared_prices)
+        market_refresher.start()
+
+def from_snapshot(key, fallback):
+    """Lit le snapshot du rafraîchisseur (local ou partagé), sinon appelle `fallback` (mode synchrone)"""
+    if market_refresher is not None:
+        value = market_refresher.get(key)
+        if value is not None:
+            return value
+    elif shared_prices is not None and isinstance(key, tuple) and key[0] == 'price':
+        _take_over_shared_refresh()
+        value = shared_prices.get(key[1])
+        if value is not None:
+            return value
+    return fallback()
+
+# --- PIPELINE DE SENTIMENT EN CONTINU (OPTIONNEL) ---
+SENTIMENT_STREAM_ENABLED = os.getenv('SENTIMENT_STREAM_ENABLED', 'false').lower() == 'true'
+SENTIMENT_STREAM_INTERVAL = int(os.getenv('SENTIMENT_STREAM_INTERVAL', 15))
+SENTIMENT_REPLAY_FILE = os.getenv('SENTIMENT_REPLAY_FILE')
+TWITTER_STREAM_WINDOW = os.getenv('TWITTER_STREAM_WINDOW', '5m')
+
+def _stream_tweets():
+    tweets_data, _ = fetch_tweets()
+    # Les tweets simulés n'ont pas d'ID : ils sont réinjectés à chaque passage
+    return tweets_data
+
+def build_sentiment_stream():
+    """Construit le pipeline avec les sources Twitter, news, Telegram (et rejeu éventuel)"""
+    sources = [
+        CallableSource('twitter', _stream_tweets),
+        CallableSource('news', lambda: [{'id': a['title'], 'text': a['title'], 'source': a['source']}
+                                        for a in fetch_news_articles()]),
+        CallableSource('telegram', lambda: [{'id': m['text'], 'text': m['text'], 'channel': m['channel']}
+                                            for m in fetch_telegram_messages()])
+    ]
+    if SENTIMENT_REPLAY_FILE:
+        sources.append(ReplaySource('replay', path=SENTIMENT_REPLAY_FILE, loop=True))
+    return SentimentStream(sources, scorer.score_batch, interval=SENTIMENT_STREAM_INTERVAL)
+
+sentiment_stream = build_sentiment_stream() if SENTIMENT_STREAM_ENABLED else None
+
+# --- THREADS D'ARRIÈRE-PLAN ---
+# Les threads ne survivent pas à un fork : avec `gunicorn --preload`, ils sont démarrés
+# dans chaque worker à sa première requête, jamais dans le maître (qui garderait aussi
+# le verrou de propriétaire du snapshot partagé)
+_background_pid = None
+_background_lock = threading.Lock()
+
+def start_background_tasks():
+    """Démarre le rafraîchisseur et le pipeline de sentiment de ce processus (une fois par processus)"""
+    global market_refresher, _background_pid
+    if _background_pid == os.getpid():
+        return
+    with _background_lock:
+        if _background_pid == os.getpid():
+            return
+        if shared_prices is not None:
+            # Seul le worker propriétaire rafraîchit ; les autres lisent le snapshot partagé
+            market_refresher = (build_market_refresher(MARKET_REFRESH_COINS, on_publish=publish_shared_prices)
+                                if shared_prices.try_acquire_owner() else None)
+        elif MARKET_REFRESHER_ENABLED:
+            market_refresher = build_market_refresher(MARKET_REFRESH_COINS)
+        if market_refresher is not None:
+            market_refresher.start()
+        if sentiment_stream is not None:
+            sentiment_stream.start()
+        _background_pid = os.getpid()
+
+app.before_request(start_background_tasks)
+
+def get_twitter_stream_data():
+    """Données Twitter lues depuis le pipeline (sans scoring à la demande)"""
+    events = sentiment_stream.recent('twitter', limit=10)
+    if not events:
+        return get_twitter_data()
+    
+    tweets_data = [dict(event.meta, text=event.text) for event in events]
+    aggregate = sentiment_stream.aggregates('twitter')[TWITTER_STREAM_WINDOW]
+    api_success = not events[0].meta.get('is_mock', True)
+    return build_twitter_data(tweets_data, [event.score for event in events], api_success, aggregate)
+
+# --- DIFFUSION TEMPS RÉEL (SERVER-SENT EVENTS) ---
+SSE_COINS = [c.strip() for c in os.getenv('SSE_COINS', 'bitcoin,ethereum,solana').split(',') if c.strip()]
+SSE_INTERVAL = int(os.getenv('SSE_INTERVAL', CACHE_DURATION))
+
+def _price_ticks():
+    """Prix des cryptos diffusées : un seul appel groupé (et mis en cache) par intervalle"""
+    return get_prices_batch(SSE_COINS)['prices']
+
+def _sentiment_tick():
+    """Sentiment courant : agrégat du pipeline s'il est actif, sinon analyse des posts"""
+    if sentiment_stream is not None:
+        return sentiment_stream.aggregates('all')['5m']
+    sentiment = get_sentiment_analysis(10)
+    return {'average_score': sentiment['score'], 'label': sentiment['overall']['label'],
+            'positive': sentiment['stats']['positive'], 'negative': sentiment['stats']['negative'],
+            'neutral': sentiment['stats']['neutral']}
+
+# Producteur unique partagé par tous les abonnés (démarré au premier abonnement)
+market_broadcaster = Broadcaster({'price': with_priority(BACKGROUND, _price_ticks), 'sentiment': _sentiment_tick},
+                                 interval=SSE_INTERVAL)
+
+# --- PORTEFEUILLES ---
+# Livre en mémoire : valorisation incrémentale, prix issus du cache par crypto
+portfolio_book = PortfolioBook()
+# Montants (en USD) convertis quand une autre devise est demandée
+PORTFOLIO_MONEY_FIELDS = ('value', 'cost_basis', 'unrealized_pnl', 'realized_pnl')
+
+def _portfolio_prices(crypto_ids):
+    """Prix des cryptos détenues (même cache que /api/prices)"""
+    return get_prices_batch(crypto_ids)['prices']
+
+# --- BACKTESTS ---
+# Journal des signaux Telegram à rejouer : une ligne JSON par signal
+# {"ts": secondes Unix, "crypto": "BTC", "signal_type": "ACHAT", "text": ...}
+BACKTEST_SIGNALS_FILE = os.getenv('BACKTEST_SIGNALS_FILE')
+BACKTEST_PROCESSES = int(os.getenv('BACKTEST_PROCESSES', 0))
+BACKTEST_MAX_DAYS = int(os.getenv('BACKTEST_MAX_DAYS', 365))
+BACKTEST_MAX_COMBINATIONS = int(os.getenv('BACKTEST_MAX_COMBINATIONS', 400))
+
+# Symbole des signaux Telegram par crypto
+SIGNAL_SYMBOLS = {'bitcoin': 'BTC', 'ethereum': 'ETH', 'solana': 'SOL', 'cardano': 'ADA', 'uniswap': 'UNI'}
+
+def load_signal_log(coin_id, path=None):
+    """Signaux du journal pour une crypto, avec la confiance affichée sur le dashboard Telegram"""
+    path = path or BACKTEST_SIGNALS_FILE
+    if not path:
+        return []
+    symbol = SIGNAL_SYMBOLS.get(coin_id, coin_id.upper())
+    with open(path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    entries = [e for e in entries if e.get('coin_id') == coin_id or str(e.get('crypto', '')).upper() == symbol]
+    scores = scorer.score_batch(entry['text'] for entry in entries)
+    return [{'ts': entry['ts'], 'signal_type': entry['signal_type'],
+             'confidence_score': TradingSignal(entry['text'], score, entry.get('channel', ''),
+                                               entry['signal_type'], symbol, entry.get('entry_price', 0),
+                                               '').confidence_score}
+            for entry, score in zip(entries, scores)]
+
+@metrics.timed('run_backtest')
+def run_backtest(coin_id, start_ms, end_ms, source, horizons, thresholds, fee_pct=0.0):
+    """
+    Rejoue les signaux Telegram (`source='signals'`) ou le sentiment dérivé du prix
+    (`source='sentiment'`) sur l'historique stocké, pour chaque combinaison de paramètres
+    """
+    try:
+        sync_history(coin_id, start_ms, end_ms)
+    except Exception as e:
+        print(f"Erreur synchronisation historique {coin_id}: {e}")
+        metrics.record_error('coingecko_history')
+    
+    series = history_store.query_series(coin_id, start_ms, end_ms)
+    if not len(series):
+        raise ValueError(f"Aucun historique disponible pour '{coin_id}'")
+    
+    if source == 'signals':
+        events = backtest.EventLog.from_signals(load_signal_log(coin_id))
+    else:
+        events = backtest.EventLog.from_sentiment(series.timestamps, analytics.price_sentiment(series.prices))
+    
+    results = backtest.sweep(series.timestamps, series.prices, events, horizons, thresholds,
+                             fee_pct=fee_pct, processes=BACKTEST_PROCESSES)
+    return {
+        'coin_id': coin_id,
+        'source': source,
+        'points': len(series),
+        'events': len(events),
+        'results': results,
+        'best': backtest.best(results)
+    }
+
+# --- RENDU DES DASHBOARDS EN CACHE ---
+# Pages rendues indexées par l'empreinte de leurs données d'entrée (+ ETag/304)
+RENDER_CACHE_SIZE = int(os.getenv('RENDER_CACHE_SIZE', 64))
+render_cache = RenderCache(max_size=RENDER_CACHE_SIZE)
+
+def render_dashboard(name, inputs, render):
+    """Sert un dashboard depuis le cache tant que ses entrées n'ont pas changé"""
+    page = render_cache.get_or_render(name, inputs, render)
+    return conditional_response(page, request)
+
+# --- MÉTRIQUES (/metrics, format Prometheus) ---
+def _component_metrics():
+    """Compteurs des composants (caches, coalescence, budget d'appels), lus à chaque export"""
+    counters = {'hits': 'counter', 'misses': 'counter', 'stale_hits': 'counter', 'evictions': 'counter',
+                'expirations': 'counter', 'errors': 'counter', 'renders': 'counter',
+                'executions': 'counter', 'shared': 'counter'}
+    samples = []
+    samples += metrics.stats_samples('market_cache', market_cache.stats(), 'Cache des données de marché', kinds=counters)
+    samples += metrics.stats_samples('price_matrix', price_matrix.stats(), 'Matrice de prix multi-devises',
+                                     kinds={'price_updates': 'counter', 'fx_updates': 'counter'})
+    samples += metrics.stats_samples('last_good', last_good.stats(), 'Dernières valeurs valides (repli)', kinds=counters)
+    samples += metrics.stats_samples('render_cache', render_cache.stats(), 'Cache des dashboards rendus', kinds=counters)
+    samples += metrics.stats_samples('scoring_cache', scorer.stats()['cache'], 'Cache des scores VADER', kinds=counters)
+    samples += metrics.stats_samples('upstream_flight', upstream_flight.stats(), 'Coalescence des appels amont',
+                                     kinds=counters)
+    samples += metrics.stats_samples('sse', {'subscribers': market_broadcaster.subscriber_count()},
+                                     'Diffusion temps réel')
+    client_stats = http_client.stats()
+    for host, host_stats in client_stats['hosts'].items():
+        samples += metrics.stats_samples('upstream_client', host_stats, 'Client HTTP partagé', labels={'host': host},
+                                         kinds={key: 'counter' for key in host_stats})
+    for host, breaker in client_stats['breakers'].items():
+        samples.append(('upstream_breaker_state', 'gauge', 'État du disjoncteur (0 fermé, 1 ouvert, 2 semi-ouvert)',
+                        [({'host': host}, breaker['state_code'])]))
+        for key in ('failure_rate', 'retry_in'):
+            samples.append((f'upstream_breaker_{key}', 'gauge', f'Disjoncteur amont ({key})',
+                            [({'host': host}, breaker[key])]))
+        for key in ('opened', 'rejected', 'successes', 'failures'):
+            samples.append((f'upstream_breaker_{key}_total', 'counter', f'Disjoncteur amont ({key})',
+                            [({'host': host}, breaker[key])]))
+    for host, budget in client_stats['budgets'].items():
+        samples.append(('upstream_budget_tokens', 'gauge', "Jetons disponibles dans le budget d'appels",
+                        [({'host': host}, budget['tokens'])]))
+        for name, counters_by_priority in budget['priorities'].items():
+            for key in ('granted', 'rejected', 'waited'):
+                samples.append((f'upstream_budget_{key}_total', 'counter', f"Budget d'appels par priorité ({key})",
+                                [({'host': host, 'priority': name}, counters_by_priority[key])]))
+    if shared_prices is not None:
+        samples += metrics.stats_samples('shared_snapshot', shared_prices.stats(), 'Snapshot de prix partagé',
+                                         kinds={'publishes': 'counter', 'decodes': 'counter', 'retries': 'counter'})
+    if market_refresher is not None:
+        for job, job_stats in market_refresher.stats()['jobs'].items():
+            samples.append(('refresher_job_errors_total', 'counter', 'Échecs des tâches de rafraîchissement',
+                            [({'job': job}, job_stats['errors'])]))
+    if twitter_collector is not None:
+        samples += metrics.stats_samples('twitter_collector', twitter_collector.stats(), 'Collecte incrémentale Twitter',
+                                         kinds={key: 'counter' for key in ('polls', 'requests', 'fetched', 'new',
+                                                                           'duplicates')})
+    for name, lazy_stats in lazy.stats().items():
+        samples += metrics.stats_samples('lazy', dict(lazy_stats, loaded=int(lazy_stats['loaded'])),
+                                         'Dépendances chargées à la demande', labels={'name': name})
+    return samples
+
+metrics.REGISTRY.register_collector(_component_metrics)
+
+# Échéance globale (secondes) pour le rendu de la page principale
+INDEX_DEADLINE = float(os.getenv('INDEX_DEADLINE', 3))
+
 # --- ROUTES ---
 
 @app.route('/')
 def index():
     """Page principale"""
-    crypto_data = get_crypto_data('bitcoin')
-    sentiment_data = get_sentiment_analysis(10)
-    historical_data = get_real_history('bitcoin')
+    # Sources indépendantes exécutées en parallèle, avec une échéance commune ;
+    # leurs appels CoinGecko sont prioritaires dans le budget d'appels
+    with priority(CRITICAL):
+        results, _ = fan_out({
+            'crypto': (lambda: from_snapshot(('price', 'bitcoin'), lambda: get_crypto_data('bitcoin')),
+                       crypto_fallback),
+            'sentiment': (lambda: from_snapshot('sentiment', lambda: get_sentiment_analysis(10)),
+                          lambda: get_sentiment_analysis(10)),
+            'history': (lambda: from_snapshot(('history', 'bitcoin'), lambda: get_real_history('bitcoin')),
+                        lambda: generate_historical_data(24))
+        }, timeout=INDEX_DEADLINE)
     
     return render_template('index.html', 
-                         crypto=crypto_data, 
-                         sentiment=sentiment_data,
-                         history=historical_data)
+                         crypto=results['crypto'], 
+                         sentiment=results['sentiment'],
+                         history=results['history'])
 
 @app.route('/api/refresh-sentiment')
 def refresh_sentiment():
@@ -710,19 +1189,80 @@ def refresh_sentiment():
 @app.route('/api/refresh-price')
 def refresh_price():
     """API pour rafraîchir uniquement le prix"""
-    crypto_data = get_crypto_data('bitcoin')
+    with priority(CRITICAL):
+        crypto_data = from_snapshot(('price', 'bitcoin'), lambda: get_crypto_data('bitcoin'))
     return jsonify(crypto_data)
 
 @app.route('/api/crypto/<crypto_id>')
 def get_crypto(crypto_id):
-    """API pour obtenir les données d'une crypto spécifique"""
-    crypto_data = get_crypto_data(crypto_id)
-    return jsonify(crypto_data)
+    """API pour obtenir les données d'une crypto spécifique (`?vs=eur` : dans une autre devise)"""
+    try:
+        vs = requested_currency()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 503
+    crypto_data = from_snapshot(('price', crypto_id), lambda: get_crypto_data(crypto_id))
+    return jsonify(market_data_in(crypto_id, crypto_data, vs))
+
+@app.route('/api/prices')
+def get_prices():
+    """API pour obtenir les prix de plusieurs cryptos (?ids=bitcoin,ethereum[&vs=eur])"""
+    crypto_ids = [c.strip().lower() for c in request.args.get('ids', '').split(',') if c.strip()]
+    
+    if not crypto_ids:
+        return jsonify({'error': "Paramètre 'ids' manquant"}), 400
+    if len(crypto_ids) > MAX_BATCH_IDS:
+        return jsonify({'error': f"Maximum {MAX_BATCH_IDS} cryptos par requête"}), 400
+    try:
+        vs = requested_currency()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 503
+    
+    result = get_prices_batch(crypto_ids)
+    if vs != BASE_CURRENCY:
+        # Prix dans la devise demandée, ajoutés à côté du prix en USD
+        for crypto_id, price_data in result['prices'].items():
+            result['prices'][crypto_id] = dict(price_data, **{vs: price_matrix.price(crypto_id, vs)})
+    return jsonify(result)
 
 @app.route('/api/history/<coin_id>')
 def get_history_api(coin_id):
-    """API pour obtenir l'historique d'une crypto spécifique"""
-    historical_data = get_real_history(coin_id)
+    """API pour obtenir l'historique d'une crypto spécifique
+    
+    Paramètres optionnels : `hours` ou `start`/`end` (timestamps Unix en secondes),
+    `points` (nombre maximal de points après agrégation), `indicators=true`,
+    `format=columnar` (une liste par champ plutôt qu'un objet par point) et `vs`
+    (devise, au taux de change courant).
+    """
+    try:
+        vs = requested_currency()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 503
+    
+    range_args = ('hours', 'start', 'end', 'points')
+    if history_store is not None and any(arg in request.args for arg in range_args):
+        now = int(time.time())
+        end = request.args.get('end', now, type=int)
+        start = request.args.get('start', end - request.args.get('hours', 24, type=int) * 3600, type=int)
+        points = min(request.args.get('points', HISTORY_MAX_POINTS, type=int), HISTORY_MAX_POINTS)
+        if start >= end or points < 1:
+            return jsonify({'error': 'Plage ou nombre de points invalide'}), 400
+        try:
+            historical_data = get_history_range(coin_id, start * 1000, end * 1000, max_points=points)
+        except Exception as e:
+            print(f"Erreur API CoinGecko History: {e}")
+            metrics.record_error('coingecko_history')
+            historical_data = generate_historical_data(24)
+    else:
+        historical_data = from_snapshot(('history', coin_id), lambda: get_real_history(coin_id))
+    if vs != BASE_CURRENCY:
+        rate = price_matrix.rate(vs)
+        historical_data = [dict(point, price=round(point['price'] * rate, 2)) for point in historical_data]
     
     # Déterminer le label de la crypto
     crypto_labels = {
@@ -731,28 +1271,184 @@ def get_history_api(coin_id):
         'solana': 'Solana'
     }
     
-    return jsonify({
+    response = {
         'label': crypto_labels.get(coin_id, coin_id.capitalize()),
         'data': historical_data
+    }
+    if vs != BASE_CURRENCY:
+        response['currency'] = vs
+    if request.args.get('format') == 'columnar':
+        response['format'] = 'columnar'
+        response['data'] = columnar(historical_data, ('time', 'price', 'sentiment'))
+    
+    # Indicateurs techniques (SMA, EMA, volatilité, RSI) sur demande
+    if request.args.get('indicators', 'false').lower() == 'true':
+        response['indicators'] = analytics.indicators([point['price'] for point in historical_data])
+    
+    return jsonify(response)
+
+@app.route('/api/portfolio/<portfolio_id>')
+def get_portfolio(portfolio_id):
+    """API pour obtenir la valorisation, les positions et la répartition d'un portefeuille (`?vs=eur`)"""
+    if portfolio_book.valuation(portfolio_id) is None:
+        return jsonify({'error': f"Portefeuille '{portfolio_id}' inconnu"}), 404
+    try:
+        vs = requested_currency()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 503
+    
+    portfolio_book.refresh_prices(_portfolio_prices)
+    valuation = portfolio_book.valuation(portfolio_id)
+    positions = portfolio_book.positions(portfolio_id)
+    if vs != BASE_CURRENCY:
+        # Montants en USD convertis au taux courant (coûts d'acquisition compris)
+        rate = price_matrix.rate(vs)
+        valuation = dict(valuation, **{field: round(valuation[field] * rate, 2) for field in PORTFOLIO_MONEY_FIELDS})
+        positions = [dict(position,
+                          price=price_matrix.price(position['coin_id'], vs) or position['price'] * rate,
+                          **{field: round(position[field] * rate, 2)
+                             for field in PORTFOLIO_MONEY_FIELDS if field in position})
+                     for position in positions]
+    return jsonify({
+        'id': portfolio_id,
+        'currency': vs,
+        'valuation': valuation,
+        'positions': positions
+    })
+
+@app.route('/api/portfolio/<portfolio_id>/transactions', methods=['POST'])
+def add_portfolio_transaction(portfolio_id):
+    """API pour enregistrer un achat (quantity > 0) ou une vente (quantity < 0)"""
+    payload = request.get_json(silent=True) or {}
+    try:
+        realized = portfolio_book.record_transaction(
+            portfolio_id,
+            str(payload['coin_id']).lower(),
+            float(payload['quantity']),
+            float(payload['price']),
+            payload.get('ts')
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f"Transaction invalide : {e}"}), 400
+    
+    return jsonify({'realized_pnl': round(realized, 2), 'valuation': portfolio_book.valuation(portfolio_id)}), 201
+
+@app.route('/api/backtest/<coin_id>')
+def backtest_api(coin_id):
+    """API de backtest des signaux Telegram ou du sentiment sur l'historique stocké
+    
+    Paramètres optionnels : `days` (période, 30 par défaut), `source` (`sentiment` ou
+    `signals`), `horizon` et `threshold` (durées de détention en minutes et intensités
+    minimales, listes séparées par des virgules) et `fee` (frais aller-retour en %).
+    """
+    if history_store is None:
+        return jsonify({'error': "Stockage de l'historique désactivé"}), 503
+    
+    source = request.args.get('source', 'sentiment')
+    try:
+        days = request.args.get('days', 30, type=float)
+        horizons = [float(h) for h in request.args.get('horizon', '60').split(',')]
+        thresholds = [float(t) for t in request.args.get('threshold', '0').split(',')]
+        fee_pct = float(request.args.get('fee', 0))
+    except ValueError:
+        return jsonify({'error': 'Paramètres de backtest invalides'}), 400
+    if (source not in ('sentiment', 'signals') or not 0 < days <= BACKTEST_MAX_DAYS
+            or not all(math.isfinite(value) for value in (*horizons, *thresholds, fee_pct))
+            or min(horizons) <= 0 or len(horizons) * len(thresholds) > BACKTEST_MAX_COMBINATIONS):
+        return jsonify({'error': 'Paramètres de backtest invalides'}), 400
+    
+    end_ms = int(time.time()) * 1000
+    try:
+        result = run_backtest(coin_id, end_ms - int(days * 86400 * 1000), end_ms, source,
+                              horizons, thresholds, fee_pct)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    return jsonify(result)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Métriques au format texte Prometheus (latences, caches, appels amont, erreurs)"""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+@app.route('/api/cache-stats')
+def cache_stats():
+    """API pour consulter les compteurs du cache (hits, misses, évictions)"""
+    stats = market_cache.stats()
+    stats['upstream'] = upstream_flight.stats()
+    stats['refresher'] = market_refresher.stats() if market_refresher is not None else {'running': False}
+    stats['scoring'] = scorer.stats()
+    stats['render'] = render_cache.stats()
+    if shared_prices is not None:
+        stats['shared_snapshot'] = shared_prices.stats()
+    return jsonify(stats)
+
+@app.route('/api/upstream-stats')
+def upstream_stats():
+    """API pour consulter les compteurs du client HTTP (retries, connexions réutilisées, budget d'appels)"""
+    return jsonify(http_client.stats())
+
+@app.route('/api/sentiment-stream')
+def sentiment_stream_api():
+    """API pour lire les agrégats glissants (1m/5m/1h) du pipeline de sentiment"""
+    if sentiment_stream is None:
+        return jsonify({'error': 'Pipeline de sentiment désactivé (SENTIMENT_STREAM_ENABLED)'}), 404
+    
+    sources = [source.name for source in sentiment_stream.sources] + ['all']
+    return jsonify({
+        'aggregates': {name: sentiment_stream.aggregates(name) for name in sources},
+        'stats': sentiment_stream.stats()
     })
 
+@app.route('/api/stream')
+def stream_updates():
+    """Flux SSE des prix et du sentiment, poussé à tous les abonnés"""
+    return Response(stream_with_context(market_broadcaster.stream()),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/dashboard/steady')
 def steady_dashboard():
     """Dashboard Steady API - Analyse de sentiment des actualités"""
-    news_data = get_steady_news()
-    return render_template('dash_steady.html', news=news_data)
+    articles = fetch_news_articles()
+    # Seuls les champs affichés comptent (l'heure est affichée à la minute)
+    inputs = [[a['title'], a['source'], a['published_at'].strftime('%H:%M')] for a in articles]
+    inputs.append(os.getenv('STEADY_API_KEY') is not None)
+    return render_dashboard('steady', inputs, lambda: render_template(
+        'dash_steady.html', news=get_steady_news(articles)))
 
 @app.route('/dashboard/twitter')
 def twitter_dashboard():
     """Dashboard Twitter/X - Analyse de sentiment des tweets"""
-    twitter_data = get_twitter_data()
-    return render_template('dash_twitter.html', twitter=twitter_data)
+    if sentiment_stream is not None:
+        # Données déjà scorées par le pipeline : seule leur valeur compte
+        twitter_data = get_twitter_stream_data()
+        return render_dashboard('twitter', twitter_data, lambda: render_template(
+            'dash_twitter.html', twitter=twitter_data))
+    
+    tweets_data, api_success = fetch_tweets()
+    inputs = [[t['text'], tweet_time_label(t['created_at']), t['author_id'], t['is_mock']] for t in tweets_data]
+    inputs.append(api_success)
+    return render_dashboard('twitter', inputs, lambda: render_template(
+        'dash_twitter.html', twitter=get_twitter_data((tweets_data, api_success))))
 
 @app.route('/dashboard/telegram')
 def telegram_dashboard():
     """Dashboard Telegram - Signaux de trading"""
-    telegram_data = get_telegram_signals()
-    return render_template('dash_telegram.html', telegram=telegram_data)
+    messages = fetch_telegram_messages()
+    inputs = [messages, os.getenv('TELEGRAM_API_ID'), os.getenv('TELEGRAM_PHONE')]
+    return render_dashboard('telegram', inputs, lambda: render_template(
+        'dash_telegram.html', telegram=get_telegram_signals(messages)))
+
+# --- PRÉCHARGEMENT ---
+# Avec `gunicorn --preload`, le maître charge le lexique VADER et SQLAlchemy avant
+# le fork : les workers les partagent en copie sur écriture au lieu de les charger chacun
+PRELOAD_HEAVY = os.getenv('PRELOAD_HEAVY', 'false').lower() == 'true'
+if PRELOAD_HEAVY:
+    lazy.preload()
+else:
+    start_background_tasks()
 
 if __name__ == '__main__':
     print("CryptoSaaS Server Starting...")
@@ -0,0 +1,85 @@
+"""
+Benchmark : backtest du sentiment dérivé du prix sur un an de prix à la minute
+
+Compare une boucle Python par événement (une combinaison) au calcul
+vectorisé, puis mesure un sweep horizons x seuils dans le processus
+courant et sur un pool de processus.
+
+Usage :
+    python benchmarks/bench_backtest.py [--days 365] [--processes 4]
+"""
+import argparse
+import bisect
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_history import make_prices
+from utils import analytics, backtest
+
+HORIZONS = [5, 15, 30, 60, 120, 240, 480, 1440]
+THRESHOLDS = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
+
+
+def loop_backtest(timestamps, prices, events, horizon_minutes, min_strength):
+    """Implémentation de référence : un trade à la fois (recherche dichotomique par trade)"""
+    returns = []
+    horizon_ms = horizon_minutes * 60_000
+    timestamps, prices = timestamps.tolist(), prices.tolist()
+    for ts, direction, strength in zip(events.timestamps.tolist(), events.directions.tolist(),
+                                       events.strengths.tolist()):
+        if strength < min_strength or ts < timestamps[0]:
+            continue
+        entry = bisect.bisect_left(timestamps, ts)
+        exit_ = bisect.bisect_left(timestamps, ts + horizon_ms, entry)
+        if exit_ >= len(timestamps):
+            continue
+        returns.append(direction * (prices[exit_] / prices[entry] - 1))
+    return backtest.summarize(np.array(returns))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--loop-events', type=int, default=20000,
+                        help="événements rejoués par la boucle de référence")
+    args = parser.parse_args()
+
+    series = np.asarray(make_prices(args.days * 1440), dtype=np.float64)
+    timestamps, prices = series[:, 0].astype(np.int64), series[:, 1]
+    events = backtest.EventLog.from_sentiment(timestamps, analytics.price_sentiment(prices))
+    print(f"{len(timestamps)} points, {len(events)} événements, "
+          f"{len(HORIZONS) * len(THRESHOLDS)} combinaisons")
+
+    sample = backtest.EventLog(events.timestamps[:args.loop_events], events.directions[:args.loop_events],
+                               events.strengths[:args.loop_events])
+    _, loop = timed(lambda: loop_backtest(timestamps, prices, sample, 60, 0.0))
+    _, vectorized = timed(lambda: backtest.backtest(timestamps, prices, events, 60))
+    print(f"1 combinaison : boucle {loop / len(sample) * 1e6:.1f} µs/événement, "
+          f"vectorisé {vectorized / len(events) * 1e6:.3f} µs/événement "
+          f"({vectorized * 1000:.1f} ms pour {len(events)} événements)")
+
+    results, serial = timed(lambda: backtest.sweep(timestamps, prices, events, HORIZONS, THRESHOLDS))
+    _, pooled = timed(lambda: backtest.sweep(timestamps, prices, events, HORIZONS, THRESHOLDS,
+                                             processes=args.processes))
+    print(f"sweep : {serial:.2f} s dans le processus, {pooled:.2f} s sur {args.processes} processus")
+
+    top = backtest.best(results)
+    print(f"meilleure combinaison : horizon {top['horizon_minutes']} min, seuil {top['min_strength']} "
+          f"-> {top['trades']} trades, taux de réussite {top['hit_rate']:.1%}, "
+          f"rendement {top['total_return_pct']:.2f} %, drawdown max {top['max_drawdown_pct']:.2f} %")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark : calcul de l'historique (boucle Python d'origine vs version NumPy)
+
+Usage :
+    python benchmarks/bench_history.py [--sizes 24 2000 100000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import analytics
+
+
+def loop_history_points(prices, time_format='%H:%M'):
+    """Implémentation de référence : la boucle d'origine de get_real_history"""
+    historical_data = []
+    for i, price_point in enumerate(prices):
+        timestamp = price_point[0] / 1000
+        price = price_point[1]
+        sentiment_score = 0
+        if i > 0:
+            prev_price = prices[i-1][1]
+            price_change = (price - prev_price) / prev_price * 100
+            if price_change > 0.5:
+                sentiment_score = min(0.8, 0.2 + (price_change / 10))
+            elif price_change < -0.5:
+                sentiment_score = max(-0.8, -0.2 + (price_change / 10))
+            else:
+                sentiment_score = price_change / 20
+        historical_data.append({
+            'time': datetime.fromtimestamp(timestamp).strftime(time_format),
+            'price': round(price, 2),
+            'sentiment': round(sentiment_score, 3)
+        })
+    return historical_data
+
+
+def make_prices(size, seed=42):
+    """Série de prix simulée au format CoinGecko [[ts_ms, prix], ...]"""
+    rng = random.Random(seed)
+    start_ms = 1_700_000_000_000
+    price = 43000.0
+    prices = []
+    for i in range(size):
+        price *= 1 + rng.uniform(-0.01, 0.01)
+        prices.append([start_ms + i * 60_000, price])
+    return prices
+
+
+def bench(size, repeat):
+    prices = make_prices(size)
+    number = max(1, 20_000 // size)
+    loop = min(timeit.repeat(lambda: loop_history_points(prices), number=number, repeat=repeat)) / number
+    vectorized = min(timeit.repeat(lambda: analytics.history_points(prices), number=number, repeat=repeat)) / number
+    indicators = min(timeit.repeat(lambda: analytics.indicators([p[1] for p in prices]),
+                                   number=number, repeat=repeat)) / number
+    return loop, vectorized, indicators
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[24, 2000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'points':>8} | {'boucle (ms)':>12} | {'numpy (ms)':>11} | {'gain':>6} | {'indicateurs (ms)':>16}")
+    print('-' * 66)
+    for size in args.sizes:
+        loop, vectorized, indicators = bench(size, args.repeat)
+        print(f"{size:>8} | {loop * 1000:>12.3f} | {vectorized * 1000:>11.3f} | "
+              f"{loop / vectorized:>5.1f}x | {indicators * 1000:>16.3f}")
+
+
+if __name__ == '__main__':
+    main()
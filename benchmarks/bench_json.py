@@ -0,0 +1,78 @@
+"""
+Benchmark : taille et temps de sérialisation des réponses d'historique
+
+Compare le format actuel (un objet {time, price, sentiment} par point) et
+le format en colonnes, sérialisés par `json` (fournisseur Flask par défaut)
+ou orjson, puis compressés en gzip (et brotli s'il est installé).
+
+Usage :
+    python benchmarks/bench_json.py [--sizes 24 1000 100000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_history import make_prices
+from utils import analytics
+from utils.responses import available_encodings, columnar, compress, orjson
+
+
+def flask_default_dumps(value):
+    """Sérialisation du fournisseur JSON par défaut de Flask (clés triées, compacte)"""
+    return json.dumps(value, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def orjson_dumps(value):
+    return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+
+
+def best_time(fn, repeat):
+    number = 1
+    while min(timeit.repeat(fn, number=number, repeat=1)) * number < 0.05 and number < 1000:
+        number *= 2
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[24, 1000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--level', type=int, default=6, help='niveau de compression')
+    args = parser.parse_args()
+
+    encoders = {'json': flask_default_dumps}
+    if orjson is not None:
+        encoders['orjson'] = orjson_dumps
+    encodings = available_encodings()
+
+    header = f"{'points':>7} | {'format':>8} | {'encodeur':>8} | {'octets':>10} | {'sérial. (ms)':>12}"
+    for encoding in encodings:
+        header += f" | {encoding + ' (octets)':>14} | {encoding + ' (ms)':>9}"
+    print(header)
+    print('-' * len(header))
+
+    for size in args.sizes:
+        points = analytics.history_points(make_prices(size))
+        payloads = {
+            'objets': {'label': 'Bitcoin', 'data': points},
+            'colonnes': {'label': 'Bitcoin', 'format': 'columnar',
+                         'data': columnar(points, ('time', 'price', 'sentiment'))},
+        }
+        for layout, payload in payloads.items():
+            for name, dumps in encoders.items():
+                body = dumps(payload)
+                elapsed = best_time(lambda: dumps(payload), args.repeat)
+                line = f"{size:>7} | {layout:>8} | {name:>8} | {len(body):>10} | {elapsed * 1000:>12.3f}"
+                for encoding in encodings:
+                    compressed = compress(body, encoding, args.level)
+                    compress_time = best_time(lambda: compress(body, encoding, args.level), args.repeat)
+                    line += f" | {len(compressed):>14} | {compress_time * 1000:>9.3f}"
+                print(line)
+
+
+if __name__ == '__main__':
+    main()
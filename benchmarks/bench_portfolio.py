@@ -0,0 +1,64 @@
+"""
+Benchmark : valorisation de portefeuilles (10k portefeuilles x 50 positions)
+
+Mesure la construction du livre, un rafraîchissement complet des prix,
+la mise à jour d'un seul prix et la modification d'une seule position.
+
+Usage :
+    python benchmarks/bench_portfolio.py [--portfolios 10000] [--positions 50] [--coins 500]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.portfolio import PortfolioBook
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<40} {elapsed * 1000:>10.3f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--portfolios', type=int, default=10000)
+    parser.add_argument('--positions', type=int, default=50)
+    parser.add_argument('--coins', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    coins = [f'coin-{i}' for i in range(args.coins)]
+    book = PortfolioBook(capacity=args.portfolios * args.positions)
+
+    def build():
+        for p in range(args.portfolios):
+            for coin_id in rng.sample(coins, args.positions):
+                book.set_position(f'portfolio-{p}', coin_id, rng.uniform(0.1, 10), rng.uniform(100, 1000))
+
+    timed(f"construction ({args.portfolios} x {args.positions})", build)
+
+    def full_refresh():
+        book.update_prices({coin_id: rng.uniform(1, 100) for coin_id in coins})
+
+    refresh = timed("rafraîchissement complet des prix", full_refresh, repeat=10)
+    timed("mise à jour d'un seul prix", lambda: book.update_prices({rng.choice(coins): rng.uniform(1, 100)}),
+          repeat=100)
+    timed("modification d'une position", lambda: book.set_position(
+        f'portfolio-{rng.randrange(args.portfolios)}', rng.choice(coins), rng.uniform(0.1, 10), 500), repeat=1000)
+    timed("valorisation d'un portefeuille", lambda: book.valuation(f'portfolio-{rng.randrange(args.portfolios)}'),
+          repeat=1000)
+    timed("exposition globale", book.exposure, repeat=10)
+
+    print(f"\nRafraîchissement complet : {refresh * 1000:.1f} ms pour {book.stats()['positions']} positions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark : matrice de prix multi-devises (500 cryptos x 10 devises)
+
+Mesure la lecture d'un prix dans une devise, un rafraîchissement complet
+des prix en USD, une nouvelle table de change et une conversion croisée,
+puis compare le nombre d'appels amont nécessaires pour couvrir toutes les
+devises : un appel /simple/price par lot et par devise, contre un appel
+par lot (en USD) plus un seul /exchange_rates.
+
+Usage :
+    python benchmarks/bench_price_matrix.py [--coins 500] [--currencies 10]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.price_matrix import PriceMatrix
+from utils.crypto_api import MAX_IDS_PER_REQUEST
+
+CURRENCIES = ['usd', 'eur', 'gbp', 'jpy', 'chf', 'cad', 'aud', 'cny', 'inr', 'krw', 'brl', 'sek']
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<40} {elapsed * 1e6:>10.2f} µs")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--coins', type=int, default=500)
+    parser.add_argument('--currencies', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    coins = [f'coin-{i}' for i in range(args.coins)]
+    currencies = CURRENCIES[:max(1, min(args.currencies, len(CURRENCIES)))]
+    matrix = PriceMatrix(currencies)
+    matrix.update_fx({currency: rng.uniform(0.5, 150) for currency in currencies[1:]})
+    matrix.update_prices({coin_id: rng.uniform(1, 50000) for coin_id in coins})
+
+    timed("prix d'une crypto dans une devise", lambda: matrix.price(rng.choice(coins), rng.choice(currencies)),
+          repeat=100000)
+    timed(f"rafraîchissement des prix ({args.coins})",
+          lambda: matrix.update_prices({coin_id: rng.uniform(1, 50000) for coin_id in coins}), repeat=20)
+    timed("nouvelle table de change",
+          lambda: matrix.update_fx({currency: rng.uniform(0.5, 150) for currency in currencies[1:]}), repeat=100)
+    timed("conversion croisée (crypto -> crypto)", lambda: matrix.convert(1.0, rng.choice(coins), rng.choice(coins)),
+          repeat=100000)
+
+    batches = math.ceil(args.coins / MAX_IDS_PER_REQUEST)
+    per_currency = batches * len(currencies)
+    derived = batches + (1 if len(currencies) > 1 else 0)
+    print(f"\nAppels amont pour {args.coins} cryptos x {len(currencies)} devises : "
+          f"{per_currency} (une requête par devise) -> {derived} (USD + table de change)")
+    print(f"Taille de la matrice : {matrix.stats()['nbytes'] / 1024:.1f} Ko")
+
+
+if __name__ == '__main__':
+    main()
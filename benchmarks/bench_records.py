@@ -0,0 +1,86 @@
+"""
+Benchmark : mémoire des représentations de séries de prix et de textes scorés
+
+Compare, pour N points de prix, la liste de dictionnaires d'origine
+{'time', 'price', 'sentiment'}, la liste de tuples (ts, prix) lue en base et
+la série en colonnes (PriceSeries) ; puis des tweets scorés stockés en
+dictionnaires (avec attributs d'affichage) ou en enregistrements à slots.
+
+Usage :
+    python benchmarks/bench_records.py [--points 1000000] [--texts 100000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_history import make_prices
+from models.records import PriceSeries, Tweet
+from utils import analytics
+
+
+def measure(build):
+    """Mémoire (octets) encore allouée par l'objet retourné par `build`"""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def tweet_dict(text, i, score):
+    """Tweet tel que construit avant les enregistrements compacts"""
+    return {
+        'text': text,
+        'time_ago': '12:00',
+        'author_id': f'user_{i % 100}',
+        'sentiment_score': round(score, 3),
+        'classification': 'Positif',
+        'color': 'emerald',
+        'icon': '<i class="fas fa-arrow-up text-emerald-400"></i>',
+        'is_mock': False
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=1_000_000)
+    parser.add_argument('--texts', type=int, default=100_000)
+    args = parser.parse_args()
+
+    prices = make_prices(args.points)
+    series_cases = {
+        'dictionnaires {time, price, sentiment}': lambda: analytics.history_points(prices),
+        'tuples (ts, prix)': lambda: [(int(ts), float(price)) for ts, price in prices],
+        'PriceSeries (colonnes int64/float64)': lambda: PriceSeries.from_points(prices),
+    }
+    print(f"Séries de prix : {args.points} points")
+    print(f"{'représentation':>40} | {'total (Mo)':>10} | {'octets/point':>12}")
+    print('-' * 68)
+    for name, build in series_cases.items():
+        size = measure(build)
+        print(f"{name:>40} | {size / 1e6:>10.1f} | {size / args.points:>12.1f}")
+
+    texts = [f'Bitcoin tweet number {i}' for i in range(args.texts)]
+    text_cases = {
+        'dictionnaires (avec affichage)': lambda: [tweet_dict(texts[i], i, 0.5) for i in range(args.texts)],
+        'Tweet (__slots__)': lambda: [Tweet(texts[i], 0.5, '12:00', f'user_{i % 100}', False)
+                                      for i in range(args.texts)],
+    }
+    print()
+    print(f"Tweets scorés : {args.texts} éléments (textes bruts non comptés)")
+    print(f"{'représentation':>40} | {'total (Mo)':>10} | {'octets/élément':>14}")
+    print('-' * 70)
+    for name, build in text_cases.items():
+        size = measure(build)
+        print(f"{name:>40} | {size / 1e6:>10.1f} | {size / args.texts:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
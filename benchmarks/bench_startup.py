@@ -0,0 +1,109 @@
+"""
+Benchmark : temps de démarrage de l'application (python -X importtime)
+
+Importe `app` dans un processus neuf, plusieurs fois, et relève le temps
+d'import cumulé (médiane), les modules les plus coûteux et la présence des
+dépendances chargées à la demande (SQLAlchemy, VADER, pool de processus),
+qui ne doivent pas être importées au démarrage. Mesure aussi le coût du
+préchargement (PRELOAD_HEAVY=true, pour gunicorn --preload).
+
+Usage :
+    python benchmarks/bench_startup.py [--runs 5] [--top 10] [--budget-ms 1500]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules qui ne doivent être importés qu'au premier usage
+LAZY_MODULES = ('sqlalchemy', 'vaderSentiment', 'concurrent.futures.process')
+
+# Temps d'import maximal de `app` (médiane, ms) vérifié par la suite de tests
+STARTUP_BUDGET_MS = 1500
+
+
+def parse_importtime(output: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Analyse la sortie de `python -X importtime`
+
+    Args:
+        output (str): Sortie d'erreur du processus
+
+    Returns:
+        Dict[str, Tuple[int, int]]: (temps propre, temps cumulé) en µs par module
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # ligne d'en-tête
+        modules[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return modules
+
+
+def import_profile(module: str = 'app', env: Optional[Dict[str, str]] = None) -> Dict[str, Tuple[int, int]]:
+    """Profil d'import de `module` dans un interpréteur neuf"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, env=dict(os.environ, **(env or {})),
+                            capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+
+def measure(module: str = 'app', runs: int = 5, env: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Temps d'import médian de `module` sur `runs` processus
+
+    Returns:
+        Dict: import_ms (médiane), runs, lazy_imported (modules paresseux importés),
+            profile (profil du dernier processus)
+    """
+    totals: List[float] = []
+    profile: Dict[str, Tuple[int, int]] = {}
+    for _ in range(runs):
+        profile = import_profile(module, env)
+        totals.append(profile[module][1] / 1000)
+    return {
+        'import_ms': round(statistics.median(totals), 1),
+        'runs': runs,
+        'lazy_imported': [name for name in LAZY_MODULES if name in profile],
+        'profile': profile
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS)
+    args = parser.parse_args()
+
+    result = measure(args.module, args.runs)
+    print(f"import {args.module} : {result['import_ms']} ms (médiane de {args.runs} processus)")
+    print(f"dépendances paresseuses importées au démarrage : {', '.join(result['lazy_imported']) or 'aucune'}")
+
+    print(f"\n{'module':>40} | {'propre (ms)':>11} | {'cumulé (ms)':>11}")
+    print('-' * 68)
+    top = sorted(result['profile'].items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in [item for item in top if '.' not in item[0]][:args.top]:
+        print(f"{name:>40} | {self_us / 1000:>11.1f} | {cumulative_us / 1000:>11.1f}")
+
+    preload = import_profile(args.module, {'PRELOAD_HEAVY': 'true'})
+    preloaded = {name: cumulative / 1000 for name, (_, cumulative) in preload.items() if name in LAZY_MODULES}
+    print(f"\nPRELOAD_HEAVY=true : import {preload[args.module][1] / 1000:.1f} ms, "
+          f"dont {', '.join(f'{name} {ms:.1f} ms' for name, ms in preloaded.items())} "
+          f"(lexique VADER compris dans le temps propre de {args.module})")
+
+    if result['import_ms'] > args.budget_ms or result['lazy_imported']:
+        print(f"\nRégression : budget {args.budget_ms} ms ou dépendance paresseuse importée")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
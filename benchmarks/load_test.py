@@ -0,0 +1,240 @@
+"""
+Test de charge des routes Flask contre un CoinGecko / Twitter simulé
+
+L'application est servie localement (serveur multi-thread Werkzeug) et ses
+appels externes sont redirigés vers deux serveurs simulés (voir
+stub_upstream.py) dont on règle la latence et le taux d'erreur. Chaque
+route est sollicitée par `--concurrency` clients pendant `--duration`
+secondes ; on mesure le débit (RPS) et les latences p50/p95/p99.
+
+Usage :
+    python benchmarks/load_test.py [--concurrency 8] [--duration 5] [--latency 0.05] [--error-rate 0.02]
+    python benchmarks/load_test.py --save-baseline benchmarks/baseline.json
+    python benchmarks/load_test.py --baseline benchmarks/baseline.json   # code 1 si régression
+
+Avec `--target http://host:port`, une instance déjà lancée est testée
+(gunicorn...) ; elle doit alors pointer elle-même vers les serveurs simulés.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_upstream import UpstreamStub
+
+# Routes sollicitées (nom -> chemin)
+ROUTES = {
+    'index': '/',
+    'crypto': '/api/crypto/bitcoin',
+    'history': '/api/history/bitcoin',
+    'dashboard_steady': '/dashboard/steady',
+    'dashboard_twitter': '/dashboard/twitter',
+    'dashboard_telegram': '/dashboard/telegram',
+}
+
+# Une régression est signalée au-delà de cet écart relatif avec la référence
+DEFAULT_TOLERANCE = 0.25
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Percentile `q` (0-100) par rang le plus proche ; liste déjà triée"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """
+    Résume une série de mesures
+
+    Args:
+        latencies (List[float]): Durées des requêtes (secondes)
+        errors (int): Réponses en erreur (statut >= 500 ou exception)
+        elapsed (float): Durée totale de la mesure (secondes)
+
+    Returns:
+        Dict: Nombre de requêtes, erreurs, RPS et p50/p95/p99 (millisecondes)
+    """
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'rps': round(len(ordered) / elapsed, 1) if elapsed > 0 else 0.0,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 2),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 2),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 2),
+    }
+
+
+def run_route(base_url: str, path: str, concurrency: int, duration: float) -> Dict:
+    """Sollicite `path` avec `concurrency` clients keep-alive pendant `duration` secondes"""
+    deadline = time.perf_counter() + duration
+
+    def client():
+        latencies, errors = [], 0
+        with requests.Session() as session:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = session.get(base_url + path, timeout=30)
+                    response.content
+                    failed = response.status_code >= 500
+                except requests.RequestException:
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+                errors += failed
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: client(), range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize([value for latencies, _ in results for value in latencies],
+                     sum(errors for _, errors in results), elapsed)
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compare des résultats à une référence
+
+    Returns:
+        List[str]: Régressions constatées (débit en baisse ou p95/p99 en hausse
+            au-delà de `tolerance`), vide si aucune
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result['rps'] < reference['rps'] * (1 - tolerance):
+            regressions.append(f"{name}: débit {result['rps']} RPS < référence {reference['rps']}")
+        for key in ('p95_ms', 'p99_ms'):
+            if result[key] > reference[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {result[key]} > référence {reference[key]}")
+    return regressions
+
+
+def configure_environment(coingecko: UpstreamStub, twitter: UpstreamStub, rate_per_minute: float,
+                          workdir: str) -> None:
+    """Variables lues à l'import de l'application : à fixer avant `import app`"""
+    os.environ.update({
+        'COINGECKO_API_URL': coingecko.coingecko_url,
+        'TWITTER_API_URL': twitter.twitter_url,
+        'TWITTER_BEARER_TOKEN': 'stub',
+        'COINGECKO_RATE_PER_MINUTE': str(rate_per_minute),
+        'DATABASE_URL': f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        'MARKET_REFRESHER_ENABLED': 'false',
+        'SENTIMENT_STREAM_ENABLED': 'false',
+        'CACHE_BACKEND': 'memory',
+    })
+
+
+def serve_app():
+    """Démarre l'application sur un port libre ; retourne (URL, serveur)"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import app as application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, application.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, name='load-test-app', daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server
+
+
+def run(routes: Dict[str, str], concurrency: int, duration: float, warmup: float,
+        base_url: str) -> Dict[str, Dict]:
+    results = {}
+    for name, path in routes.items():
+        if warmup > 0:
+            run_route(base_url, path, concurrency, warmup)
+        results[name] = run_route(base_url, path, concurrency, duration)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--routes', nargs='+', choices=sorted(ROUTES), default=list(ROUTES))
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0, help='secondes de mesure par route')
+    parser.add_argument('--warmup', type=float, default=1.0, help='secondes de chauffe par route')
+    parser.add_argument('--latency', type=float, default=0.05, help='latence simulée des API (secondes)')
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="taux d'erreurs simulées (0-1)")
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--rate-per-minute', type=float, default=100000,
+                        help="budget d'appels CoinGecko de l'application")
+    parser.add_argument('--target', help='URL d\'une instance déjà lancée (sinon servie localement)')
+    parser.add_argument('--baseline', help='fichier de référence à comparer (code 1 si régression)')
+    parser.add_argument('--save-baseline', help='enregistre les résultats comme référence')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--json', action='store_true', help='affiche les résultats en JSON')
+    args = parser.parse_args()
+
+    fault = dict(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                 error_status=args.error_status)
+    server = None
+    with UpstreamStub(seed=1, **fault) as coingecko, UpstreamStub(seed=2, **fault) as twitter, \
+            tempfile.TemporaryDirectory() as workdir:
+        if args.target:
+            base_url = args.target.rstrip('/')
+        else:
+            configure_environment(coingecko, twitter, args.rate_per_minute, workdir)
+            base_url, server = serve_app()
+        try:
+            results = run({name: ROUTES[name] for name in args.routes}, args.concurrency,
+                          args.duration, args.warmup, base_url)
+        finally:
+            if server is not None:
+                server.shutdown()
+        upstream = {'coingecko': coingecko.stats(), 'twitter': twitter.stats()}
+
+    if args.json:
+        print(json.dumps({'results': results, 'upstream': upstream}, indent=2))
+    else:
+        print(f"concurrence {args.concurrency}, {args.duration:g} s/route, latence amont "
+              f"{args.latency * 1000:g} ms (+{args.jitter * 1000:g}), erreurs amont {args.error_rate:.0%}")
+        print(f"{'route':>20} | {'requêtes':>8} | {'erreurs':>7} | {'RPS':>8} | "
+              f"{'p50 (ms)':>9} | {'p95 (ms)':>9} | {'p99 (ms)':>9}")
+        print('-' * 88)
+        for name, result in results.items():
+            print(f"{name:>20} | {result['requests']:>8} | {result['errors']:>7} | {result['rps']:>8.1f} | "
+                  f"{result['p50_ms']:>9.2f} | {result['p95_ms']:>9.2f} | {result['p99_ms']:>9.2f}")
+        print(f"appels amont : {upstream}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'environment': {'python': platform.python_version(), 'machine': platform.machine(),
+                                'concurrency': args.concurrency, 'duration': args.duration,
+                                'latency': args.latency, 'jitter': args.jitter, 'error_rate': args.error_rate},
+                'results': results
+            }, f, indent=2)
+            f.write('\n')
+        print(f"Référence enregistrée dans {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"Aucune régression (tolérance {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
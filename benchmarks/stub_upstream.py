@@ -0,0 +1,298 @@
+"""
+Serveur simulé CoinGecko / Twitter pour les benchmarks et tests de charge
+
+Réponses au format des vraies API, avec injection de latence et d'erreurs :
+    GET /api/v3/coins/<id>
+    GET /api/v3/coins/<id>/market_chart?days=1
+    GET /api/v3/coins/<id>/market_chart/range?from=&to=
+    GET /api/v3/simple/price?ids=a,b&vs_currencies=usd
+    GET /api/v3/exchange_rates
+    GET /2/tweets/search/recent?max_results=10[&since_id=][&next_token=]
+
+Usage :
+    python benchmarks/stub_upstream.py [--port 8801] [--latency 0.05] [--jitter 0.02] [--error-rate 0.05]
+
+puis lancer l'application avec :
+    COINGECKO_API_URL=http://127.0.0.1:8801/api/v3 TWITTER_API_URL=http://127.0.0.1:8801/2 \\
+    TWITTER_BEARER_TOKEN=stub python app.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+STUB_TWEETS = [
+    "Bitcoin to the moon! Bullish breakout confirmed",
+    "Market looks weak, expecting a correction soon",
+    "Just bought more BTC, long term holder",
+    "ETH gas fees are terrible today",
+    "Solana network is fast and cheap, great adoption",
+    "Regulation news is scary, selling everything",
+]
+
+# Taux de change simulés (unités de la devise pour 1 USD)
+STUB_FX = {'usd': 1.0, 'eur': 0.92, 'gbp': 0.79, 'jpy': 150.0, 'chf': 0.88}
+
+# ID du tweet n°0 du flux simulé (les IDs croissent avec la date, comme les snowflakes)
+TWEET_ID_BASE = 1_700_000_000_000_000_000
+
+
+def base_price(coin_id: str) -> float:
+    """Prix de référence stable pour une crypto (dérivé de son identifiant)"""
+    return 1 + zlib.crc32(coin_id.encode('utf-8')) % 50000
+
+
+def price_at(coin_id: str, ts: float) -> float:
+    """Prix simulé, déterministe, à l'instant `ts` (secondes)"""
+    phase = zlib.crc32(coin_id.encode('utf-8')) % 1000
+    step = int(ts // 300)
+    noise = ((step * 7919 + phase) % 200 - 100) / 10000
+    return round(base_price(coin_id) * (1 + noise), 2)
+
+
+def chart_prices(coin_id: str, start: float, end: float):
+    """Points [ts_ms, prix] avec la granularité de CoinGecko (5 min, 1 h ou 1 jour)"""
+    span = end - start
+    step = 300 if span <= 86400 else 3600 if span <= 90 * 86400 else 86400
+    first = int(start // step + 1) * step
+    return [[ts * 1000, price_at(coin_id, ts)] for ts in range(first, int(end) + 1, step)]
+
+
+class UpstreamStub:
+    """
+    Serveur HTTP local imitant CoinGecko et Twitter
+
+    Args:
+        latency (float): Délai ajouté à chaque réponse (secondes)
+        jitter (float): Délai aléatoire supplémentaire, uniforme dans [0, jitter]
+        error_rate (float): Probabilité de répondre `error_status`
+        error_status (int): Code renvoyé pour les erreurs injectées (500, 429...)
+        seed (int): Graine du tirage des latences et erreurs (reproductibilité)
+        tweet_rate (float): Tweets publiés par seconde dans le flux simulé
+        tweet_backlog (float): Ancienneté (secondes) des premiers tweets du flux
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 500, seed: int = 0, host: str = '127.0.0.1', port: int = 0,
+                 tweet_rate: float = 0.2, tweet_backlog: float = 3600):
+        self.tweet_rate = tweet_rate
+        self.tweet_epoch = time.time() - tweet_backlog
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.host = host
+        self.port = port
+        self.requests: Counter = Counter()
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    @property
+    def coingecko_url(self) -> str:
+        return f'{self.url}/api/v3'
+
+    @property
+    def twitter_url(self) -> str:
+        return f'{self.url}/2'
+
+    def start(self) -> 'UpstreamStub':
+        """Démarre le serveur dans un thread (port libre si `port=0`)"""
+        stub = self
+
+        class Handler(StubHandler):
+            upstream = stub
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='upstream-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'UpstreamStub':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def draw_fault(self):
+        """Tire la latence et l'éventuelle erreur d'une requête : (délai, erreur ?)"""
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return delay, failed
+
+    def record(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'requests': dict(self.requests), 'errors': self.errors}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routage des requêtes vers les réponses simulées"""
+
+    upstream: UpstreamStub = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        segments = [segment for segment in parts.path.split('/') if segment]
+        route, payload = self.route(segments, query)
+        self.upstream.record(route)
+
+        delay, failed = self.upstream.draw_fault()
+        if delay:
+            time.sleep(delay)
+        if payload is None:
+            self.send_json(404, {'error': 'coin not found'})
+        elif failed:
+            self.send_json(self.upstream.error_status, {'error': 'injected failure'})
+        else:
+            self.send_json(200, payload)
+
+    def route(self, segments, query):
+        now = time.time()
+        if segments[:2] == ['api', 'v3']:
+            rest = segments[2:]
+            if rest == ['simple', 'price']:
+                ids = [coin for coin in query.get('ids', '').split(',') if coin]
+                return 'simple_price', {coin: {'usd': price_at(coin, now), 'usd_24h_change': 1.5} for coin in ids}
+            if rest == ['exchange_rates']:
+                return 'exchange_rates', exchange_rates_payload(now)
+            if len(rest) == 2 and rest[0] == 'coins':
+                return 'coin', coin_payload(rest[1], now)
+            if len(rest) == 3 and rest[0] == 'coins' and rest[2] == 'market_chart':
+                days = float(query.get('days', 1))
+                return 'market_chart', {'prices': chart_prices(rest[1], now - days * 86400, now)}
+            if len(rest) == 4 and rest[0] == 'coins' and rest[2:] == ['market_chart', 'range']:
+                start, end = float(query.get('from', now - 86400)), float(query.get('to', now))
+                return 'market_chart_range', {'prices': chart_prices(rest[1], start, end)}
+        if segments == ['2', 'tweets', 'search', 'recent']:
+            return 'tweets', tweets_payload(int(query.get('max_results', 10)), now, self.upstream.tweet_epoch,
+                                            self.upstream.tweet_rate, query.get('since_id'),
+                                            query.get('next_token'))
+        return 'unknown', None
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def coin_payload(coin_id: str, now: float) -> Dict:
+    """Réponse /coins/<id> (champs utilisés par l'application uniquement)"""
+    price = price_at(coin_id, now)
+    return {
+        'id': coin_id,
+        'name': coin_id.capitalize(),
+        'symbol': coin_id[:3],
+        'image': {'small': f'https://example.invalid/{coin_id}.png'},
+        'market_data': {
+            'current_price': {'usd': price},
+            'price_change_percentage_24h': 1.2345,
+            'market_cap': {'usd': price * 19_000_000},
+            'total_volume': {'usd': price * 500_000},
+            'high_24h': {'usd': round(price * 1.05, 2)},
+            'low_24h': {'usd': round(price * 0.95, 2)},
+        }
+    }
+
+
+def exchange_rates_payload(now: float) -> Dict:
+    """Réponse /exchange_rates : valeur de 1 BTC dans chaque devise"""
+    btc = price_at('bitcoin', now)
+    rates = {'btc': {'name': 'Bitcoin', 'unit': 'BTC', 'value': 1.0, 'type': 'crypto'}}
+    for currency, rate in STUB_FX.items():
+        rates[currency] = {'name': currency.upper(), 'unit': currency.upper(), 'value': btc * rate, 'type': 'fiat'}
+    return {'rates': rates}
+
+
+def tweets_payload(count: int, now: float, epoch: Optional[float] = None, rate: float = 1 / 60,
+                   since_id: Optional[str] = None, next_token: Optional[str] = None) -> Dict:
+    """
+    Réponse /tweets/search/recent, du plus récent au plus ancien
+
+    Le tweet n°k du flux est publié à `epoch + k / rate` avec l'ID
+    TWEET_ID_BASE + k. Comme l'API v2, `since_id` exclut les tweets plus
+    anciens ou égaux et `next_token` (ici l'index du premier tweet de la page
+    suivante) pagine vers le passé.
+    """
+    if epoch is None:
+        epoch = now - 3600
+    newest = int((now - epoch) * rate)
+    top = min(newest, int(next_token)) if next_token else newest
+    floor = max(0, int(since_id) - TWEET_ID_BASE + 1) if since_id else 0
+    data = []
+    for k in range(top, max(floor, top - count + 1) - 1, -1):
+        created = datetime.fromtimestamp(epoch + k / rate, tz=timezone.utc)
+        data.append({
+            'id': str(TWEET_ID_BASE + k),
+            'text': STUB_TWEETS[k % len(STUB_TWEETS)],
+            'created_at': created.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'author_id': f'stub_{k % 5}',
+            'public_metrics': {'like_count': k % 50, 'retweet_count': 0, 'reply_count': 0, 'quote_count': 0}
+        })
+    meta = {'result_count': len(data)}
+    if data:
+        meta['newest_id'], meta['oldest_id'] = data[0]['id'], data[-1]['id']
+        if top - count >= floor:
+            meta['next_token'] = str(top - count)
+    return {'data': data, 'meta': meta}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8801)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=500)
+    args = parser.parse_args()
+
+    stub = UpstreamStub(args.latency, args.jitter, args.error_rate, args.error_status,
+                        host=args.host, port=args.port).start()
+    print(f"Serveur simulé sur {stub.url} (CoinGecko : {stub.coingecko_url}, Twitter : {stub.twitter_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,394 @@
+import math
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.crypto_api import chunk_ids, get_multiple_cryptos
+
+# Au-delà de cette part de cryptos modifiées, on revalorise tout le livre en
+# une passe vectorisée plutôt que position par position
+FULL_REVALUE_RATIO = 0.25
+
+
+def _ensure_capacity(column: np.ndarray, size: int) -> np.ndarray:
+    """Agrandit une colonne (capacité doublée) pour contenir `size` éléments"""
+    if size <= column.size:
+        return column
+    grown = np.zeros(max(size, column.size * 2), dtype=column.dtype)
+    grown[:column.size] = column
+    return grown
+
+
+class PortfolioBook:
+    """
+    Ensemble de portefeuilles valorisés de façon incrémentale
+
+    Les positions sont stockées en colonnes (tableaux NumPy) : portefeuille,
+    crypto, quantité et coût d'acquisition, chaque crypto et portefeuille
+    étant réduit à un index entier. Les agrégats (valeur et coût par
+    portefeuille, quantité totale par crypto) sont maintenus à jour :
+
+    - changement d'une position : O(1)
+    - changement du prix d'une crypto : O(positions détenant cette crypto)
+    - exposition par crypto : O(1) (quantité totale x prix)
+
+    Quand la majorité des prix change d'un coup (rafraîchissement complet),
+    le livre est revalorisé en une seule passe `np.bincount`, ce qui corrige
+    aussi la dérive d'arrondi des mises à jour incrémentales.
+
+    Les transactions sont conservées dans un journal compact (modules
+    `array`) ; le coût d'une position suit la méthode du coût moyen.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.RLock()
+
+        # Index entiers des portefeuilles et des cryptos
+        self._portfolio_ids: List[str] = []
+        self._portfolio_index: Dict[str, int] = {}
+        self._coin_ids: List[str] = []
+        self._coin_index: Dict[str, int] = {}
+
+        # Positions en colonnes (capacité doublée à la demande)
+        self._size = 0
+        self._pos_portfolio = np.zeros(capacity, dtype=np.int32)
+        self._pos_coin = np.zeros(capacity, dtype=np.int32)
+        self._pos_quantity = np.zeros(capacity, dtype=np.float64)
+        self._pos_cost = np.zeros(capacity, dtype=np.float64)
+        self._slots: Dict[tuple, int] = {}
+        self._portfolio_slots: List[List[int]] = []
+        self._coin_slots: List[List[int]] = []
+        self._coin_slots_array: Dict[int, np.ndarray] = {}
+
+        # Agrégats maintenus incrémentalement (par crypto et par portefeuille)
+        self._prices = np.zeros(64, dtype=np.float64)
+        self._coin_quantity = np.zeros(64, dtype=np.float64)
+        self._value = np.zeros(64, dtype=np.float64)
+        self._cost = np.zeros(64, dtype=np.float64)
+        self._realized = np.zeros(64, dtype=np.float64)
+
+        # Journal des transactions
+        self._tx_portfolio = array('i')
+        self._tx_coin = array('i')
+        self._tx_quantity = array('d')
+        self._tx_price = array('d')
+        self._tx_ts = array('d')
+
+        self._stats = {'incremental_updates': 0, 'full_revalues': 0}
+
+    # --- Index ---
+
+    def _portfolio(self, portfolio_id: str, create: bool = True) -> Optional[int]:
+        index = self._portfolio_index.get(portfolio_id)
+        if index is None and create:
+            index = len(self._portfolio_ids)
+            self._portfolio_ids.append(portfolio_id)
+            self._portfolio_index[portfolio_id] = index
+            self._portfolio_slots.append([])
+            self._value = _ensure_capacity(self._value, index + 1)
+            self._cost = _ensure_capacity(self._cost, index + 1)
+            self._realized = _ensure_capacity(self._realized, index + 1)
+        return index
+
+    def _coin(self, coin_id: str, create: bool = True) -> Optional[int]:
+        index = self._coin_index.get(coin_id)
+        if index is None and create:
+            index = len(self._coin_ids)
+            self._coin_ids.append(coin_id)
+            self._coin_index[coin_id] = index
+            self._coin_slots.append([])
+            self._prices = _ensure_capacity(self._prices, index + 1)
+            self._coin_quantity = _ensure_capacity(self._coin_quantity, index + 1)
+        return index
+
+    def _slot(self, p: int, c: int) -> int:
+        slot = self._slots.get((p, c))
+        if slot is not None:
+            return slot
+        slot = self._size
+        if slot >= self._pos_quantity.size:
+            for name in ('_pos_portfolio', '_pos_coin', '_pos_quantity', '_pos_cost'):
+                setattr(self, name, _ensure_capacity(getattr(self, name), slot + 1))
+        self._size += 1
+        self._pos_portfolio[slot] = p
+        self._pos_coin[slot] = c
+        self._slots[(p, c)] = slot
+        self._portfolio_slots[p].append(slot)
+        self._coin_slots[c].append(slot)
+        self._coin_slots_array.pop(c, None)
+        return slot
+
+    def add_portfolio(self, portfolio_id: str) -> None:
+        """Crée un portefeuille vide (sans effet s'il existe déjà)"""
+        with self._lock:
+            self._portfolio(portfolio_id)
+
+    # --- Positions et transactions ---
+
+    def _apply(self, slot: int, quantity: float, cost: float) -> None:
+        """Remplace une position et répercute l'écart sur les agrégats"""
+        p = self._pos_portfolio[slot]
+        c = self._pos_coin[slot]
+        delta_quantity = quantity - self._pos_quantity[slot]
+        self._value[p] += delta_quantity * self._prices[c]
+        self._cost[p] += cost - self._pos_cost[slot]
+        self._coin_quantity[c] += delta_quantity
+        self._pos_quantity[slot] = quantity
+        self._pos_cost[slot] = cost
+
+    def set_position(self, portfolio_id: str, coin_id: str, quantity: float, cost_basis: float) -> None:
+        """
+        Définit directement une position (import d'un portefeuille existant)
+
+        Args:
+            portfolio_id (str): Identifiant du portefeuille
+            coin_id (str): ID de la crypto
+            quantity (float): Quantité détenue
+            cost_basis (float): Coût d'acquisition total
+        """
+        quantity = float(quantity)
+        cost_basis = float(cost_basis)
+        if not (math.isfinite(quantity) and math.isfinite(cost_basis)):
+            raise ValueError("Quantité et coût doivent être des nombres finis")
+        with self._lock:
+            slot = self._slot(self._portfolio(portfolio_id), self._coin(coin_id))
+            self._apply(slot, quantity, cost_basis)
+
+    def record_transaction(self, portfolio_id: str, coin_id: str, quantity: float, price: float,
+                           ts: Optional[float] = None) -> float:
+        """
+        Enregistre un achat (quantité > 0) ou une vente (quantité < 0)
+
+        Args:
+            portfolio_id (str): Identifiant du portefeuille
+            coin_id (str): ID de la crypto
+            quantity (float): Quantité achetée (positive) ou vendue (négative)
+            price (float): Prix unitaire d'exécution
+            ts (float): Horodatage (secondes), maintenant par défaut
+
+        Returns:
+            float: P&L réalisé par la transaction (0 pour un achat)
+        """
+        # Validation complète avant toute écriture : une transaction refusée ne
+        # modifie ni la position ni le journal
+        quantity = float(quantity)
+        price = float(price)
+        ts = time.time() if ts is None else float(ts)
+        if not all(math.isfinite(value) for value in (quantity, price, ts)):
+            raise ValueError("Quantité, prix et horodatage doivent être des nombres finis")
+        if quantity == 0:
+            raise ValueError("La quantité doit être non nulle")
+        if price < 0:
+            raise ValueError("Le prix doit être positif")
+
+        with self._lock:
+            # Vente contrôlée sur la position existante (absente = 0 détenu), avant
+            # de créer le portefeuille, la crypto ou la position
+            p = self._portfolio(portfolio_id, create=False)
+            c = self._coin(coin_id, create=False)
+            existing = self._slots.get((p, c)) if p is not None and c is not None else None
+            held = float(self._pos_quantity[existing]) if existing is not None else 0.0
+            if quantity < 0 and -quantity > held + 1e-12:
+                raise ValueError(f"Quantité insuffisante : {held} {coin_id} détenus")
+
+            p = self._portfolio(portfolio_id)
+            c = self._coin(coin_id)
+            slot = self._slot(p, c)
+            cost = float(self._pos_cost[slot])
+
+            realized = 0.0
+            if quantity > 0:
+                self._apply(slot, held + quantity, cost + quantity * price)
+            else:
+                sold = -quantity
+                average_cost = cost / held if held else 0.0
+                realized = sold * (price - average_cost)
+                remaining = max(held - sold, 0.0)
+                self._apply(slot, remaining, average_cost * remaining)
+                self._realized[p] += realized
+
+            self._tx_portfolio.append(p)
+            self._tx_coin.append(c)
+            self._tx_quantity.append(quantity)
+            self._tx_price.append(price)
+            self._tx_ts.append(ts)
+            return realized
+
+    def transactions(self, portfolio_id: str) -> List[Dict]:
+        """Journal des transactions d'un portefeuille, dans l'ordre"""
+        with self._lock:
+            p = self._portfolio(portfolio_id, create=False)
+            if p is None:
+                return []
+            return [{
+                'coin_id': self._coin_ids[self._tx_coin[i]],
+                'quantity': self._tx_quantity[i],
+                'price': self._tx_price[i],
+                'ts': self._tx_ts[i]
+            } for i in range(len(self._tx_portfolio)) if self._tx_portfolio[i] == p]
+
+    # --- Prix ---
+
+    def _slots_for_coin(self, c: int) -> np.ndarray:
+        slots = self._coin_slots_array.get(c)
+        if slots is None:
+            slots = np.asarray(self._coin_slots[c], dtype=np.int64)
+            self._coin_slots_array[c] = slots
+        return slots
+
+    def update_prices(self, prices: Dict[str, float]) -> int:
+        """
+        Met à jour des prix et revalorise uniquement les positions concernées
+
+        Args:
+            prices (Dict[str, float]): Prix par crypto (les cryptos non
+                détenues sont ignorées)
+
+        Returns:
+            int: Nombre de cryptos dont le prix a changé
+        """
+        with self._lock:
+            changed = {}
+            for coin_id, price in prices.items():
+                c = self._coin_index.get(coin_id)
+                if c is not None and price is not None and price != self._prices[c]:
+                    changed[c] = float(price)
+            if not changed:
+                return 0
+
+            if len(changed) >= FULL_REVALUE_RATIO * len(self._coin_ids):
+                for c, price in changed.items():
+                    self._prices[c] = price
+                self._revalue_all()
+                return len(changed)
+
+            for c, price in changed.items():
+                delta = price - self._prices[c]
+                self._prices[c] = price
+                slots = self._slots_for_coin(c)
+                if slots.size:
+                    np.add.at(self._value, self._pos_portfolio[slots], self._pos_quantity[slots] * delta)
+            self._stats['incremental_updates'] += 1
+            return len(changed)
+
+    def _revalue_all(self) -> None:
+        """Recalcule toutes les valeurs en une passe (corrige la dérive d'arrondi)"""
+        n = self._size
+        position_values = self._pos_quantity[:n] * self._prices[self._pos_coin[:n]]
+        self._value = np.bincount(self._pos_portfolio[:n], weights=position_values,
+                                  minlength=self._value.size).astype(np.float64)
+        self._stats['full_revalues'] += 1
+
+    def refresh_prices(self, fetch: Callable[[List[str]], Dict] = get_multiple_cryptos,
+                       vs_currency: str = 'usd') -> int:
+        """
+        Récupère les prix de toutes les cryptos détenues et revalorise le livre
+
+        Args:
+            fetch (Callable): Fonction ids -> {id: {'usd': prix, ...}}, par
+                défaut `get_multiple_cryptos` (appelée par lots)
+            vs_currency (str): Clé du prix dans la réponse
+
+        Returns:
+            int: Nombre de cryptos dont le prix a changé
+        """
+        with self._lock:
+            held = [coin_id for c, coin_id in enumerate(self._coin_ids) if self._coin_quantity[c] > 0]
+
+        prices = {}
+        for chunk in chunk_ids(held):
+            for coin_id, data in (fetch(chunk) or {}).items():
+                if isinstance(data, dict) and data.get(vs_currency) is not None:
+                    prices[coin_id] = data[vs_currency]
+        return self.update_prices(prices)
+
+    # --- Lecture ---
+
+    def valuation(self, portfolio_id: str) -> Optional[Dict]:
+        """
+        Valeur et P&L d'un portefeuille (lecture des agrégats, O(1))
+
+        Returns:
+            Dict: value, cost_basis, unrealized_pnl, unrealized_pnl_pct,
+            realized_pnl ; None si le portefeuille est inconnu
+        """
+        with self._lock:
+            p = self._portfolio(portfolio_id, create=False)
+            if p is None:
+                return None
+            value = float(self._value[p])
+            cost = float(self._cost[p])
+            unrealized = value - cost
+            return {
+                'value': round(value, 2),
+                'cost_basis': round(cost, 2),
+                'unrealized_pnl': round(unrealized, 2),
+                'unrealized_pnl_pct': round(unrealized / cost * 100, 2) if cost else 0.0,
+                'realized_pnl': round(float(self._realized[p]), 2)
+            }
+
+    def positions(self, portfolio_id: str) -> List[Dict]:
+        """Positions ouvertes d'un portefeuille avec valeur, P&L et poids"""
+        with self._lock:
+            p = self._portfolio(portfolio_id, create=False)
+            if p is None:
+                return []
+            total = float(self._value[p])
+            result = []
+            for slot in self._portfolio_slots[p]:
+                quantity = float(self._pos_quantity[slot])
+                if quantity <= 0:
+                    continue
+                c = int(self._pos_coin[slot])
+                price = float(self._prices[c])
+                value = quantity * price
+                cost = float(self._pos_cost[slot])
+                result.append({
+                    'coin_id': self._coin_ids[c],
+                    'quantity': quantity,
+                    'price': price,
+                    'value': round(value, 2),
+                    'cost_basis': round(cost, 2),
+                    'unrealized_pnl': round(value - cost, 2),
+                    'weight': round(value / total * 100, 2) if total else 0.0
+                })
+            return result
+
+    def allocation(self, portfolio_id: str) -> Dict[str, float]:
+        """Répartition d'un portefeuille par crypto (en % de sa valeur)"""
+        return {position['coin_id']: position['weight'] for position in self.positions(portfolio_id)}
+
+    def exposure(self, coin_ids: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Exposition totale du livre par crypto (quantité totale x prix)
+
+        Args:
+            coin_ids (Iterable[str]): Cryptos à inclure (toutes par défaut)
+
+        Returns:
+            Dict[str, float]: Valeur détenue par crypto, tous portefeuilles confondus
+        """
+        with self._lock:
+            ids = self._coin_ids if coin_ids is None else [c for c in coin_ids if c in self._coin_index]
+            return {coin_id: round(float(self._coin_quantity[self._coin_index[coin_id]] *
+                                         self._prices[self._coin_index[coin_id]]), 2)
+                    for coin_id in ids}
+
+    def total_value(self) -> float:
+        """Valeur totale de tous les portefeuilles"""
+        with self._lock:
+            return float(self._value[:len(self._portfolio_ids)].sum())
+
+    def stats(self) -> Dict:
+        """Taille du livre et nombre de revalorisations"""
+        with self._lock:
+            return {
+                'portfolios': len(self._portfolio_ids),
+                'coins': len(self._coin_ids),
+                'positions': self._size,
+                'transactions': len(self._tx_portfolio),
+                **self._stats
+            }
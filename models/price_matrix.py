@@ -0,0 +1,205 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Devise dans laquelle les prix sont demandés à CoinGecko
+BASE_CURRENCY = 'usd'
+
+
+def _ensure_rows(matrix: np.ndarray, rows: int) -> np.ndarray:
+    """Agrandit la matrice (capacité doublée, lignes inconnues à NaN) pour contenir `rows` lignes"""
+    if rows <= matrix.shape[0]:
+        return matrix
+    grown = np.full((max(rows, matrix.shape[0] * 2), matrix.shape[1]), np.nan)
+    grown[:matrix.shape[0]] = matrix
+    return grown
+
+
+class PriceMatrix:
+    """
+    Prix de toutes les cryptos dans toutes les devises, dérivés localement
+
+    Chaque crypto n'est récupérée qu'une fois, dans la devise de base ; une
+    table de change (une ligne par devise : unités de la devise pour 1 unité
+    de base) suffit pour en déduire les autres. Les prix sont gardés dans un
+    tableau dense (crypto x devise), chaque crypto et devise étant réduite à
+    un index entier :
+
+    - prix d'une crypto dans une devise : O(1) (une case du tableau)
+    - nouveau prix d'une crypto : O(devises) (une ligne)
+    - nouvelle table de change : une passe vectorisée (produit extérieur)
+
+    Un prix inconnu (crypto jamais vue, devise sans taux) vaut NaN et est
+    retourné comme None.
+    """
+
+    def __init__(self, currencies: Iterable[str] = (BASE_CURRENCY,), base: str = BASE_CURRENCY,
+                 capacity: int = 64):
+        self._lock = threading.RLock()
+        self.base = base.lower()
+        self._currencies: List[str] = list(dict.fromkeys([self.base, *(c.lower() for c in currencies)]))
+        self._currency_index = {currency: k for k, currency in enumerate(self._currencies)}
+
+        # Taux de change (unités de la devise pour 1 unité de base) ; base = 1
+        self._fx = np.full(len(self._currencies), np.nan)
+        self._fx[0] = 1.0
+
+        self._coin_ids: List[str] = []
+        self._coin_index: Dict[str, int] = {}
+        self._base_prices = np.full(capacity, np.nan)
+        self._matrix = np.full((capacity, len(self._currencies)), np.nan)
+        self._stats = {'price_updates': 0, 'fx_updates': 0}
+
+    @property
+    def currencies(self) -> List[str]:
+        return list(self._currencies)
+
+    def _coin(self, coin_id: str) -> int:
+        index = self._coin_index.get(coin_id)
+        if index is None:
+            index = len(self._coin_ids)
+            # Tableaux agrandis avant de publier l'index : les lectures sans verrou
+            # ne voient jamais un index hors de la matrice
+            if index >= self._base_prices.size:
+                grown = np.full(self._base_prices.size * 2, np.nan)
+                grown[:self._base_prices.size] = self._base_prices
+                self._base_prices = grown
+            self._matrix = _ensure_rows(self._matrix, index + 1)
+            self._coin_ids.append(coin_id)
+            self._coin_index[coin_id] = index
+        return index
+
+    # --- Mises à jour ---
+
+    def update_prices(self, prices: Dict[str, float]) -> int:
+        """
+        Met à jour des prix en devise de base et leurs lignes de la matrice
+
+        Args:
+            prices (Dict[str, float]): Prix en devise de base par crypto
+
+        Returns:
+            int: Nombre de cryptos dont le prix a changé
+        """
+        with self._lock:
+            changed = 0
+            for coin_id, price in prices.items():
+                if price is None:
+                    continue
+                c = self._coin(coin_id)
+                if self._base_prices[c] == price:
+                    continue
+                self._base_prices[c] = price
+                self._matrix[c] = price * self._fx
+                changed += 1
+            if changed:
+                self._stats['price_updates'] += 1
+            return changed
+
+    def update_fx(self, rates: Dict[str, float]) -> int:
+        """
+        Met à jour la table de change et recalcule toute la matrice
+
+        Args:
+            rates (Dict[str, float]): Unités de chaque devise pour 1 unité de
+                base (les devises non suivies sont ignorées)
+
+        Returns:
+            int: Nombre de devises dont le taux a changé
+        """
+        with self._lock:
+            changed = 0
+            for currency, rate in rates.items():
+                k = self._currency_index.get(currency.lower())
+                if k is None or k == 0 or rate is None or rate <= 0 or self._fx[k] == rate:
+                    continue
+                self._fx[k] = rate
+                changed += 1
+            if changed:
+                n = len(self._coin_ids)
+                self._matrix[:n] = np.outer(self._base_prices[:n], self._fx)
+                self._stats['fx_updates'] += 1
+            return changed
+
+    def update_from_exchange_rates(self, payload: Dict) -> int:
+        """
+        Met à jour la table de change depuis une réponse CoinGecko /exchange_rates
+
+        Les taux y sont exprimés pour 1 BTC : le taux d'une devise par rapport
+        à la base est le rapport de leurs deux valeurs.
+        """
+        rates = payload.get('rates', {})
+        base_value = rates.get(self.base, {}).get('value')
+        if not base_value:
+            raise ValueError(f"Taux de change sans devise de base '{self.base}'")
+        return self.update_fx({currency: rates[currency]['value'] / base_value
+                               for currency in self._currencies if rates.get(currency, {}).get('value')})
+
+    # --- Lecture ---
+
+    def has_currency(self, currency: str) -> bool:
+        """Devise suivie et dont le taux est connu"""
+        k = self._currency_index.get(currency.lower())
+        return k is not None and not np.isnan(self._fx[k])
+
+    def rate(self, currency: str) -> Optional[float]:
+        """Unités de `currency` pour 1 unité de base (None si inconnu)"""
+        k = self._currency_index.get(currency.lower())
+        if k is None:
+            return None
+        rate = float(self._fx[k])
+        return None if np.isnan(rate) else rate
+
+    def price(self, coin_id: str, currency: str = BASE_CURRENCY) -> Optional[float]:
+        """Prix d'une crypto dans une devise (lecture d'une case, O(1))"""
+        c = self._coin_index.get(coin_id)
+        k = self._currency_index.get(currency.lower())
+        if c is None or k is None:
+            return None
+        price = float(self._matrix[c, k])
+        return None if np.isnan(price) else price
+
+    def convert(self, amount: float, source: str, target: str) -> Optional[float]:
+        """
+        Convertit un montant entre deux devises ou cryptos (taux croisé dérivé)
+
+        Args:
+            amount (float): Montant exprimé dans `source`
+            source (str): Devise ou ID de crypto de départ
+            target (str): Devise ou ID de crypto d'arrivée
+
+        Returns:
+            float: Montant dans `target` ; None si un des taux est inconnu
+        """
+        with self._lock:
+            source_value = self._base_value(source)
+            target_value = self._base_value(target)
+        if source_value is None or target_value is None:
+            return None
+        return amount * source_value / target_value
+
+    def _base_value(self, key: str) -> Optional[float]:
+        """Valeur d'une unité de `key` (devise ou crypto) en devise de base"""
+        c = self._coin_index.get(key)
+        if c is not None:
+            value = float(self._base_prices[c])
+        else:
+            rate = self.rate(key)
+            value = 1 / rate if rate else float('nan')
+        return None if np.isnan(value) or value <= 0 else value
+
+    def row(self, coin_id: str) -> Dict[str, Optional[float]]:
+        """Prix d'une crypto dans toutes les devises suivies"""
+        return {currency: self.price(coin_id, currency) for currency in self._currencies}
+
+    def stats(self) -> Dict:
+        """Taille de la matrice et nombre de mises à jour"""
+        with self._lock:
+            return {
+                'coins': len(self._coin_ids),
+                'currencies': len(self._currencies),
+                'fx_known': int(np.count_nonzero(~np.isnan(self._fx))),
+                'nbytes': int(self._matrix.nbytes),
+                **self._stats
+            }
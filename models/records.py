@@ -0,0 +1,242 @@
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from utils import analytics
+
+# Seuils VADER de classification (score composé)
+SENTIMENT_THRESHOLD = 0.05
+POSITIVE = 'Positif'
+NEGATIVE = 'Négatif'
+NEUTRAL = 'Neutre'
+
+
+def classify(score: float) -> str:
+    """Classification d'un score VADER : 'Positif', 'Négatif' ou 'Neutre'"""
+    if score >= SENTIMENT_THRESHOLD:
+        return POSITIVE
+    if score <= -SENTIMENT_THRESHOLD:
+        return NEGATIVE
+    return NEUTRAL
+
+
+class ScoredText:
+    """
+    Texte scoré par VADER (post, article, tweet, signal)
+
+    Seules les données sont stockées (`__slots__`, pas de dictionnaire par
+    instance) ; la classification et les attributs d'affichage (couleur,
+    icône) sont dérivés du score au moment du rendu, à partir de tables
+    partagées par la classe.
+    """
+
+    __slots__ = ('text', 'score')
+
+    # Attributs d'affichage par classification
+    COLORS = {POSITIVE: 'emerald', NEGATIVE: 'red', NEUTRAL: 'gray'}
+    ICONS = {POSITIVE: 'fa-arrow-up', NEGATIVE: 'fa-arrow-down', NEUTRAL: 'fa-minus'}
+
+    # Champs exportés en JSON : (clé, attribut)
+    FIELDS: Tuple[Tuple[str, str], ...] = (('text', 'text'), ('sentiment_score', 'sentiment_score'),
+                                           ('classification', 'classification'))
+
+    def __init__(self, text: str, score: float):
+        self.text = text
+        self.score = score
+
+    @property
+    def sentiment_score(self) -> float:
+        return round(self.score, 3)
+
+    @property
+    def classification(self) -> str:
+        return classify(self.score)
+
+    @property
+    def color(self) -> str:
+        return self.COLORS[self.classification]
+
+    @property
+    def icon(self) -> str:
+        return self.ICONS[self.classification]
+
+    def to_dict(self) -> Dict:
+        """Données de l'enregistrement (sans attributs d'affichage), pour le JSON"""
+        return {key: getattr(self, attribute) for key, attribute in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+
+class ScoredPost(ScoredText):
+    """Post de réseau social analysé (page principale)"""
+
+    __slots__ = ()
+
+    ICONS = {POSITIVE: 'fa-smile', NEGATIVE: 'fa-frown', NEUTRAL: 'fa-meh'}
+
+    FIELDS = (('text', 'text'), ('score', 'sentiment_score'), ('classification', 'classification'))
+
+
+class NewsArticle(ScoredText):
+    """Article d'actualité scoré sur son titre"""
+
+    __slots__ = ('source', 'published_at')
+
+    COLORS = {POSITIVE: 'emerald', NEGATIVE: 'red', NEUTRAL: 'amber'}
+
+    FIELDS = (('title', 'text'), ('source', 'source'), ('published_at', 'published_at'),
+              ('sentiment_score', 'sentiment_score'), ('classification', 'classification'))
+
+    def __init__(self, title: str, score: float, source: str, published_at: str):
+        super().__init__(title, score)
+        self.source = source
+        self.published_at = published_at
+
+    @property
+    def title(self) -> str:
+        return self.text
+
+
+class Tweet(ScoredText):
+    """Tweet scoré (réel ou simulé)"""
+
+    __slots__ = ('time_ago', 'author_id', 'is_mock')
+
+    COLORS = {POSITIVE: 'emerald', NEGATIVE: 'red', NEUTRAL: 'sky'}
+
+    FIELDS = (('text', 'text'), ('time_ago', 'time_ago'), ('author_id', 'author_id'),
+              ('sentiment_score', 'sentiment_score'), ('classification', 'classification'),
+              ('is_mock', 'is_mock'))
+
+    def __init__(self, text: str, score: float, time_ago: str, author_id: str, is_mock: bool):
+        super().__init__(text, score)
+        self.time_ago = time_ago
+        self.author_id = author_id
+        self.is_mock = is_mock
+
+
+class TradingSignal(ScoredText):
+    """Signal de trading reçu d'un canal Telegram ; l'affichage dépend du type de signal"""
+
+    __slots__ = ('channel', 'signal_type', 'crypto', 'entry_price', 'time_ago')
+
+    TYPE_COLORS = {'ACHAT': 'emerald', 'VENTE': 'red', 'ALERTE': 'amber', 'INFO': 'cyan'}
+    TYPE_ICONS = {'ACHAT': 'fa-arrow-up', 'VENTE': 'fa-arrow-down', 'ALERTE': 'fa-exclamation-triangle',
+                  'INFO': 'fa-info-circle'}
+
+    FIELDS = (('text', 'text'), ('channel', 'channel'), ('signal_type', 'signal_type'), ('crypto', 'crypto'),
+              ('entry_price', 'entry_price'), ('time_ago', 'time_ago'), ('confidence_score', 'confidence_score'),
+              ('sentiment_score', 'sentiment_score'))
+
+    def __init__(self, text: str, score: float, channel: str, signal_type: str, crypto: str,
+                 entry_price: float, time_ago: str):
+        super().__init__(text, score)
+        self.channel = channel
+        self.signal_type = signal_type
+        self.crypto = crypto
+        self.entry_price = entry_price
+        self.time_ago = time_ago
+
+    @property
+    def confidence_score(self) -> int:
+        """Score de confiance (10-100) : intensité du sentiment, quel que soit son signe"""
+        return max(10, min(95, int((abs(self.score) + 0.2) * 80)))
+
+    @property
+    def color(self) -> str:
+        return self.TYPE_COLORS.get(self.signal_type, 'cyan')
+
+    @property
+    def icon(self) -> str:
+        return self.TYPE_ICONS.get(self.signal_type, 'fa-info-circle')
+
+
+class PriceSeries:
+    """
+    Série de prix en colonnes : horodatages (int64, ms) et prix (float64)
+
+    16 octets par point, contre plusieurs centaines pour une liste de
+    dictionnaires {'time', 'price', 'sentiment'}. Le sentiment et l'heure
+    affichée sont dérivés des colonnes au moment de la sérialisation
+    (`points`), jamais stockés.
+    """
+
+    __slots__ = ('_ts', '_prices', '_size')
+
+    def __init__(self, capacity: int = 64):
+        self._ts = np.empty(max(1, capacity), dtype=np.int64)
+        self._prices = np.empty(max(1, capacity), dtype=np.float64)
+        self._size = 0
+
+    @classmethod
+    def from_points(cls, points: Sequence[Sequence[float]]) -> 'PriceSeries':
+        """Construit la série depuis des points [ts_ms, prix] (format CoinGecko)"""
+        timestamps, prices = analytics.as_price_arrays(points)
+        series = cls(capacity=len(timestamps))
+        series._ts[:len(timestamps)] = timestamps
+        series._prices[:len(prices)] = prices
+        series._size = len(timestamps)
+        return series
+
+    def _grow(self, size: int) -> None:
+        if size > len(self._ts):
+            capacity = max(size, 2 * len(self._ts))
+            ts = np.empty(capacity, dtype=np.int64)
+            prices = np.empty(capacity, dtype=np.float64)
+            ts[:self._size] = self._ts[:self._size]
+            prices[:self._size] = self._prices[:self._size]
+            self._ts, self._prices = ts, prices
+
+    def append(self, ts_ms: int, price: float) -> None:
+        """Ajoute un point (capacité doublée au besoin : coût amorti constant)"""
+        self._grow(self._size + 1)
+        self._ts[self._size] = ts_ms
+        self._prices[self._size] = price
+        self._size += 1
+
+    def extend(self, points: Iterable[Sequence[float]]) -> None:
+        """Ajoute des points [ts_ms, prix]"""
+        timestamps, prices = analytics.as_price_arrays(list(points))
+        end = self._size + len(timestamps)
+        self._grow(end)
+        self._ts[self._size:end] = timestamps
+        self._prices[self._size:end] = prices
+        self._size = end
+
+    def __len__(self) -> int:
+        return self._size
+
+    def tail(self, count: int) -> 'PriceSeries':
+        """Nouvelle série limitée aux `count` points les plus récents"""
+        start = max(0, self._size - max(0, count))
+        series = PriceSeries(capacity=self._size - start)
+        series._ts[:self._size - start] = self._ts[start:self._size]
+        series._prices[:self._size - start] = self._prices[start:self._size]
+        series._size = self._size - start
+        return series
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._ts[:self._size]
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._prices[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les colonnes (capacité comprise)"""
+        return self._ts.nbytes + self._prices.nbytes
+
+    def points(self, time_format: str = '%H:%M') -> List[Dict]:
+        """
+        Points du graphique (heure, prix, sentiment), dérivés des colonnes
+
+        Args:
+            time_format (str): Format de l'heure affichée
+
+        Returns:
+            List[Dict]: Points {'time', 'price', 'sentiment'}
+        """
+        return analytics.points_from_arrays(self.timestamps, self.prices, time_format)
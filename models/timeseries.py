@@ -0,0 +1,274 @@
+import threading
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from models.records import PriceSeries
+from utils.lazy import Lazy
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+
+def upstream_resolution_ms(span_ms: int) -> int:
+    """
+    Pas des points renvoyés par CoinGecko (market_chart/range) pour une plage
+
+    La granularité dépend de la durée demandée : 5 minutes jusqu'à un jour,
+    une heure jusqu'à 90 jours, un jour au-delà.
+
+    Args:
+        span_ms (int): Durée de la plage, en ms
+
+    Returns:
+        int: Écart entre deux points, en ms
+    """
+    if span_ms <= DAY_MS:
+        return 5 * MINUTE_MS
+    if span_ms <= 90 * DAY_MS:
+        return HOUR_MS
+    return DAY_MS
+
+
+def _build_schema():
+    """SQLAlchemy et la table des points, importés au premier accès au stockage"""
+    import sqlalchemy as sa
+
+    metadata = sa.MetaData()
+    # Un point par (crypto, devise, horodatage en millisecondes) ; la clé primaire
+    # sert d'index pour les requêtes par plage
+    price_points = sa.Table(
+        'price_points', metadata,
+        sa.Column('coin_id', sa.String(64), nullable=False),
+        sa.Column('vs_currency', sa.String(8), nullable=False),
+        sa.Column('ts', sa.BigInteger, nullable=False),
+        sa.Column('price', sa.Float, nullable=False),
+        sa.PrimaryKeyConstraint('coin_id', 'vs_currency', 'ts', name='pk_price_points')
+    )
+    sa.Index('ix_price_points_ts', price_points.c.ts)
+    # Plages déjà récupérées en amont, avec le pas des points obtenus : une plage
+    # n'est couverte que par des récupérations au moins aussi fines que nécessaire
+    fetched_ranges = sa.Table(
+        'fetched_ranges', metadata,
+        sa.Column('coin_id', sa.String(64), nullable=False),
+        sa.Column('vs_currency', sa.String(8), nullable=False),
+        sa.Column('start_ts', sa.BigInteger, nullable=False),
+        sa.Column('end_ts', sa.BigInteger, nullable=False),
+        sa.Column('resolution_ms', sa.BigInteger, nullable=False)
+    )
+    sa.Index('ix_fetched_ranges_coin', fetched_ranges.c.coin_id, fetched_ranges.c.vs_currency)
+    return sa, price_points, fetched_ranges
+
+
+_schema = Lazy(_build_schema, 'sqlalchemy')
+
+
+class PriceHistoryStore:
+    """
+    Stockage local des séries de prix (SQLite par défaut, via SQLAlchemy)
+
+    Les points sont ajoutés de façon incrémentale (les doublons sont ignorés)
+    et relus par plage depuis une table indexée, avec agrégation par
+    intervalles pour les longues périodes. La connexion est ouverte au
+    premier usage : importer l'application ne touche pas au disque et
+    n'importe pas SQLAlchemy.
+    """
+
+    def __init__(self, url: str = 'sqlite:///crypto_saas.db'):
+        self.url = url
+        self._engine: Optional['Engine'] = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> 'Engine':
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    sa, price_points, _ = _schema.get()
+                    connect_args = {'check_same_thread': False} if self.url.startswith('sqlite') else {}
+                    engine = sa.create_engine(self.url, connect_args=connect_args)
+                    price_points.metadata.create_all(engine)
+                    self._engine = engine
+        return self._engine
+
+    def append(self, coin_id: str, points: Sequence[Sequence[float]], vs_currency: str = 'usd') -> int:
+        """
+        Ajoute des points [timestamp_ms, prix] (les horodatages déjà connus sont ignorés)
+
+        Args:
+            coin_id (str): ID de la crypto
+            points (Sequence): Points au format CoinGecko [[ts_ms, prix], ...]
+            vs_currency (str): Devise de cotation
+
+        Returns:
+            int: Nombre de points réellement ajoutés
+        """
+        rows = {}
+        for ts, price in points:
+            if price is not None:
+                rows[int(ts)] = float(price)
+        if not rows:
+            return 0
+
+        sa, price_points, _ = _schema.get()
+        with self.engine.begin() as conn:
+            existing = set(conn.execute(
+                sa.select(price_points.c.ts).where(
+                    price_points.c.coin_id == coin_id,
+                    price_points.c.vs_currency == vs_currency,
+                    price_points.c.ts.between(min(rows), max(rows))
+                )
+            ).scalars())
+            new_rows = [{'coin_id': coin_id, 'vs_currency': vs_currency, 'ts': ts, 'price': price}
+                        for ts, price in sorted(rows.items()) if ts not in existing]
+            if new_rows:
+                conn.execute(price_points.insert(), new_rows)
+        return len(new_rows)
+
+    def bounds(self, coin_id: str, vs_currency: str = 'usd') -> Tuple[Optional[int], Optional[int]]:
+        """
+        Plage couverte par les points stockés
+
+        Returns:
+            Tuple[Optional[int], Optional[int]]: (premier, dernier) horodatage en ms
+        """
+        sa, price_points, _ = _schema.get()
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                sa.select(sa.func.min(price_points.c.ts), sa.func.max(price_points.c.ts)).where(
+                    price_points.c.coin_id == coin_id,
+                    price_points.c.vs_currency == vs_currency
+                )
+            ).one()
+        return row[0], row[1]
+
+    def _query_stmt(self, coin_id: str, start_ms: int, end_ms: int, bucket_ms: Optional[int],
+                    vs_currency: str):
+        """Requête des points d'une plage (agrégés par intervalles si `bucket_ms`)"""
+        sa, price_points, _ = _schema.get()
+        conditions = (
+            price_points.c.coin_id == coin_id,
+            price_points.c.vs_currency == vs_currency,
+            price_points.c.ts.between(start_ms, end_ms)
+        )
+        if bucket_ms:
+            bucket = price_points.c.ts // bucket_ms
+            return (sa.select(sa.func.min(price_points.c.ts), sa.func.avg(price_points.c.price))
+                    .where(*conditions)
+                    .group_by(bucket)
+                    .order_by(sa.func.min(price_points.c.ts)))
+        return (sa.select(price_points.c.ts, price_points.c.price)
+                .where(*conditions)
+                .order_by(price_points.c.ts))
+
+    def query(self, coin_id: str, start_ms: int, end_ms: int, bucket_ms: Optional[int] = None,
+              vs_currency: str = 'usd') -> List[Tuple[int, float]]:
+        """
+        Points d'une plage, éventuellement agrégés par intervalles
+
+        Args:
+            coin_id (str): ID de la crypto
+            start_ms (int): Début de la plage (inclus), en ms
+            end_ms (int): Fin de la plage (incluse), en ms
+            bucket_ms (int): Taille des intervalles d'agrégation (prix moyen) ;
+                aucun agrégat si None
+            vs_currency (str): Devise de cotation
+
+        Returns:
+            List[Tuple[int, float]]: Points (ts_ms, prix) triés par date
+        """
+        stmt = self._query_stmt(coin_id, start_ms, end_ms, bucket_ms, vs_currency)
+        with self.engine.connect() as conn:
+            return [(int(ts), float(price)) for ts, price in conn.execute(stmt)]
+
+    def query_series(self, coin_id: str, start_ms: int, end_ms: int, bucket_ms: Optional[int] = None,
+                     vs_currency: str = 'usd') -> PriceSeries:
+        """
+        Comme `query`, mais en colonnes : les lignes sont copiées directement
+        dans une `PriceSeries`, sans tuple Python conservé par point
+
+        Returns:
+            PriceSeries: Points triés par date
+        """
+        stmt = self._query_stmt(coin_id, start_ms, end_ms, bucket_ms, vs_currency)
+        series = PriceSeries()
+        with self.engine.connect() as conn:
+            result = conn.execute(stmt)
+            while True:
+                rows = result.fetchmany(10000)
+                if not rows:
+                    return series
+                series.extend(rows)
+
+    def mark_fetched(self, coin_id: str, start_ms: int, end_ms: int, resolution_ms: int,
+                     vs_currency: str = 'usd') -> None:
+        """
+        Enregistre une plage récupérée en amont et le pas de ses points
+
+        Les plages de même pas qui chevauchent ou touchent la nouvelle sont
+        fusionnées avec elle.
+
+        Args:
+            start_ms (int): Début de la plage demandée, en ms
+            end_ms (int): Fin de la plage demandée, en ms
+            resolution_ms (int): Écart entre deux points obtenus, en ms
+        """
+        sa, _, fetched_ranges = _schema.get()
+        same = (
+            fetched_ranges.c.coin_id == coin_id,
+            fetched_ranges.c.vs_currency == vs_currency,
+            fetched_ranges.c.resolution_ms == resolution_ms,
+            fetched_ranges.c.end_ts >= start_ms,
+            fetched_ranges.c.start_ts <= end_ms
+        )
+        with self.engine.begin() as conn:
+            for row_start, row_end in conn.execute(
+                    sa.select(fetched_ranges.c.start_ts, fetched_ranges.c.end_ts).where(*same)):
+                start_ms, end_ms = min(start_ms, row_start), max(end_ms, row_end)
+            conn.execute(fetched_ranges.delete().where(*same))
+            conn.execute(fetched_ranges.insert(), [{'coin_id': coin_id, 'vs_currency': vs_currency,
+                                                    'start_ts': start_ms, 'end_ts': end_ms,
+                                                    'resolution_ms': resolution_ms}])
+
+    def missing_ranges(self, coin_id: str, start_ms: int, end_ms: int, tolerance_ms: int,
+                       vs_currency: str = 'usd', resolution_ms: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Plages à récupérer en amont pour couvrir [start_ms, end_ms]
+
+        Seules comptent les plages enregistrées par `mark_fetched` avec un pas
+        au plus égal à `resolution_ms` : des points journaliers stockés pour un
+        backtest d'un an ne couvrent pas un graphique sur 24 heures.
+
+        Args:
+            tolerance_ms (int): Trou accepté (extrémités et entre plages) avant de refaire un appel
+            resolution_ms (int): Pas maximal des points attendus (par défaut celui
+                que CoinGecko renvoie pour la durée demandée)
+
+        Returns:
+            List[Tuple[int, int]]: Plages (début, fin) manquantes, en ms
+        """
+        if resolution_ms is None:
+            resolution_ms = upstream_resolution_ms(end_ms - start_ms)
+        sa, _, fetched_ranges = _schema.get()
+        with self.engine.connect() as conn:
+            covered = conn.execute(
+                sa.select(fetched_ranges.c.start_ts, fetched_ranges.c.end_ts).where(
+                    fetched_ranges.c.coin_id == coin_id,
+                    fetched_ranges.c.vs_currency == vs_currency,
+                    fetched_ranges.c.resolution_ms <= resolution_ms,
+                    fetched_ranges.c.end_ts >= start_ms,
+                    fetched_ranges.c.start_ts <= end_ms
+                ).order_by(fetched_ranges.c.start_ts)
+            ).all()
+
+        ranges = []
+        cursor = start_ms
+        for range_start, range_end in covered:
+            if range_start > cursor + tolerance_ms:
+                ranges.append((cursor, range_start))
+            cursor = max(cursor, range_end)
+        if end_ms > cursor + tolerance_ms:
+            ranges.append((cursor, end_ms))
+        return ranges
@@ -0,0 +1,135 @@
+import unittest
+import sys
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import analytics
+from benchmarks.bench_history import loop_history_points, make_prices
+
+class TestHistoryPoints(unittest.TestCase):
+
+    def test_matches_reference_loop(self):
+        """Test résultat identique à la boucle d'origine"""
+        prices = make_prices(500)
+        prices[10][1] = prices[9][1] * 1.02  # forte hausse
+        prices[20][1] = prices[19][1] * 0.97  # forte baisse
+
+        for time_format in ('%H:%M', '%d/%m %H:%M'):
+            expected = loop_history_points(prices, time_format)
+            result = analytics.history_points(prices, time_format)
+
+            self.assertEqual(len(result), len(expected))
+            for got, want in zip(result, expected):
+                self.assertEqual(got['time'], want['time'])
+                self.assertAlmostEqual(got['price'], want['price'], places=2)
+                self.assertAlmostEqual(got['sentiment'], want['sentiment'], places=3)
+
+    def test_empty(self):
+        """Test historique vide"""
+        self.assertEqual(analytics.history_points([]), [])
+
+    def test_format_times_other_format(self):
+        """Test format non vectorisé : repli point par point"""
+        ts = np.array([1_700_000_000_000.0])
+        expected = datetime.fromtimestamp(1_700_000_000).strftime('%Y-%m-%d')
+
+        self.assertEqual(analytics.format_times(ts, '%Y-%m-%d'), [expected])
+
+@unittest.skipUnless(hasattr(time, 'tzset'), "time.tzset indisponible")
+class TestFormatTimesDST(unittest.TestCase):
+    """Formatage vectorisé dans des fuseaux à heure d'été"""
+
+    def setUp(self):
+        self.saved_tz = os.environ.get('TZ')
+
+    def tearDown(self):
+        if self.saved_tz is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = self.saved_tz
+        time.tzset()
+
+    def assert_matches_datetime(self, tz, start_s, end_s, step_s):
+        os.environ['TZ'] = tz
+        time.tzset()
+        seconds = list(range(start_s, end_s, step_s))
+        ts = np.array(seconds, dtype=np.float64) * 1000
+        for time_format in ('%H:%M', '%d/%m %H:%M'):
+            result = analytics.format_times(ts, time_format)
+            self.assertEqual(len(result), len(seconds))
+            mismatches = [(s, got, datetime.fromtimestamp(s).strftime(time_format))
+                          for s, got in zip(seconds, result)
+                          if got != datetime.fromtimestamp(s).strftime(time_format)]
+            self.assertEqual(mismatches[:3], [])
+
+    def test_range_across_two_dst_changes(self):
+        """Test janvier à décembre : même décalage aux extrémités, points d'été à l'heure d'été"""
+        start = int(datetime(2024, 1, 1).timestamp())
+        end = int(datetime(2024, 12, 31).timestamp())
+        self.assert_matches_datetime('Europe/Paris', start, end, 3600)
+        self.assert_matches_datetime('Europe/Paris', start, end, 86400 + 17)
+        os.environ['TZ'] = 'Europe/Paris'
+        time.tzset()
+        july = int(datetime(2024, 7, 15, 12, 0).timestamp())
+        self.assertEqual(analytics.format_times(np.array([start, july, end]) * 1000.0, '%d/%m %H:%M')[1],
+                         '15/07 12:00')
+
+    def test_dst_change_inside_an_hour(self):
+        """Test changement d'heure au milieu d'une heure UTC (Lord Howe, décalage de 30 min)"""
+        # Passage à l'heure d'hiver le 6 avril 2024 à 15:00 UTC, à l'heure d'été le 5 octobre à 15:30 UTC
+        for change in (1712415600, 1728142200):
+            self.assert_matches_datetime('Australia/Lord_Howe', change - 6 * 3600, change + 6 * 3600, 60)
+
+class TestIndicators(unittest.TestCase):
+
+    def test_sma(self):
+        """Test moyenne mobile simple"""
+        result = analytics.sma(np.array([1.0, 2.0, 3.0, 4.0]), 2)
+
+        self.assertTrue(np.isnan(result[0]))
+        self.assertEqual(result[1:].tolist(), [1.5, 2.5, 3.5])
+
+    def test_ema_matches_recursive_form(self):
+        """Test EMA identique à la récurrence ajustée"""
+        values = np.array([p[1] for p in make_prices(200)])
+        alpha = 2.0 / 21
+        num = den = 0.0
+        expected = []
+        for v in values:
+            num = v + (1 - alpha) * num
+            den = 1 + (1 - alpha) * den
+            expected.append(num / den)
+
+        np.testing.assert_allclose(analytics.ema(values, span=20), expected, rtol=1e-9)
+
+    def test_rsi_bounds(self):
+        """Test RSI : 100 en hausse continue, 0 en baisse continue"""
+        rising = np.arange(1.0, 31.0)
+
+        self.assertAlmostEqual(analytics.rsi(rising, 14)[-1], 100.0)
+        self.assertAlmostEqual(analytics.rsi(rising[::-1], 14)[-1], 0.0)
+        self.assertTrue(np.isnan(analytics.rsi(rising, 14)[13]))
+
+    def test_volatility_constant_series(self):
+        """Test volatilité nulle pour une variation constante"""
+        prices = 100 * 1.01 ** np.arange(50)
+
+        self.assertAlmostEqual(analytics.volatility(prices, 10)[-1], 0.0, places=6)
+
+    def test_indicators_json_friendly(self):
+        """Test None à la place des NaN"""
+        result = analytics.indicators([p[1] for p in make_prices(30)])
+
+        self.assertEqual(set(result), {'sma', 'ema', 'volatility', 'rsi'})
+        self.assertIsNone(result['sma'][0])
+        self.assertIsInstance(result['sma'][-1], float)
+        self.assertEqual(len(result['rsi']), 30)
+
+if __name__ == '__main__':
+    unittest.main()
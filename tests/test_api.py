@@ -6,11 +6,11 @@ from unittest.mock import patch, Mock
 # Ajouter le répertoire parent au path pour importer les modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.crypto_api import get_crypto_data, get_multiple_cryptos
+from utils.crypto_api import get_crypto_data, get_multiple_cryptos, chunk_ids, fetch_prices_batch
 
 class TestCryptoAPI(unittest.TestCase):
     
-    @patch('utils.crypto_api.requests.get')
+    @patch('utils.crypto_api.http_client.get')
     def test_get_crypto_data_success(self, mock_get):
         """Test récupération réussie des données crypto"""
         # Mock de la réponse API
@@ -28,9 +28,9 @@ class TestCryptoAPI(unittest.TestCase):
         
         self.assertEqual(result['name'], 'Bitcoin')
         self.assertEqual(result['price'], 45000.50)
-        self.assertEqual(result['change'], 2.34)
+        self.assertEqual(result['change_24h'], 2.34)
     
-    @patch('utils.crypto_api.requests.get')
+    @patch('utils.crypto_api.http_client.get')
     def test_get_crypto_data_api_error(self, mock_get):
         """Test gestion d'erreur API"""
         mock_get.side_effect = Exception("API Error")
@@ -39,9 +39,9 @@ class TestCryptoAPI(unittest.TestCase):
         
         self.assertEqual(result['name'], 'Bitcoin (Erreur)')
         self.assertEqual(result['price'], 0)
-        self.assertEqual(result['change'], 0)
+        self.assertEqual(result['change_24h'], 0)
     
-    @patch('utils.crypto_api.requests.get')
+    @patch('utils.crypto_api.http_client.get')
     def test_get_crypto_data_crypto_not_found(self, mock_get):
         """Test crypto non trouvée"""
         mock_response = Mock()
@@ -53,9 +53,9 @@ class TestCryptoAPI(unittest.TestCase):
         
         self.assertEqual(result['name'], 'Unknown_crypto (Erreur)')
         self.assertEqual(result['price'], 0)
-        self.assertEqual(result['change'], 0)
+        self.assertEqual(result['change_24h'], 0)
     
-    @patch('utils.crypto_api.requests.get')
+    @patch('utils.crypto_api.http_client.get')
     def test_get_multiple_cryptos_success(self, mock_get):
         """Test récupération de plusieurs cryptos"""
         mock_response = Mock()
@@ -73,7 +73,7 @@ class TestCryptoAPI(unittest.TestCase):
         self.assertEqual(result['bitcoin']['usd'], 45000)
         self.assertEqual(result['ethereum']['usd'], 3000)
     
-    @patch('utils.crypto_api.requests.get')
+    @patch('utils.crypto_api.http_client.get')
     def test_get_multiple_cryptos_error(self, mock_get):
         """Test erreur lors de la récupération de plusieurs cryptos"""
         mock_get.side_effect = Exception("API Error")
@@ -81,6 +81,44 @@ class TestCryptoAPI(unittest.TestCase):
         result = get_multiple_cryptos(['bitcoin', 'ethereum'])
         
         self.assertEqual(result, {})
+    
+    def test_chunk_ids(self):
+        """Test découpage en lots sans doublons"""
+        chunks = chunk_ids(['bitcoin', 'ethereum', 'bitcoin', 'solana', 'cardano'], chunk_size=2)
+        
+        self.assertEqual(chunks, [['bitcoin', 'ethereum'], ['solana', 'cardano']])
+    
+    @patch('utils.crypto_api.http_client.get')
+    def test_fetch_prices_batch_fewest_calls(self, mock_get):
+        """Test un seul appel par lot d'IDs"""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            'bitcoin': {'usd': 45000, 'usd_24h_change': 2.34},
+            'ethereum': {'usd': 3000, 'usd_24h_change': -1.23},
+            'solana': {'usd': 100, 'usd_24h_change': 0.5}
+        }
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+        
+        results, errors = fetch_prices_batch(['bitcoin', 'ethereum', 'solana'], chunk_size=2)
+        
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(set(results), {'bitcoin', 'ethereum', 'solana'})
+        self.assertEqual(errors, {})
+    
+    @patch('utils.crypto_api.http_client.get')
+    def test_fetch_prices_batch_partial_failure(self, mock_get):
+        """Test erreurs signalées par crypto sans invalider le reste"""
+        ok_response = Mock()
+        ok_response.json.return_value = {'bitcoin': {'usd': 45000, 'usd_24h_change': 2.34}}
+        ok_response.raise_for_status.return_value = None
+        mock_get.side_effect = [ok_response, Exception("API Error")]
+        
+        results, errors = fetch_prices_batch(['bitcoin', 'unknown_crypto', 'solana'], chunk_size=2)
+        
+        self.assertEqual(results, {'bitcoin': {'usd': 45000, 'usd_24h_change': 2.34}})
+        self.assertIn('non trouvée', errors['unknown_crypto'])
+        self.assertEqual(errors['solana'], 'API Error')
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import backtest
+from utils.backtest import EventLog
+
+MINUTE = 60_000
+
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        # Un prix par minute : 100, 110, 99, 99, 120
+        self.timestamps = np.arange(5, dtype=np.int64) * MINUTE
+        self.prices = np.array([100.0, 110.0, 99.0, 99.0, 120.0])
+
+    def test_event_log_from_signals(self):
+        """Test journal de signaux : ACHAT/VENTE seulement, trié par date, confiance en fraction"""
+        events = EventLog.from_signals([
+            {'ts': 120, 'signal_type': 'VENTE', 'confidence_score': 50},
+            {'ts': 60, 'signal_type': 'ACHAT', 'confidence_score': 80},
+            {'ts': 30, 'signal_type': 'ALERTE', 'confidence_score': 90},
+        ])
+        self.assertEqual(events.timestamps.tolist(), [60_000, 120_000])
+        self.assertEqual(events.directions.tolist(), [1, -1])
+        self.assertEqual(events.strengths.tolist(), [0.8, 0.5])
+        self.assertEqual(len(EventLog.from_signals([])), 0)
+
+    def test_event_log_from_sentiment(self):
+        """Test journal de sentiment : sens = signe, intensité = valeur absolue, zéros ignorés"""
+        events = EventLog.from_sentiment(self.timestamps, np.array([0.0, 0.3, -0.6, 0.0, 0.1]))
+        self.assertEqual(events.timestamps.tolist(), [MINUTE, 2 * MINUTE, 4 * MINUTE])
+        self.assertEqual(events.directions.tolist(), [1, -1, 1])
+        self.assertEqual(events.strengths.tolist(), [0.3, 0.6, 0.1])
+
+    def test_trade_returns(self):
+        """Test entrée au premier prix connu, sortie après l'horizon, NaN hors de la série"""
+        events = EventLog([0, 30_000, 3 * MINUTE, -MINUTE], [1, -1, 1, 1], [1, 1, 1, 1])
+        returns = backtest.trade_returns(self.timestamps, self.prices, events, 2 * MINUTE)
+        # Trié : -1 min (avant la série), 0 (100 -> 99), 30 s (entrée 110 -> sortie 99, vente), 3 min (hors série)
+        self.assertTrue(np.isnan(returns[0]))
+        self.assertAlmostEqual(returns[1], -0.01)
+        self.assertAlmostEqual(returns[2], 0.1)
+        self.assertTrue(np.isnan(returns[3]))
+
+    def test_summarize(self):
+        """Test taux de réussite, rendement cumulé et drawdown maximal"""
+        stats = backtest.summarize(np.array([0.1, -0.5, 0.2]))
+        self.assertEqual(stats['trades'], 3)
+        self.assertAlmostEqual(stats['hit_rate'], 0.6667)
+        self.assertAlmostEqual(stats['total_return_pct'], (1.1 * 0.5 * 1.2 - 1) * 100, places=3)
+        self.assertAlmostEqual(stats['max_drawdown_pct'], 50.0, places=3)
+        self.assertEqual(backtest.summarize(np.array([]))['trades'], 0)
+
+    def test_backtest_threshold_and_fees(self):
+        """Test seuil d'intensité et frais appliqués à chaque trade"""
+        events = EventLog([0, MINUTE], [1, -1], [0.9, 0.2])
+        result = backtest.backtest(self.timestamps, self.prices, events, 1, min_strength=0.5, fee_pct=1)
+        self.assertEqual(result['trades'], 1)
+        self.assertAlmostEqual(result['mean_return_pct'], 9.0)
+        self.assertEqual(result['horizon_minutes'], 1)
+
+    def test_sweep_pool_matches_serial(self):
+        """Test sweep : une ligne par combinaison, mêmes résultats avec un pool de processus"""
+        rng = np.random.default_rng(1)
+        timestamps = np.arange(2000, dtype=np.int64) * MINUTE
+        prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, 2000))
+        events = EventLog.from_sentiment(timestamps, rng.uniform(-1, 1, 2000))
+        serial = backtest.sweep(timestamps, prices, events, [5, 60], [0.0, 0.5, 0.9])
+        pooled = backtest.sweep(timestamps, prices, events, [5, 60], [0.0, 0.5, 0.9], processes=2)
+        self.assertEqual(len(serial), 6)
+        self.assertEqual(serial, pooled)
+        self.assertEqual([(r['horizon_minutes'], r['min_strength']) for r in serial[:3]],
+                         [(5, 0.0), (5, 0.5), (5, 0.9)])
+        top = backtest.best(serial)
+        self.assertEqual(top['total_return_pct'], max(r['total_return_pct'] for r in serial))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import json
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.broadcast import Broadcaster, format_sse
+
+class TestFormatSSE(unittest.TestCase):
+
+    def test_format(self):
+        """Test format d'un message SSE"""
+        message = format_sse({'usd': 45000}, event='price', event_id=3)
+
+        self.assertEqual(message, 'id: 3\nevent: price\ndata: {"usd":45000}\n\n')
+
+class TestBroadcaster(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+        self.price = 45000
+
+        def producer():
+            self.calls += 1
+            return {'bitcoin': {'usd': self.price}}
+
+        self.broadcaster = Broadcaster({'price': producer}, interval=60, queue_size=2)
+
+    def tearDown(self):
+        self.broadcaster.stop()
+
+    def test_one_producer_call_for_all_subscribers(self):
+        """Test un seul appel producteur pour tous les abonnés"""
+        queues = [self.broadcaster.subscribe() for _ in range(100)]
+        self.broadcaster.produce_once()
+
+        self.assertLessEqual(self.calls, 2)
+        for q in queues:
+            message = q.get_nowait()
+            self.assertIn('event: price', message)
+
+    def test_only_changes_published(self):
+        """Test seules les valeurs modifiées sont publiées"""
+        self.assertEqual(self.broadcaster.produce_once(), 1)
+        self.assertEqual(self.broadcaster.produce_once(), 0)
+        self.price = 46000
+        self.assertEqual(self.broadcaster.produce_once(), 1)
+
+    def test_new_subscriber_gets_last_state(self):
+        """Test un nouvel abonné reçoit immédiatement le dernier état"""
+        self.broadcaster.produce_once()
+        q = self.broadcaster.subscribe()
+
+        data = q.get_nowait().split('data: ')[1]
+        self.assertEqual(json.loads(data), {'bitcoin': {'usd': 45000}})
+
+    def test_slow_subscriber_drops_oldest(self):
+        """Test un abonné lent perd ses plus vieux messages sans bloquer"""
+        q = self.broadcaster.subscribe()
+        for price in (1, 2, 3, 4):
+            self.broadcaster.publish('price', {'usd': price})
+
+        self.assertEqual(q.qsize(), 2)
+        self.assertGreater(self.broadcaster.stats()['dropped'], 0)
+        self.assertIn('"usd":4', list(q.queue)[-1])
+
+    def test_stream_unsubscribes_on_close(self):
+        """Test désabonnement à la fermeture du flux"""
+        stream = self.broadcaster.stream(keepalive=0.01)
+        self.assertTrue(next(stream).startswith('retry:'))
+        self.assertEqual(self.broadcaster.subscriber_count(), 1)
+
+        stream.close()
+
+        self.assertEqual(self.broadcaster.subscriber_count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
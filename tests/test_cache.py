@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache import TTLCache, make_cache_key
+
+class FakeClock:
+    """Horloge contrôlable pour tester les expirations"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(max_size=3, default_ttl=10, clock=self.clock)
+
+    def test_make_cache_key_per_coin(self):
+        """Test clés distinctes par crypto et indépendantes de l'ordre des params"""
+        key_btc = make_cache_key('coin', 'bitcoin', {'a': '1', 'b': '2'})
+        key_btc_2 = make_cache_key('coin', 'bitcoin', {'b': '2', 'a': '1'})
+        key_eth = make_cache_key('coin', 'ethereum', {'a': '1', 'b': '2'})
+
+        self.assertEqual(key_btc, key_btc_2)
+        self.assertNotEqual(key_btc, key_eth)
+
+    def test_get_hit_and_miss(self):
+        """Test hits et misses comptabilisés"""
+        self.cache.set('bitcoin', {'price': 1})
+
+        self.assertEqual(self.cache.get('bitcoin'), {'price': 1})
+        self.assertIsNone(self.cache.get('ethereum'))
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_per_entry_ttl(self):
+        """Test TTL propre à chaque entrée"""
+        self.cache.set('price', 1, ttl=10)
+        self.cache.set('history', 2, ttl=300)
+
+        self.clock.now += 11
+
+        self.assertIsNone(self.cache.get('price'))
+        self.assertEqual(self.cache.get('history'), 2)
+        self.assertEqual(self.cache.stats()['expirations'], 1)
+
+    def test_lru_eviction(self):
+        """Test éviction de l'entrée la moins récemment utilisée"""
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.set('c', 3)
+        self.cache.get('a')
+        self.cache.set('d', 4)
+
+        self.assertNotIn('b', self.cache)
+        self.assertIn('a', self.cache)
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_invalid_max_size(self):
+        """Test taille maximale invalide"""
+        with self.assertRaises(ValueError):
+            TTLCache(max_size=0)
+
+if __name__ == '__main__':
+    unittest.main()
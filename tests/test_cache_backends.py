@@ -0,0 +1,167 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache import TTLCache, make_cache_key
+from utils.cache_backends import FileSystemCache, RedisCache, build_cache, dumps, key_to_str, loads
+from utils.singleflight import SingleFlight, fetch_with_cache
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+class FakeClock:
+    """Horloge contrôlable pour tester les expirations"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestSerialization(unittest.TestCase):
+
+    def test_round_trip(self):
+        """Test sérialisation compacte avec échéances"""
+        value = {'price': 45000.5, 'name': 'Bitcoin', 'history': [1, 2, 3]}
+
+        self.assertEqual(loads(dumps(value, 10.0, 20.0)), (value, 10.0, 20.0))
+
+    def test_large_values_compressed(self):
+        """Test compression des grosses valeurs"""
+        value = [{'time': '12:00', 'price': 45000.0, 'sentiment': 0.1}] * 200
+        data = dumps(value, 0, 0)
+
+        self.assertLess(len(data), 1000)
+        self.assertEqual(loads(data)[0], value)
+
+    def test_key_to_str(self):
+        """Test représentation stable des clés"""
+        key = make_cache_key('coin', 'bitcoin', {'tickers': 'false', 'localization': 'false'})
+
+        self.assertEqual(key_to_str(key), 'coin:bitcoin:localization=false&tickers=false')
+
+class BackendContract:
+    """Comportement commun à tous les backends (TTL, stale, suppression)"""
+
+    def test_get_set(self):
+        """Test lecture d'une valeur fraîche"""
+        self.cache.set(('price', 'bitcoin'), {'usd': 45000})
+
+        self.assertEqual(self.cache.get(('price', 'bitcoin')), {'usd': 45000})
+        self.assertIsNone(self.cache.get(('price', 'ethereum')))
+
+    def test_ttl_and_stale_window(self):
+        """Test TTL puis fenêtre stale-while-revalidate"""
+        self.cache.set('bitcoin', 1, ttl=10, stale_ttl=30)
+
+        self.clock.now += 15
+        self.assertEqual(self.cache.get_entry('bitcoin'), (1, False))
+        self.assertIsNone(self.cache.get('bitcoin'))
+
+        self.clock.now += 30
+        self.assertIsNone(self.cache.get_entry('bitcoin'))
+
+    def test_delete_and_clear(self):
+        """Test suppression et vidage"""
+        self.cache.set('bitcoin', 1)
+        self.cache.set('ethereum', 2)
+
+        self.assertTrue(self.cache.delete('bitcoin'))
+        self.assertNotIn('bitcoin', self.cache)
+        self.assertIn('ethereum', self.cache)
+
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+class TestFileSystemCache(BackendContract, unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.cache = FileSystemCache(self.tmp.name, default_ttl=10, clock=self.clock)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_shared_between_instances(self):
+        """Test deux processus sur le même répertoire voient les mêmes entrées"""
+        other = FileSystemCache(self.tmp.name, clock=self.clock)
+        self.cache.set('bitcoin', {'usd': 1})
+
+        self.assertEqual(other.get('bitcoin'), {'usd': 1})
+
+    def test_fill_lock(self):
+        """Test verrou de remplissage exclusif, repris après expiration"""
+        self.assertTrue(self.cache.acquire('bitcoin', ttl=10))
+        self.assertFalse(self.cache.acquire('bitcoin', ttl=10))
+        self.assertTrue(self.cache.acquire('bitcoin', ttl=0))
+
+@unittest.skipIf(fakeredis is None, "fakeredis non installé")
+class TestRedisCache(BackendContract, unittest.TestCase):
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.clock = FakeClock()
+        self.cache = RedisCache(fakeredis.FakeRedis(server=self.server), default_ttl=10, clock=self.clock)
+
+    def test_redis_ttl_set(self):
+        """Test l'entrée expire aussi côté Redis (ttl + stale_ttl)"""
+        self.cache.set('bitcoin', 1, ttl=10, stale_ttl=20)
+
+        pttl = self.cache.client.pttl('crypto-saas:bitcoin')
+        self.assertGreater(pttl, 29000)
+        self.assertLessEqual(pttl, 30000)
+
+    def test_nodes_share_one_upstream_call(self):
+        """Test plusieurs serveurs : un seul appel amont pour une même clé"""
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'usd': 45000}
+
+        results = []
+
+        def node():
+            cache = RedisCache(fakeredis.FakeRedis(server=self.server))
+            results.append(fetch_with_cache(cache, SingleFlight(), 'bitcoin', fetch, ttl=10))
+
+        threads = [threading.Thread(target=node) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'usd': 45000}] * 4)
+
+    def test_backend_errors_are_misses(self):
+        """Test Redis indisponible : absence de valeur, sans exception"""
+        self.server.connected = False
+
+        self.cache.set('bitcoin', 1)
+
+        self.assertIsNone(self.cache.get('bitcoin'))
+        self.assertGreater(self.cache.stats()['errors'], 0)
+
+class TestBuildCache(unittest.TestCase):
+
+    def test_memory_default(self):
+        """Test backend mémoire par défaut"""
+        self.assertIsInstance(build_cache('memory'), TTLCache)
+
+    def test_unknown_backend(self):
+        """Test backend inconnu refusé"""
+        with self.assertRaises(ValueError):
+            build_cache('memcached')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+import sys
+import os
+import time
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_upstream import UpstreamStub
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from utils.http_client import HttpClient, HostConfig
+
+class FakeClock:
+    """Horloge contrôlable pour tester les durées d'ouverture"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=0.5, min_calls=4, window=10,
+                                      open_seconds=30, max_open_seconds=100, clock=self.clock)
+
+    def fail(self, count):
+        for _ in range(count):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record(False)
+
+    def test_opens_on_failure_rate(self):
+        """Test ouverture quand la part d'échecs atteint le seuil (après min_calls appels)"""
+        self.fail(3)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record(True)
+        self.breaker.record(True)
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+        stats = self.breaker.stats()
+        self.assertEqual((stats['opened'], stats['rejected'], stats['retry_in']), (1, 1, 30))
+
+    def test_occasional_failures_keep_closed(self):
+        """Test des échecs isolés n'ouvrent pas le disjoncteur"""
+        for _ in range(20):
+            self.breaker.record(True)
+            self.breaker.record(True)
+            self.breaker.record(False)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_probe_closes(self):
+        """Test après la durée d'ouverture : un seul essai, qui referme sur succès"""
+        self.fail(4)
+        self.clock.now += 30
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens_longer(self):
+        """Test essai en échec : réouverture pour une durée doublée, plafonnée"""
+        self.fail(4)
+        expected = [60, 100, 100]
+        for duration in expected:
+            self.clock.now += 1000
+            self.fail(1)
+            self.assertEqual(self.breaker.state, OPEN)
+            self.assertEqual(self.breaker.stats()['retry_in'], duration)
+        # Un succès remet la durée d'ouverture à sa valeur initiale
+        self.clock.now += 1000
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record(True)
+        self.fail(4)
+        self.assertEqual(self.breaker.stats()['retry_in'], 30)
+
+    def test_released_probe_can_be_retried(self):
+        """Test essai abandonné (budget épuisé) : un autre appel peut le reprendre"""
+        self.fail(4)
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+        self.assertTrue(self.breaker.allow())
+
+class TestHttpClientBreaker(unittest.TestCase):
+
+    def test_open_breaker_fails_fast(self):
+        """Test amont en panne et lent : une fois ouvert, plus aucun appel ni attente"""
+        with UpstreamStub(latency=0.2, error_rate=1.0, error_status=503) as stub:
+            host = stub.url.split('//', 1)[1]
+            client = HttpClient(max_retries=0, sleep=lambda delay: None,
+                                default_host=HostConfig(timeout=2, budget=2),
+                                breakers={host: CircuitBreaker(min_calls=3, open_seconds=60)})
+            try:
+                url = f'{stub.coingecko_url}/coins/bitcoin'
+                for _ in range(3):
+                    self.assertEqual(client.get(url).status_code, 503)
+                started = time.perf_counter()
+                with self.assertRaises(CircuitOpen):
+                    client.get(url)
+                self.assertLess(time.perf_counter() - started, 0.05)
+
+                stats = client.stats()
+                self.assertEqual(stats['hosts'][host]['requests'], 3)
+                self.assertEqual(stats['hosts'][host]['short_circuited'], 1)
+                self.assertEqual(stats['breakers'][host]['state'], OPEN)
+            finally:
+                client.close()
+
+    def test_unexpected_error_releases_probe(self):
+        """Test erreur inattendue pendant l'essai semi-ouvert : l'essai est rendu"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(min_calls=1, open_seconds=30, clock=clock)
+        client = HttpClient(max_retries=0, sleep=lambda delay: None, breakers={'upstream.test': breaker})
+        try:
+            self.assertTrue(breaker.allow())
+            breaker.record(False)
+            clock.now += 30
+
+            def broken_get(*args, **kwargs):
+                raise RuntimeError('erreur inattendue')
+
+            client.session_for('upstream.test').get = broken_get
+            with self.assertRaises(RuntimeError):
+                client.get('http://upstream.test/api')
+            self.assertEqual(breaker.state, HALF_OPEN)
+            self.assertTrue(breaker.allow())
+        finally:
+            client.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fanout import fan_out
+
+class TestFanOut(unittest.TestCase):
+
+    def test_sources_run_concurrently(self):
+        """Test latence ~ max des sources et non leur somme"""
+        def slow(value):
+            def fn():
+                time.sleep(0.2)
+                return value
+            return fn
+
+        started = time.monotonic()
+        results, status = fan_out({
+            'crypto': (slow('price'), lambda: 'fallback'),
+            'sentiment': (slow('sentiment'), lambda: 'fallback'),
+            'history': (slow('history'), lambda: 'fallback')
+        }, timeout=2)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, {'crypto': 'price', 'sentiment': 'sentiment', 'history': 'history'})
+        self.assertEqual(set(status.values()), {'ok'})
+        self.assertLess(elapsed, 0.5)
+
+    def test_timeout_uses_fallback(self):
+        """Test fallback pour une source qui dépasse l'échéance"""
+        release = threading.Event()
+
+        results, status = fan_out({
+            'fast': (lambda: 'ok', lambda: 'fallback'),
+            'slow': (lambda: release.wait(2), lambda: 'fallback')
+        }, timeout=0.1)
+        release.set()
+
+        self.assertEqual(results, {'fast': 'ok', 'slow': 'fallback'})
+        self.assertEqual(status['slow'], 'timeout')
+
+    def test_error_uses_fallback(self):
+        """Test fallback pour une source en erreur"""
+        def failing():
+            raise ValueError("API Error")
+
+        results, status = fan_out({'crypto': (failing, lambda: {'error': True})}, timeout=1)
+
+        self.assertEqual(results['crypto'], {'error': True})
+        self.assertEqual(status['crypto'], 'error')
+
+if __name__ == '__main__':
+    unittest.main()
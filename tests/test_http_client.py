@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from utils.http_client import HttpClient, HostConfig
+from utils.rate_budget import BudgetExhausted, RateBudget
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serveur local : répond `failures` fois en erreur puis 200 (keep-alive)"""
+    protocol_version = 'HTTP/1.1'
+    failures = []
+
+    def do_GET(self):
+        status = self.failures.pop(0) if self.failures else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestHttpClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.host = f'127.0.0.1:{cls.server.server_address[1]}'
+        cls.url = f'http://{cls.host}/api'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubHandler.failures = []
+        self.sleeps = []
+        self.client = HttpClient(max_retries=2, sleep=self.sleeps.append,
+                                 default_host=HostConfig(timeout=2, budget=10))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_connection_reused(self):
+        """Test keep-alive : une seule connexion pour plusieurs requêtes"""
+        for _ in range(5):
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+
+        stats = self.client.stats()['hosts'][self.host]
+        self.assertEqual(stats['requests'], 5)
+        self.assertEqual(stats['connections_created'], 1)
+        self.assertEqual(stats['connections_reused'], 4)
+
+    def test_retry_on_5xx_then_success(self):
+        """Test nouvelle tentative après 503 puis succès"""
+        StubHandler.failures = [503, 429]
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        stats = self.client.stats()['hosts'][self.host]
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['failures'], 0)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertTrue(all(0 <= delay <= 8 for delay in self.sleeps))
+
+    def test_retries_exhausted_returns_last_response(self):
+        """Test réponse en erreur retournée après épuisement des retries"""
+        StubHandler.failures = [500, 500, 500]
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 500)
+        stats = self.client.stats()['hosts'][self.host]
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['failures'], 1)
+
+    def test_no_retry_on_4xx(self):
+        """Test pas de nouvelle tentative sur une erreur client"""
+        StubHandler.failures = [404]
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.stats()['hosts'][self.host]['retries'], 0)
+
+    def test_rate_budget_throttles(self):
+        """Test budget d'appels épuisé : BudgetExhausted sans appel réseau"""
+        client = HttpClient(sleep=self.sleeps.append, default_host=HostConfig(timeout=2, budget=10),
+                            budgets={self.host: RateBudget(rate_per_minute=1, capacity=2)})
+        try:
+            self.assertEqual(client.get(self.url).status_code, 200)
+            with self.assertRaises(BudgetExhausted):
+                client.get(self.url)
+
+            stats = client.stats()
+            self.assertEqual(stats['hosts'][self.host]['requests'], 1)
+            self.assertEqual(stats['hosts'][self.host]['throttled'], 1)
+        finally:
+            client.close()
+
+    def test_connection_error_raises(self):
+        """Test exception levée quand l'hôte est injoignable"""
+        client = HttpClient(max_retries=1, sleep=lambda delay: None,
+                            default_host=HostConfig(timeout=1, budget=2))
+        with self.assertRaises(requests.ConnectionError):
+            client.get('http://127.0.0.1:1/api')
+        stats = client.stats()['hosts']['127.0.0.1:1']
+        self.assertEqual(stats['retries'], 1)
+        self.assertEqual(stats['failures'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.lazy import Lazy
+
+class TestLazy(unittest.TestCase):
+
+    def test_built_once_under_concurrency(self):
+        """Test construction unique même si plusieurs threads accèdent en même temps"""
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        value = Lazy(factory, 'test', register=False)
+        self.assertFalse(value.loaded)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(value.get())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
+        self.assertTrue(value.loaded)
+        self.assertGreater(value.load_seconds, 0)
+
+    def test_failure_is_retried(self):
+        """Test un échec de construction n'est pas mémorisé"""
+        attempts = []
+
+        def factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError('indisponible')
+            return 42
+
+        value = Lazy(factory, 'test', register=False)
+        with self.assertRaises(RuntimeError):
+            value.get()
+        self.assertFalse(value.loaded)
+        self.assertEqual(value.get(), 42)
+
+    def test_scorer_loads_analyzer_on_first_score(self):
+        """Test le lexique VADER n'est chargé qu'au premier texte scoré"""
+        from utils import scoring
+        scorer = scoring.SentimentScorer(cache_size=10)
+        self.assertIsNone(scorer._analyzer)
+        self.assertGreater(scorer.score('great gains today'), 0)
+        self.assertTrue(scoring.VADER.loaded)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+import requests
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_test import compare, percentile, run_route, summarize
+from benchmarks.stub_upstream import UpstreamStub, chart_prices
+from utils.crypto_api import get_crypto_data
+
+class TestLoadTestStats(unittest.TestCase):
+
+    def test_percentile_nearest_rank(self):
+        """Test percentiles par rang le plus proche"""
+        values = [i / 100 for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 0.5)
+        self.assertEqual(percentile(values, 99), 0.99)
+        self.assertEqual(percentile([0.2], 95), 0.2)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_summarize(self):
+        """Test résumé : RPS et latences en millisecondes"""
+        result = summarize([0.01] * 90 + [0.1] * 10, errors=2, elapsed=2.0)
+        self.assertEqual(result['requests'], 100)
+        self.assertEqual(result['errors'], 2)
+        self.assertEqual(result['rps'], 50.0)
+        self.assertEqual(result['p50_ms'], 10.0)
+        self.assertEqual(result['p99_ms'], 100.0)
+
+    def test_compare_detects_regressions(self):
+        """Test régressions : débit en baisse, p95 en hausse au-delà de la tolérance"""
+        baseline = {'index': {'rps': 100, 'p95_ms': 10, 'p99_ms': 20}}
+        ok = {'index': {'rps': 90, 'p95_ms': 11, 'p99_ms': 22}, 'other': {'rps': 1, 'p95_ms': 1, 'p99_ms': 1}}
+        self.assertEqual(compare(ok, baseline, tolerance=0.25), [])
+        slow = {'index': {'rps': 50, 'p95_ms': 30, 'p99_ms': 20}}
+        regressions = compare(slow, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('index: débit'))
+
+class TestUpstreamStub(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = UpstreamStub().start()
+
+    def tearDown(self):
+        self.stub.stop()
+
+    def test_coingecko_routes(self):
+        """Test réponses au format CoinGecko"""
+        coin = requests.get(f'{self.stub.coingecko_url}/coins/bitcoin', timeout=5).json()
+        self.assertIn('usd', coin['market_data']['current_price'])
+        prices = requests.get(f'{self.stub.coingecko_url}/simple/price',
+                              params={'ids': 'bitcoin,ethereum'}, timeout=5).json()
+        self.assertEqual(set(prices), {'bitcoin', 'ethereum'})
+        chart = requests.get(f'{self.stub.coingecko_url}/coins/bitcoin/market_chart',
+                             params={'days': 1}, timeout=5).json()
+        self.assertEqual(len(chart['prices']), 288)
+        self.assertEqual(self.stub.stats()['requests'], {'coin': 1, 'simple_price': 1, 'market_chart': 1})
+
+    def test_chart_granularity(self):
+        """Test granularité 5 min / 1 h / 1 jour selon la plage"""
+        self.assertEqual(len(chart_prices('bitcoin', 0, 3600)), 12)
+        self.assertEqual(len(chart_prices('bitcoin', 0, 7 * 86400)), 168)
+        self.assertEqual(len(chart_prices('bitcoin', 0, 365 * 86400)), 365)
+
+    def test_tweets(self):
+        """Test réponse de recherche Twitter"""
+        data = requests.get(f'{self.stub.twitter_url}/tweets/search/recent',
+                            params={'max_results': 5}, timeout=5).json()
+        self.assertEqual(len(data['data']), 5)
+        self.assertEqual(data['meta']['newest_id'], data['data'][0]['id'])
+
+    def test_injected_errors_and_latency(self):
+        """Test injection d'erreurs et de latence"""
+        self.stub.error_rate = 1.0
+        self.stub.error_status = 429
+        self.stub.latency = 0.05
+        started = time.perf_counter()
+        response = requests.get(f'{self.stub.coingecko_url}/coins/bitcoin', timeout=5)
+        self.assertGreaterEqual(time.perf_counter() - started, 0.05)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '1')
+        self.assertEqual(self.stub.stats()['errors'], 1)
+
+    def test_unknown_route(self):
+        """Test route inconnue : 404"""
+        self.assertEqual(requests.get(f'{self.stub.url}/nope', timeout=5).status_code, 404)
+
+    def test_application_client_against_stub(self):
+        """Test client de l'application redirigé vers le serveur simulé"""
+        with patch('utils.http_client.COINGECKO_API_URL', self.stub.coingecko_url):
+            result = get_crypto_data('bitcoin')
+        self.assertEqual(result['name'], 'Bitcoin')
+        self.assertGreater(result['price'], 0)
+        self.assertEqual(self.stub.stats()['requests'], {'simple_price': 1})
+
+    def test_run_route(self):
+        """Test mesure d'une route en concurrence"""
+        result = run_route(self.stub.coingecko_url, '/coins/bitcoin', concurrency=2, duration=0.2)
+        self.assertGreater(result['requests'], 0)
+        self.assertEqual(result['errors'], 0)
+        self.assertGreater(result['rps'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+if __name__ == '__main__':
+    unittest.main()
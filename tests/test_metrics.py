@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+
+from flask import Flask
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import metrics
+from utils.metrics import Registry, stats_samples
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_render(self):
+        """Test rendu d'un compteur avec labels échappés"""
+        counter = self.registry.counter('demo_total', 'Démo', ('source',))
+        counter.inc(source='a')
+        counter.inc(2, source='say "hi"')
+        output = self.registry.render()
+        self.assertIn('# TYPE demo_total counter', output)
+        self.assertIn('demo_total{source="a"} 1', output)
+        self.assertIn('demo_total{source="say \\"hi\\""} 2', output)
+        self.assertEqual(counter.value(source='a'), 1)
+
+    def test_histogram_cumulative_buckets(self):
+        """Test histogramme : intervalles cumulatifs, somme et total"""
+        histogram = self.registry.histogram('latency_seconds', 'Latence', ('route',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, route='/')
+        output = self.registry.render()
+        self.assertIn('latency_seconds_bucket{route="/",le="0.1"} 1', output)
+        self.assertIn('latency_seconds_bucket{route="/",le="1.0"} 2', output)
+        self.assertIn('latency_seconds_bucket{route="/",le="+Inf"} 3', output)
+        self.assertIn('latency_seconds_sum{route="/"} 5.55', output)
+        self.assertIn('latency_seconds_count{route="/"} 3', output)
+
+    def test_register_twice_returns_same_metric(self):
+        """Test même nom enregistré deux fois : une seule métrique"""
+        first = self.registry.counter('demo_total', 'Démo')
+        self.assertIs(self.registry.counter('demo_total', 'Démo'), first)
+
+    def test_collectors_merged_by_name(self):
+        """Test échantillons de plusieurs collecteurs : un seul HELP/TYPE"""
+        self.registry.register_collector(lambda: [('tokens', 'gauge', 'Jetons', [({'host': 'a'}, 1)])])
+        self.registry.register_collector(lambda: [('tokens', 'gauge', 'Jetons', [({'host': 'b'}, 2)])])
+        output = self.registry.render()
+        self.assertEqual(output.count('# TYPE tokens gauge'), 1)
+        self.assertIn('tokens{host="a"} 1', output)
+        self.assertIn('tokens{host="b"} 2', output)
+
+    def test_failing_collector_ignored(self):
+        """Test collecteur en erreur : export maintenu, erreur comptée"""
+        before = metrics.errors_total.value(source='metrics_collector')
+
+        def broken():
+            raise RuntimeError('boom')
+
+        self.registry.register_collector(broken)
+        self.registry.counter('demo_total', 'Démo').inc()
+        self.assertIn('demo_total 1', self.registry.render())
+        self.assertEqual(metrics.errors_total.value(source='metrics_collector'), before + 1)
+
+    def test_stats_samples(self):
+        """Test conversion d'un dictionnaire de stats en compteurs et jauges"""
+        samples = stats_samples('cache', {'hits': 3, 'size': 2, 'backend': 'memory', 'enabled': True},
+                                'Cache', kinds={'hits': 'counter'})
+        by_name = {name: (kind, values) for name, kind, _, values in samples}
+        self.assertEqual(by_name['cache_hits_total'], ('counter', [({}, 3)]))
+        self.assertEqual(by_name['cache_size'], ('gauge', [({}, 2)]))
+        self.assertEqual(len(by_name), 2)
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_timed_records_duration_and_errors(self):
+        """Test décorateur timed : durée observée, exceptions comptées"""
+        @metrics.timed('test_timed_fn')
+        def fn(fail=False):
+            if fail:
+                raise ValueError('échec')
+            return 42
+
+        self.assertEqual(fn(), 42)
+        with self.assertRaises(ValueError):
+            fn(fail=True)
+        self.assertEqual(metrics.function_duration.count(function='test_timed_fn'), 2)
+        self.assertEqual(metrics.errors_total.value(source='test_timed_fn'), 1)
+
+    def test_instrument_app_labels_by_route_rule(self):
+        """Test requêtes Flask mesurées par règle de routage, pas par URL"""
+        app = Flask(__name__)
+        metrics.instrument_app(app)
+
+        @app.route('/items/<item_id>')
+        def item(item_id):
+            return item_id
+
+        client = app.test_client()
+        client.get('/items/1')
+        client.get('/items/2')
+        client.get('/missing')
+        self.assertEqual(metrics.http_request_duration.count(route='/items/<item_id>', method='GET'), 2)
+        self.assertEqual(metrics.http_requests_total.value(route='/items/<item_id>', method='GET', status=200), 2)
+        self.assertEqual(metrics.http_requests_total.value(route='unmatched', method='GET', status=404), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.portfolio import PortfolioBook
+
+class TestPortfolioBook(unittest.TestCase):
+
+    def setUp(self):
+        self.book = PortfolioBook(capacity=2)
+        self.book.record_transaction('alice', 'bitcoin', 2, 40000)
+        self.book.record_transaction('alice', 'ethereum', 10, 2000)
+        self.book.record_transaction('bob', 'bitcoin', 1, 50000)
+        self.book.update_prices({'bitcoin': 45000, 'ethereum': 2500})
+
+    def test_valuation(self):
+        """Test valeur, coût et P&L latent"""
+        valuation = self.book.valuation('alice')
+
+        self.assertEqual(valuation['value'], 115000)
+        self.assertEqual(valuation['cost_basis'], 100000)
+        self.assertEqual(valuation['unrealized_pnl'], 15000)
+        self.assertEqual(valuation['unrealized_pnl_pct'], 15.0)
+        self.assertEqual(self.book.valuation('bob')['unrealized_pnl'], -5000)
+        self.assertIsNone(self.book.valuation('inconnu'))
+
+    def test_single_price_update_is_incremental(self):
+        """Test un seul prix modifié : revalorisation incrémentale"""
+        full_revalues = self.book.stats()['full_revalues']
+        # Assez de cryptos pour rester sous le seuil de revalorisation complète
+        for i in range(10):
+            self.book.set_position('carol', f'coin-{i}', 1, 1)
+
+        self.book.update_prices({'ethereum': 3000})
+
+        self.assertEqual(self.book.valuation('alice')['value'], 120000)
+        self.assertEqual(self.book.valuation('bob')['value'], 45000)
+        self.assertEqual(self.book.stats()['full_revalues'], full_revalues)
+        self.assertEqual(self.book.update_prices({'ethereum': 3000}), 0)
+
+    def test_sell_realizes_pnl_at_average_cost(self):
+        """Test vente : P&L réalisé au coût moyen"""
+        self.book.record_transaction('alice', 'bitcoin', 2, 50000)  # coût moyen 45000
+
+        realized = self.book.record_transaction('alice', 'bitcoin', -1, 48000)
+
+        self.assertEqual(realized, 3000)
+        valuation = self.book.valuation('alice')
+        self.assertEqual(valuation['realized_pnl'], 3000)
+        self.assertEqual(valuation['cost_basis'], 3 * 45000 + 20000)
+
+    def test_oversell_rejected(self):
+        """Test vente supérieure à la quantité détenue"""
+        with self.assertRaises(ValueError):
+            self.book.record_transaction('bob', 'bitcoin', -2, 45000)
+
+    def test_rejected_transaction_leaves_book_unchanged(self):
+        """Test transaction refusée (horodatage invalide, NaN, infini) : ni position ni journal modifiés"""
+        valuation = self.book.valuation('alice')
+        positions = self.book.positions('alice')
+        log = self.book.transactions('alice')
+        invalid = [(-1, 48000, 'abc'), (1, float('nan'), None), (float('inf'), 45000, None),
+                   (1, 45000, float('nan')), (-1, '48000x', None)]
+        for quantity, price, ts in invalid:
+            with self.assertRaises((TypeError, ValueError)):
+                self.book.record_transaction('alice', 'bitcoin', quantity, price, ts)
+
+        self.assertEqual(self.book.valuation('alice'), valuation)
+        self.assertEqual(self.book.positions('alice'), positions)
+        self.assertEqual(self.book.transactions('alice'), log)
+
+    def test_rejected_sell_creates_nothing(self):
+        """Test vente refusée sur un portefeuille ou une crypto inconnus : rien n'est créé"""
+        stats = self.book.stats()
+        for portfolio_id, coin_id in [('carol', 'bitcoin'), ('alice', 'dogecoin'), ('carol', 'dogecoin')]:
+            with self.assertRaises(ValueError):
+                self.book.record_transaction(portfolio_id, coin_id, -1, 100)
+
+        self.assertIsNone(self.book.valuation('carol'))
+        self.assertNotIn('dogecoin', self.book.positions('alice'))
+        self.assertEqual(self.book.stats(), stats)
+
+    def test_allocation_and_exposure(self):
+        """Test répartition d'un portefeuille et exposition globale"""
+        allocation = self.book.allocation('alice')
+
+        self.assertAlmostEqual(allocation['bitcoin'], 78.26, places=2)
+        self.assertAlmostEqual(allocation['ethereum'], 21.74, places=2)
+        self.assertEqual(self.book.exposure(), {'bitcoin': 135000, 'ethereum': 25000})
+
+    def test_full_revalue_matches_incremental(self):
+        """Test revalorisation complète identique aux mises à jour incrémentales"""
+        for i in range(20):
+            self.book.set_position(f'p{i}', 'bitcoin', i + 1, 0)
+        self.book.update_prices({'bitcoin': 46000})
+        incremental = [self.book.valuation(f'p{i}')['value'] for i in range(20)]
+
+        self.book._revalue_all()
+
+        self.assertEqual([self.book.valuation(f'p{i}')['value'] for i in range(20)], incremental)
+
+    def test_refresh_prices_uses_fetcher(self):
+        """Test récupération des prix des cryptos détenues"""
+        requested = []
+
+        def fetch(ids):
+            requested.extend(ids)
+            return {'bitcoin': {'usd': 50000, 'usd_24h_change': 1.0}}
+
+        self.book.refresh_prices(fetch)
+
+        self.assertEqual(sorted(requested), ['bitcoin', 'ethereum'])
+        self.assertEqual(self.book.valuation('bob')['value'], 50000)
+
+    def test_transactions_log(self):
+        """Test journal des transactions par portefeuille"""
+        log = self.book.transactions('alice')
+
+        self.assertEqual([tx['coin_id'] for tx in log], ['bitcoin', 'ethereum'])
+        self.assertEqual(log[0]['quantity'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
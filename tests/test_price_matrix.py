@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_upstream import STUB_FX, exchange_rates_payload
+from models.price_matrix import PriceMatrix
+
+class TestPriceMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = PriceMatrix(['usd', 'eur', 'gbp'], capacity=2)
+        self.matrix.update_fx({'eur': 0.9, 'gbp': 0.8})
+        self.matrix.update_prices({'bitcoin': 50000.0, 'ethereum': 2500.0})
+
+    def test_prices_derived_in_every_currency(self):
+        """Test un prix en USD et la table de change suffisent pour toutes les devises"""
+        self.assertEqual(self.matrix.price('bitcoin'), 50000.0)
+        self.assertAlmostEqual(self.matrix.price('bitcoin', 'eur'), 45000.0)
+        self.assertAlmostEqual(self.matrix.price('ethereum', 'GBP'), 2000.0)
+        self.assertEqual(set(self.matrix.row('ethereum')), {'usd', 'eur', 'gbp'})
+
+    def test_unknown_values_are_none(self):
+        """Test crypto inconnue, devise non suivie ou taux manquant : None"""
+        matrix = PriceMatrix(['usd', 'eur', 'jpy'])
+        matrix.update_fx({'eur': 0.9})
+        matrix.update_prices({'bitcoin': 100.0})
+        self.assertIsNone(matrix.price('dogecoin', 'eur'))
+        self.assertIsNone(matrix.price('bitcoin', 'chf'))
+        self.assertIsNone(matrix.price('bitcoin', 'jpy'))
+        self.assertFalse(matrix.has_currency('jpy'))
+        self.assertIsNone(matrix.convert(1, 'bitcoin', 'jpy'))
+
+    def test_fx_update_revalues_all_rows(self):
+        """Test nouvelle table de change : toutes les lignes recalculées, taux inchangé ignoré"""
+        self.assertEqual(self.matrix.update_fx({'eur': 0.5, 'gbp': 0.8, 'chf': 0.9}), 1)
+        self.assertAlmostEqual(self.matrix.price('bitcoin', 'eur'), 25000.0)
+        self.assertAlmostEqual(self.matrix.price('ethereum', 'eur'), 1250.0)
+        self.assertAlmostEqual(self.matrix.price('ethereum', 'gbp'), 2000.0)
+        self.assertEqual(self.matrix.stats()['fx_updates'], 2)
+
+    def test_growth_keeps_prices(self):
+        """Test ajout de cryptos au-delà de la capacité initiale"""
+        self.matrix.update_prices({f'coin-{i}': float(i + 1) for i in range(10)})
+        self.assertAlmostEqual(self.matrix.price('bitcoin', 'eur'), 45000.0)
+        self.assertAlmostEqual(self.matrix.price('coin-9', 'gbp'), 8.0)
+        self.assertEqual(self.matrix.stats()['coins'], 12)
+
+    def test_cross_rates(self):
+        """Test conversions croisées entre devises et cryptos"""
+        self.assertAlmostEqual(self.matrix.convert(1, 'bitcoin', 'ethereum'), 20.0)
+        self.assertAlmostEqual(self.matrix.convert(90, 'eur', 'gbp'), 80.0)
+        self.assertAlmostEqual(self.matrix.convert(45000, 'eur', 'bitcoin'), 1.0)
+
+    def test_exchange_rates_payload(self):
+        """Test lecture d'une réponse /exchange_rates (taux exprimés pour 1 BTC)"""
+        self.assertEqual(self.matrix.update_from_exchange_rates(exchange_rates_payload(0)), 2)
+        self.assertAlmostEqual(self.matrix.rate('eur'), STUB_FX['eur'])
+        self.assertAlmostEqual(self.matrix.rate('gbp'), STUB_FX['gbp'])
+        with self.assertRaises(ValueError):
+            self.matrix.update_from_exchange_rates({'rates': {'eur': {'value': 1.0}}})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import contextvars
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from utils.rate_budget import (ADHOC, BACKGROUND, CRITICAL, BudgetExhausted, RateBudget,
+                               current_priority, priority, with_priority)
+
+class FakeClock:
+    """Horloge contrôlable pour tester le remplissage"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestRateBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        # 60 appels/minute = 1 jeton par seconde, seau de 10
+        self.budget = RateBudget(rate_per_minute=60, capacity=10, clock=self.clock,
+                                 max_wait={CRITICAL: 0, BACKGROUND: 0, ADHOC: 0})
+
+    def test_adhoc_keeps_reserve_for_critical(self):
+        """Test les requêtes ponctuelles laissent la moitié du seau"""
+        granted = sum(self.budget.try_acquire(ADHOC) for _ in range(10))
+
+        self.assertEqual(granted, 5)
+        with self.assertRaises(BudgetExhausted):
+            self.budget.acquire(ADHOC)
+        # La page principale a toujours des jetons
+        self.budget.acquire(CRITICAL)
+        self.assertEqual(self.budget.stats()['priorities'][ADHOC]['rejected'], 1)
+
+    def test_background_reserve(self):
+        """Test le fond laisse 20 % du seau à la page principale"""
+        granted = sum(self.budget.try_acquire(BACKGROUND) for _ in range(10))
+
+        self.assertEqual(granted, 8)
+        self.assertEqual(sum(self.budget.try_acquire(CRITICAL) for _ in range(10)), 2)
+
+    def test_refill(self):
+        """Test remplissage au débit configuré, borné par la capacité"""
+        for _ in range(10):
+            self.budget.acquire(CRITICAL)
+        self.assertFalse(self.budget.try_acquire(CRITICAL))
+
+        self.clock.now += 3
+        self.assertAlmostEqual(self.budget.tokens(), 3)
+
+        self.clock.now += 3600
+        self.assertEqual(self.budget.tokens(), 10)
+
+    def test_drain_after_429(self):
+        """Test seau vidé après un 429"""
+        self.budget.drain()
+
+        self.assertFalse(self.budget.try_acquire(CRITICAL))
+
+    def test_wait_for_token(self):
+        """Test attente d'un jeton dans la limite de max_wait"""
+        budget = RateBudget(rate_per_minute=600, capacity=1)
+        budget.acquire(CRITICAL)
+
+        budget.acquire(CRITICAL, max_wait=1)
+
+        self.assertEqual(budget.stats()['priorities'][CRITICAL]['waited'], 1)
+
+    def test_exhausted_is_request_exception(self):
+        """Test l'épuisement est géré comme une erreur réseau par les appelants"""
+        self.assertTrue(issubclass(BudgetExhausted, requests.RequestException))
+
+class TestPriorityContext(unittest.TestCase):
+
+    def test_default_and_nested(self):
+        """Test priorité par défaut puis imbriquée"""
+        self.assertEqual(current_priority(), ADHOC)
+        with priority(CRITICAL):
+            self.assertEqual(current_priority(), CRITICAL)
+            self.assertEqual(with_priority(BACKGROUND, current_priority)(), BACKGROUND)
+        self.assertEqual(current_priority(), ADHOC)
+
+    def test_copied_context(self):
+        """Test la priorité suit le contexte copié (threads du fan-out)"""
+        with priority(CRITICAL):
+            context = contextvars.copy_context()
+
+        self.assertEqual(context.run(current_priority), CRITICAL)
+
+    def test_unknown_priority(self):
+        """Test priorité inconnue refusée"""
+        with self.assertRaises(ValueError):
+            with priority('urgent'):
+                pass
+
+if __name__ == '__main__':
+    unittest.main()
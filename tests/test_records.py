@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import json
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.records import (NEGATIVE, NEUTRAL, POSITIVE, NewsArticle, PriceSeries, ScoredPost,
+                            TradingSignal, Tweet, classify)
+from utils import analytics
+from utils.render_cache import content_hash
+
+class TestScoredRecords(unittest.TestCase):
+
+    def test_classify_thresholds(self):
+        """Test classification aux seuils VADER"""
+        self.assertEqual(classify(0.05), POSITIVE)
+        self.assertEqual(classify(-0.05), NEGATIVE)
+        self.assertEqual(classify(0.049), NEUTRAL)
+
+    def test_no_instance_dict(self):
+        """Test enregistrements sans dictionnaire par instance"""
+        tweet = Tweet('BTC up', 0.5, '12:00', 'user_1', True)
+        self.assertFalse(hasattr(tweet, '__dict__'))
+        with self.assertRaises(AttributeError):
+            tweet.icon_html = '<i></i>'
+
+    def test_presentation_derived_from_classification(self):
+        """Test couleur et icône dérivées du score, propres à chaque type d'élément"""
+        self.assertEqual(ScoredPost('great', 0.6).icon, 'fa-smile')
+        self.assertEqual(NewsArticle('flat', 0.0, 'Reuters', '10:00').color, 'amber')
+        self.assertEqual(Tweet('flat', 0.0, '12:00', 'u', False).color, 'sky')
+        self.assertEqual(Tweet('bad', -0.7, '12:00', 'u', False).icon, 'fa-arrow-down')
+
+    def test_to_dict_data_only(self):
+        """Test export JSON : données et classification, sans attributs d'affichage"""
+        post = ScoredPost('Bitcoin is great', 0.62491)
+        self.assertEqual(post.to_dict(), {'text': 'Bitcoin is great', 'score': 0.625, 'classification': POSITIVE})
+        article = NewsArticle('ETF approved', -0.3, 'Bloomberg', '10:00')
+        self.assertEqual(article.to_dict(), {'title': 'ETF approved', 'source': 'Bloomberg', 'published_at': '10:00',
+                                             'sentiment_score': -0.3, 'classification': NEGATIVE})
+        self.assertNotIn('color', json.dumps(article.to_dict()))
+
+    def test_signal_confidence_and_type_colors(self):
+        """Test signal : confiance dérivée du score, couleur du type de signal"""
+        signal = TradingSignal('BUY BTC', -0.5, 'Whales', 'VENTE', 'BTC', 44500, '2 min')
+        self.assertEqual(signal.confidence_score, 56)
+        self.assertEqual(signal.color, 'red')
+        self.assertEqual(TradingSignal('x', 0.9, 'c', 'ACHAT', 'BTC', 1, '1 min').confidence_score, 88)
+        self.assertEqual(TradingSignal('x', 0.0, 'c', 'INFO', 'UNI', 1, '1 min').confidence_score, 16)
+
+    def test_content_hash_stable(self):
+        """Test empreinte de rendu stable pour des enregistrements identiques"""
+        first = {'tweets': [Tweet('a', 0.1, '12:00', 'u', True)]}
+        second = {'tweets': [Tweet('a', 0.1, '12:00', 'u', True)]}
+        self.assertEqual(content_hash(first), content_hash(second))
+
+class TestPriceSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.points = [[1_700_000_000_000 + i * 3_600_000, 100.0 + i] for i in range(30)]
+
+    def test_points_match_history_points(self):
+        """Test points dérivés des colonnes identiques au calcul d'origine"""
+        series = PriceSeries.from_points(self.points)
+        self.assertEqual(series.points(), analytics.history_points(self.points))
+
+    def test_append_and_extend(self):
+        """Test ajout point par point et par lot, avec agrandissement"""
+        series = PriceSeries(capacity=1)
+        for ts, price in self.points[:10]:
+            series.append(ts, price)
+        series.extend(self.points[10:])
+        self.assertEqual(len(series), 30)
+        self.assertEqual(series.prices.tolist(), [p[1] for p in self.points])
+        self.assertEqual(series.timestamps.dtype.itemsize, 8)
+
+    def test_tail(self):
+        """Test conservation des points les plus récents"""
+        series = PriceSeries.from_points(self.points)
+        tail = series.tail(5)
+        self.assertEqual(tail.prices.tolist(), [125.0, 126.0, 127.0, 128.0, 129.0])
+        self.assertEqual(len(series.tail(100)), 30)
+        self.assertEqual(len(series.tail(0)), 0)
+        self.assertEqual(PriceSeries().points(), [])
+
+    def test_compact_memory(self):
+        """Test 16 octets par point"""
+        series = PriceSeries.from_points(self.points)
+        self.assertEqual(series.nbytes, 30 * 16)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.refresher import MarketDataRefresher, RefreshJob
+
+class FakeClock:
+    """Horloge contrôlable pour tester les cadences"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestMarketDataRefresher(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.prices = iter([100, 101, 102])
+        self.jobs = {
+            ('price', 'bitcoin'): RefreshJob(lambda: next(self.prices), interval=10),
+            ('history', 'bitcoin'): RefreshJob(lambda: [1, 2, 3], interval=300)
+        }
+        self.refresher = MarketDataRefresher(self.jobs, clock=self.clock)
+
+    def test_snapshot_published(self):
+        """Test publication des résultats dans le snapshot"""
+        self.assertIsNone(self.refresher.get(('price', 'bitcoin')))
+
+        executed = self.refresher.refresh_once()
+
+        self.assertEqual(executed, 2)
+        self.assertEqual(self.refresher.get(('price', 'bitcoin')), 100)
+        self.assertEqual(self.refresher.get(('history', 'bitcoin')), [1, 2, 3])
+
+    def test_jobs_respect_their_interval(self):
+        """Test chaque tâche suit sa propre cadence"""
+        self.refresher.refresh_once()
+        self.clock.now += 11
+
+        executed = self.refresher.refresh_once()
+
+        self.assertEqual(executed, 1)
+        self.assertEqual(self.refresher.get(('price', 'bitcoin')), 101)
+
+    def test_failed_job_keeps_last_value(self):
+        """Test la dernière valeur est conservée si une tâche échoue"""
+        self.refresher.refresh_once()
+
+        def failing():
+            raise ValueError("API Error")
+
+        self.jobs[('price', 'bitcoin')].fn = failing
+        self.refresher.refresh_once(force=True)
+
+        self.assertEqual(self.refresher.get(('price', 'bitcoin')), 100)
+        job_stats = self.refresher.stats()['jobs']['price:bitcoin']
+        self.assertEqual(job_stats['errors'], 1)
+        self.assertEqual(job_stats['last_error'], 'API Error')
+
+    def test_snapshot_is_read_only(self):
+        """Test le snapshot exposé n'est pas modifiable"""
+        self.refresher.refresh_once()
+        with self.assertRaises(TypeError):
+            self.refresher.snapshot()[('price', 'bitcoin')] = 0
+
+    def test_on_publish_called_with_snapshot(self):
+        """Test notification après chaque publication"""
+        published = []
+        refresher = MarketDataRefresher(self.jobs, clock=self.clock, on_publish=published.append)
+
+        refresher.refresh_once()
+        refresher.refresh_once()
+
+        self.assertEqual(len(published), 1)
+        self.assertEqual(published[0][('price', 'bitcoin')], 100)
+
+    def test_start_and_stop(self):
+        """Test démarrage et arrêt du thread"""
+        self.refresher.start()
+        self.assertTrue(self.refresher.is_running())
+        self.refresher.stop()
+        self.assertFalse(self.refresher.is_running())
+
+if __name__ == '__main__':
+    unittest.main()
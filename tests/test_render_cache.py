@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+from flask import Flask
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.render_cache import RenderCache, conditional_response, content_hash
+
+class TestContentHash(unittest.TestCase):
+
+    def test_stable_and_order_independent(self):
+        """Test empreinte stable, indépendante de l'ordre des clés"""
+        self.assertEqual(content_hash({'a': 1, 'b': [1, 2]}), content_hash({'b': [1, 2], 'a': 1}))
+        self.assertNotEqual(content_hash({'a': 1}), content_hash({'a': 2}))
+
+    def test_non_json_values(self):
+        """Test valeurs non JSON (datetime) acceptées"""
+        self.assertEqual(len(content_hash([datetime(2024, 1, 1)])), 32)
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = RenderCache(max_size=2, clock=lambda: 1700000000.0)
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        return f'<p>rendu {self.renders}</p>'
+
+    def test_render_once_per_inputs(self):
+        """Test un seul rendu tant que les entrées sont identiques"""
+        first = self.cache.get_or_render('telegram', [1, 2], self.render)
+        second = self.cache.get_or_render('telegram', [1, 2], self.render)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_changed_inputs_rerender(self):
+        """Test nouveau rendu (et nouvel ETag) quand les entrées changent"""
+        first = self.cache.get_or_render('telegram', [1, 2], self.render)
+        second = self.cache.get_or_render('telegram', [1, 3], self.render)
+
+        self.assertEqual(self.renders, 2)
+        self.assertNotEqual(first.etag, second.etag)
+
+    def test_lru_eviction(self):
+        """Test éviction au-delà de la taille maximale"""
+        for name in ('steady', 'twitter', 'telegram'):
+            self.cache.get_or_render(name, [], self.render)
+
+        self.cache.get_or_render('steady', [], self.render)
+
+        self.assertEqual(self.renders, 4)
+        self.assertEqual(self.cache.stats()['size'], 2)
+
+class TestConditionalResponse(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.page = RenderCache(clock=lambda: 1700000000.0).get_or_render('steady', [1], lambda: '<p>ok</p>')
+
+    def test_full_response_with_validators(self):
+        """Test ETag et Last-Modified sur la réponse complète"""
+        with self.app.test_request_context('/'):
+            from flask import request
+            response = conditional_response(self.page, request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_etag()[0], self.page.etag)
+        self.assertIsNotNone(response.last_modified)
+        self.assertEqual(response.get_data(), b'<p>ok</p>')
+
+    def test_not_modified(self):
+        """Test 304 si le client possède déjà cette version"""
+        with self.app.test_request_context('/', headers={'If-None-Match': f'"{self.page.etag}"'}):
+            from flask import request
+            response = conditional_response(self.page, request)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_modified_since(self):
+        """Test 304 sur If-Modified-Since postérieur au rendu"""
+        with self.app.test_request_context('/', headers={'If-Modified-Since': 'Wed, 15 Nov 2023 00:00:00 GMT'}):
+            from flask import request
+            response = conditional_response(self.page, request)
+
+        self.assertEqual(response.status_code, 304)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+import gzip
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.records import ScoredPost
+from utils import responses
+from utils.responses import FastJSONProvider, columnar, init_compression, negotiate_encoding
+
+class TestFastJSONProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = FastJSONProvider(self.app)
+
+    def test_same_output_as_default_provider(self):
+        """Test même JSON que le fournisseur Flask par défaut (clés triées, dates HTTP)"""
+        value = {'b': [1, 2.5, None, 'é'], 'a': {'z': True, 'y': datetime(2024, 1, 1, 12, 0)},
+                 'd': Decimal('1.5')}
+        expected = DefaultJSONProvider(self.app).dumps(value, separators=(',', ':'))
+        self.assertEqual(self.app.json.loads(self.app.json.dumps(value)), self.app.json.loads(expected))
+        with self.app.app_context():
+            self.assertEqual(jsonify(value).get_json(), self.app.json.loads(expected))
+
+    def test_records_and_numpy(self):
+        """Test enregistrements (to_dict) et valeurs NumPy"""
+        with self.app.app_context():
+            body = jsonify({'post': ScoredPost('great', 0.6), 'mean': np.float64(1.5),
+                            'values': np.arange(3)}).get_json()
+        self.assertEqual(body['post']['classification'], 'Positif')
+        self.assertEqual(body['mean'], 1.5)
+        self.assertEqual(body['values'], [0, 1, 2])
+
+    def test_sorted_compact_response(self):
+        """Test réponse compacte, clés triées"""
+        with self.app.app_context():
+            response = jsonify({'b': 1, 'a': 2})
+        self.assertEqual(response.get_data(), b'{"a":2,"b":1}\n')
+        self.assertEqual(response.mimetype, 'application/json')
+
+class TestNegotiation(unittest.TestCase):
+
+    def test_negotiate_encoding(self):
+        """Test choix de l'encodage selon Accept-Encoding et qualités"""
+        self.assertEqual(negotiate_encoding('gzip, deflate, br', ['br', 'gzip']), 'br')
+        self.assertEqual(negotiate_encoding('gzip;q=1.0, br;q=0.5', ['br', 'gzip']), 'gzip')
+        self.assertEqual(negotiate_encoding('br', ['gzip']), None)
+        self.assertEqual(negotiate_encoding('*', ['gzip']), 'gzip')
+        self.assertEqual(negotiate_encoding('gzip;q=0', ['gzip']), None)
+        self.assertEqual(negotiate_encoding('', ['gzip']), None)
+
+    def test_columnar(self):
+        """Test conversion en colonnes"""
+        points = [{'time': '10:00', 'price': 1.0, 'sentiment': 0}, {'time': '11:00', 'price': 2.0}]
+        self.assertEqual(columnar(points, ('time', 'price', 'sentiment')),
+                         {'time': ['10:00', '11:00'], 'price': [1.0, 2.0], 'sentiment': [0, None]})
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        init_compression(self.app, min_size=100, encodings=['gzip'])
+        self.body = 'x' * 1000
+
+        @self.app.route('/big')
+        def big():
+            return jsonify({'data': self.body})
+
+        @self.app.route('/small')
+        def small():
+            return jsonify({'data': 'x'})
+
+        @self.app.route('/page')
+        def page():
+            response = Response(self.body, mimetype='text/html')
+            response.set_etag('abc')
+            return response.make_conditional(request)
+
+        @self.app.route('/stream')
+        def stream():
+            return Response((chunk for chunk in [self.body]), mimetype='text/event-stream')
+
+        self.client = self.app.test_client()
+
+    def test_gzip_when_accepted(self):
+        """Test compression gzip si le client l'accepte"""
+        response = self.client.get('/big', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertIn(self.body, gzip.decompress(response.get_data()).decode('utf-8'))
+
+    def test_not_compressed(self):
+        """Test pas de compression : non acceptée, trop petite ou en flux"""
+        self.assertNotIn('Content-Encoding', self.client.get('/big').headers)
+        self.assertNotIn('Content-Encoding', self.client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers)
+        response = self.client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_weak_etag_and_conditional(self):
+        """Test ETag affaibli une fois compressé, revalidation 304 conservée"""
+        response = self.client.get('/page', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['ETag'], 'W/"abc"')
+        revalidated = self.client.get('/page', headers={'Accept-Encoding': 'gzip', 'If-None-Match': 'W/"abc"'})
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_compressed_page_reused(self):
+        """Test page à ETag compressée une seule fois"""
+        calls = []
+        original = responses.compress
+
+        def counting(body, encoding, level=6):
+            calls.append(encoding)
+            return original(body, encoding, level)
+
+        responses.compress = counting
+        try:
+            for _ in range(3):
+                self.client.get('/page', headers={'Accept-Encoding': 'gzip'})
+        finally:
+            responses.compress = original
+        self.assertEqual(calls, ['gzip'])
+
+if __name__ == '__main__':
+    unittest.main()
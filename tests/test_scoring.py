@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from utils.scoring import SentimentScorer
+
+class CountingAnalyzer(SentimentIntensityAnalyzer):
+    """Analyseur VADER qui compte les appels réels"""
+    calls = 0
+
+    def polarity_scores(self, text):
+        CountingAnalyzer.calls += 1
+        return super().polarity_scores(text)
+
+class TestSentimentScorer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = CountingAnalyzer()
+
+    def setUp(self):
+        CountingAnalyzer.calls = 0
+        self.scorer = SentimentScorer(analyzer=self.analyzer, cache_size=100)
+
+    def test_same_scores_as_vader(self):
+        """Test scores identiques à VADER"""
+        text = "Bitcoin just hit a new support level, looking bullish! 🚀"
+        expected = SentimentIntensityAnalyzer().polarity_scores(text)['compound']
+
+        self.assertEqual(self.scorer.score(text), expected)
+
+    def test_batch_dedup_and_order(self):
+        """Test déduplication des entrées et respect de l'ordre"""
+        texts = ["Great news!", "Terrible crash.", "Great news!", "Terrible crash."]
+
+        scores = self.scorer.score_batch(texts)
+
+        self.assertEqual(CountingAnalyzer.calls, 2)
+        self.assertEqual(scores[0], scores[2])
+        self.assertEqual(scores[1], scores[3])
+        self.assertGreater(scores[0], 0)
+        self.assertLess(scores[1], 0)
+
+    def test_cached_scores_not_recomputed(self):
+        """Test un texte déjà scoré n'est pas réanalysé"""
+        self.scorer.score_batch(["Great news!"])
+        self.scorer.score_batch(["Great news!", "Terrible crash."])
+
+        self.assertEqual(CountingAnalyzer.calls, 2)
+        self.assertEqual(self.scorer.stats()['scored'], 2)
+        self.assertEqual(self.scorer.stats()['cache']['hits'], 1)
+
+    def test_process_pool_backend(self):
+        """Test pool de processus pour les gros lots"""
+        scorer = SentimentScorer(analyzer=self.analyzer, process_threshold=4,
+                                 processes=2, chunk_size=2)
+        texts = [f"Great news number {i}!" for i in range(6)]
+        try:
+            scores = scorer.score_batch(texts)
+        finally:
+            scorer.shutdown()
+
+        self.assertEqual(CountingAnalyzer.calls, 0)
+        self.assertEqual(scores, [self.scorer.score(text) for text in texts])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_stream import CallableSource, ReplaySource, RollingWindow, SentimentStream, TextEvent
+
+class FakeClock:
+    """Horloge contrôlable pour tester les fenêtres glissantes"""
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+def fake_scores(texts):
+    """Score déterministe : 'good' positif, 'bad' négatif, sinon neutre"""
+    return [0.5 if 'good' in t else -0.5 if 'bad' in t else 0.0 for t in texts]
+
+class TestRollingWindow(unittest.TestCase):
+
+    def test_incremental_aggregates(self):
+        """Test agrégats mis à jour à chaque événement"""
+        window = RollingWindow(60)
+        window.add(1000, 0.5)
+        window.add(1001, -0.5)
+        window.add(1002, 0.0)
+
+        summary = window.summary(1002)
+        self.assertEqual(summary['count'], 3)
+        self.assertEqual(summary['positive'], 1)
+        self.assertEqual(summary['negative'], 1)
+        self.assertEqual(summary['neutral'], 1)
+        self.assertEqual(summary['average_score'], 0.0)
+        self.assertEqual(summary['hype_meter'], 50)
+
+    def test_old_events_expire(self):
+        """Test sortie des événements de la fenêtre"""
+        window = RollingWindow(60)
+        window.add(1000, 0.8)
+        window.add(1050, -0.4)
+
+        self.assertEqual(window.summary(1055)['count'], 2)
+        summary = window.summary(1075)
+        self.assertEqual(summary['count'], 1)
+        self.assertEqual(summary['average_score'], -0.4)
+
+    def test_late_event_ignored(self):
+        """Test un événement trop ancien n'écrase pas la période courante"""
+        window = RollingWindow(60)
+        window.add(1060, 0.5)
+
+        self.assertFalse(window.add(1000, -0.5))
+        self.assertEqual(window.summary(1060)['count'], 1)
+
+class TestSentimentStream(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def make_stream(self, sources):
+        return SentimentStream(sources, fake_scores, clock=self.clock)
+
+    def test_each_text_scored_once(self):
+        """Test un événement déjà vu (même ID) n'est ni rescoré ni recompté"""
+        scored = []
+
+        def counting_scores(texts):
+            scored.extend(texts)
+            return fake_scores(texts)
+
+        stream = SentimentStream([], counting_scores, clock=self.clock)
+        events = [TextEvent('news', 'good news', ts=self.clock.now, event_id='1'),
+                  TextEvent('news', 'bad news', ts=self.clock.now, event_id='2')]
+        self.assertEqual(stream.ingest(events), 2)
+        self.assertEqual(stream.ingest(events), 0)
+
+        self.assertEqual(scored, ['good news', 'bad news'])
+        self.assertEqual(stream.stats()['duplicates'], 2)
+        self.assertEqual(stream.aggregates('news')['1m']['count'], 2)
+
+    def test_windows_per_source_and_global(self):
+        """Test fenêtres 1m/5m/1h par source et globales"""
+        stream = self.make_stream([
+            CallableSource('twitter', lambda: [{'text': 'good vibes', 'ts': self.clock.now}]),
+            CallableSource('telegram', lambda: [{'text': 'bad signal', 'ts': self.clock.now}])
+        ])
+        stream.poll_once()
+        self.clock.now += 120
+        stream.poll_once()
+
+        twitter = stream.aggregates('twitter')
+        self.assertEqual(twitter['1m']['count'], 1)
+        self.assertEqual(twitter['5m']['count'], 2)
+        self.assertEqual(twitter['1h']['count'], 2)
+        self.assertEqual(stream.aggregates('all')['5m']['count'], 4)
+        self.assertEqual(stream.aggregates('unknown')['1h']['count'], 0)
+
+    def test_recent_events_keep_metadata(self):
+        """Test derniers événements avec score et métadonnées"""
+        stream = self.make_stream([
+            CallableSource('twitter', lambda: [{'text': 'good', 'author_id': 'user_1'}])
+        ])
+        stream.poll_once()
+
+        event = stream.recent('twitter')[0]
+        self.assertEqual(event.score, 0.5)
+        self.assertEqual(event.meta, {'author_id': 'user_1'})
+
+    def test_replay_source_from_file(self):
+        """Test source de rejeu à partir d'un fichier"""
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding='utf-8') as f:
+            f.write('good day\n{"text": "bad day", "id": "t2"}\n\n')
+            path = f.name
+        try:
+            source = ReplaySource(path=path, batch_size=5)
+            events = source.poll()
+        finally:
+            os.unlink(path)
+
+        self.assertEqual([e.text for e in events], ['good day', 'bad day'])
+        self.assertEqual(events[1].event_id, 't2')
+        self.assertEqual(source.poll(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import multiprocessing
+import tempfile
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.shared_snapshot import SharedPriceSnapshot, SEQ, SEQ_OFFSET, decode_prices, encode_prices
+
+PRICES = {
+    'bitcoin': {'name': 'Bitcoin', 'symbol': 'BTC', 'price': 45000.5, 'change_24h': 2.5, 'image': None},
+    'ethereum': {'name': 'Ethereum', 'symbol': 'ETH', 'price': 2500.0, 'change_24h': -1.2, 'error': True}
+}
+
+def _publish_in_child(path, price):
+    writer = SharedPriceSnapshot(path, size=4096)
+    writer.publish({'bitcoin': {'price': price}})
+    writer.close()
+
+class TestEncoding(unittest.TestCase):
+
+    def test_round_trip(self):
+        """Test encodage compact puis décodage identique"""
+        self.assertEqual(decode_prices(encode_prices(PRICES)), PRICES)
+
+class TestSharedPriceSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'prices.snap')
+        self.writer = SharedPriceSnapshot(self.path, size=4096)
+        self.reader = SharedPriceSnapshot(self.path, size=4096)
+
+    def tearDown(self):
+        self.writer.close()
+        self.reader.close()
+        self.tmp.cleanup()
+
+    def test_read_before_publish(self):
+        """Test lecture sans snapshot publié"""
+        self.assertEqual(self.reader.read(), (0, {}))
+        self.assertIsNone(self.reader.get('bitcoin'))
+
+    def test_publish_and_read(self):
+        """Test publication puis lecture par un autre lecteur"""
+        seq = self.writer.publish(PRICES)
+
+        self.assertEqual(seq, 2)
+        self.assertEqual(self.reader.read(), (2, PRICES))
+        self.assertEqual(self.writer.publish(PRICES), 4)
+        self.assertEqual(self.reader.sequence(), 4)
+
+    def test_decode_only_on_new_sequence(self):
+        """Test décodage uniquement quand la séquence avance"""
+        self.writer.publish(PRICES)
+        first = self.reader.read()[1]
+        second = self.reader.read()[1]
+
+        self.assertIs(first, second)
+        self.assertEqual(self.reader.stats()['decodes'], 1)
+
+    def test_write_in_progress_keeps_last_version(self):
+        """Test séquence impaire (écriture en cours) : dernière version complète conservée"""
+        self.writer.publish(PRICES)
+        self.reader.read()
+        SEQ.pack_into(self.writer._map, SEQ_OFFSET, 3)
+
+        self.assertEqual(self.reader.read(), (2, PRICES))
+        self.assertGreater(self.reader.stats()['retries'], 0)
+        # Le propriétaire suivant repart d'une séquence paire
+        self.assertEqual(self.writer.publish(PRICES), 6)
+
+    def test_too_large(self):
+        """Test snapshot plus grand que le fichier mappé"""
+        with self.assertRaises(ValueError):
+            self.writer.publish({f'coin-{i}': {'price': float(i)} for i in range(500)})
+
+    def test_single_owner(self):
+        """Test un seul propriétaire, relève après libération"""
+        self.assertTrue(self.writer.try_acquire_owner())
+        self.assertFalse(self.reader.try_acquire_owner())
+
+        self.writer.release_owner()
+
+        self.assertTrue(self.reader.try_acquire_owner())
+
+    def test_other_process_publish(self):
+        """Test lecture d'un snapshot publié par un autre processus"""
+        process = multiprocessing.get_context('spawn').Process(target=_publish_in_child, args=(self.path, 123.0))
+        process.start()
+        process.join(30)
+
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(self.reader.get('bitcoin'), {'price': 123.0})
+
+if __name__ == '__main__':
+    unittest.main()
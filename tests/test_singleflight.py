@@ -0,0 +1,232 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache import TTLCache
+from utils.rate_budget import CRITICAL, BudgetExhausted, RateBudget, priority
+from utils.singleflight import FillInProgress, SingleFlight, _coordinated, fetch_with_cache
+
+class FakeClock:
+    """Horloge contrôlable pour tester les expirations"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_coalesced(self):
+        """Test un seul appel amont pour des appelants concurrents"""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(2)
+            return 42
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do('bitcoin', fetch)))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        # Laisser les appelants s'accumuler sur l'appel en cours
+        while flight.stats()['shared'] < 7:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(flight.stats()['in_flight'], 0)
+
+    def test_error_propagated_to_all_callers(self):
+        """Test l'erreur amont est relancée chez l'appelant"""
+        flight = SingleFlight()
+
+        def fetch():
+            raise ValueError("API Error")
+
+        with self.assertRaises(ValueError):
+            flight.do('bitcoin', fetch)
+        self.assertEqual(flight.stats()['in_flight'], 0)
+
+    def test_higher_priority_joiner_retries_budget(self):
+        """Test appel CRITICAL joint à un appel ADHOC refusé par le budget : relancé à sa priorité"""
+        clock = FakeClock()
+        budget = RateBudget(rate_per_minute=10, clock=clock)
+        for _ in range(7):
+            self.assertTrue(budget.try_acquire(CRITICAL))
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fetch():
+            release.wait(2)
+            budget.acquire()
+            return 42
+
+        adhoc, critical = [], []
+
+        def run(results):
+            try:
+                results.append(flight.do('bitcoin', fetch))
+            except BudgetExhausted as e:
+                results.append(e)
+
+        leader = threading.Thread(target=run, args=(adhoc,))
+        leader.start()
+        while not flight.stats()['in_flight']:
+            time.sleep(0.01)
+
+        def critical_caller():
+            with priority(CRITICAL):
+                run(critical)
+
+        joiner = threading.Thread(target=critical_caller)
+        joiner.start()
+        while flight.stats()['shared'] < 1:
+            time.sleep(0.01)
+        release.set()
+        leader.join(2)
+        joiner.join(2)
+
+        self.assertIsInstance(adhoc[0], BudgetExhausted)
+        self.assertEqual(critical, [42])
+        self.assertEqual(flight.stats()['executions'], 2)
+
+class TestFetchWithCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(max_size=10, default_ttl=10, clock=self.clock)
+        self.flight = SingleFlight()
+
+    def test_miss_then_hit(self):
+        """Test un seul appel amont puis lecture du cache"""
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return {'price': 1}
+
+        for _ in range(3):
+            result = fetch_with_cache(self.cache, self.flight, 'k', fetch, ttl=10)
+
+        self.assertEqual(result, {'price': 1})
+        self.assertEqual(len(calls), 1)
+
+    def test_stale_while_revalidate(self):
+        """Test valeur périmée servie immédiatement et rafraîchie en arrière-plan"""
+        fetch_with_cache(self.cache, self.flight, 'k', lambda: 'old', ttl=10, stale_ttl=60)
+        self.clock.now += 15
+        refreshed = threading.Event()
+
+        def fetch():
+            refreshed.set()
+            return 'new'
+
+        result = fetch_with_cache(self.cache, self.flight, 'k', fetch, ttl=10, stale_ttl=60)
+
+        self.assertEqual(result, 'old')
+        self.assertTrue(refreshed.wait(2))
+        while self.flight.stats()['in_flight']:
+            time.sleep(0.01)
+        self.assertEqual(self.cache.get('k'), 'new')
+
+    def test_error_without_value_raises(self):
+        """Test l'erreur est propagée quand aucune valeur n'est disponible"""
+        def fetch():
+            raise ValueError("API Error")
+
+        with self.assertRaises(ValueError):
+            fetch_with_cache(self.cache, self.flight, 'k', fetch, ttl=10)
+        self.assertNotIn('k', self.cache)
+
+    def test_failed_refresh_joined_after_stale_window(self):
+        """Test rafraîchissement en échec rejoint après la fenêtre stale : erreur, jamais None"""
+        fetch_with_cache(self.cache, self.flight, 'k', lambda: 'old', ttl=10, stale_ttl=5)
+        self.clock.now += 12
+        started, release = threading.Event(), threading.Event()
+
+        def failing_fetch():
+            started.set()
+            release.wait(2)
+            raise ValueError("API Error")
+
+        self.assertEqual(fetch_with_cache(self.cache, self.flight, 'k', failing_fetch, ttl=10, stale_ttl=5), 'old')
+        self.assertTrue(started.wait(2))
+        self.clock.now += 10
+        outcome = []
+
+        def joiner():
+            try:
+                outcome.append(fetch_with_cache(self.cache, self.flight, 'k', lambda: 'new', ttl=10, stale_ttl=5))
+            except ValueError as e:
+                outcome.append(e)
+
+        thread = threading.Thread(target=joiner)
+        thread.start()
+        while self.flight.stats()['shared'] < 1:
+            time.sleep(0.01)
+        release.set()
+        thread.join(2)
+        self.assertEqual(len(outcome), 1)
+        self.assertIsInstance(outcome[0], ValueError)
+
+class SharedCache(TTLCache):
+    """Cache partagé simulé : un autre serveur tient le verrou de remplissage au premier essai"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.attempted, self.release_lock = threading.Event(), threading.Event()
+        self.attempts = 0
+
+    def acquire(self, key, ttl):
+        self.attempts += 1
+        if self.attempts > 1:
+            return True
+        self.attempted.set()
+        self.release_lock.wait(2)
+        return False
+
+    def release(self, key):
+        pass
+
+class TestSharedFill(unittest.TestCase):
+
+    def test_joiner_of_deferred_refresh_gets_value(self):
+        """Test rafraîchissement laissé à un autre serveur : l'appelant qui l'a rejoint obtient une valeur"""
+        clock = FakeClock()
+        cache = SharedCache(max_size=10, default_ttl=10, clock=clock)
+        flight = SingleFlight()
+        cache.set('k', 'old', ttl=10, stale_ttl=5)
+        clock.now += 12
+        self.assertEqual(fetch_with_cache(cache, flight, 'k', lambda: 'new', ttl=10, stale_ttl=5), 'old')
+        self.assertTrue(cache.attempted.wait(2))
+        clock.now += 10
+        outcome = []
+        thread = threading.Thread(
+            target=lambda: outcome.append(fetch_with_cache(cache, flight, 'k', lambda: 'new', ttl=10, stale_ttl=5)))
+        thread.start()
+        while flight.stats()['shared'] < 1:
+            time.sleep(0.01)
+        cache.release_lock.set()
+        thread.join(2)
+        self.assertEqual(outcome, ['new'])
+
+    def test_deferred_refresh_raises_sentinel(self):
+        """Test sans le verrou, le rafraîchissement d'arrière-plan lève FillInProgress au lieu de retourner None"""
+        cache = SharedCache(max_size=10, default_ttl=10)
+        cache.release_lock.set()
+        with self.assertRaises(FillInProgress):
+            _coordinated(cache, 'k', lambda: 'new', wait=False)()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+import textwrap
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_startup import ROOT, STARTUP_BUDGET_MS, import_profile, measure, parse_importtime
+
+class TestStartup(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        """Test analyse de la sortie de -X importtime"""
+        output = ('import time: self [us] | cumulative | imported package\n'
+                  'import time:       120 |        120 |   json.decoder\n'
+                  'import time:      1500 |       1620 | app\n'
+                  'autre ligne\n')
+        self.assertEqual(parse_importtime(output), {'json.decoder': (120, 120), 'app': (1500, 1620)})
+
+    def test_app_startup_is_lazy_and_within_budget(self):
+        """Test import de l'application : aucune dépendance paresseuse, temps sous le budget"""
+        result = measure('app', runs=3)
+        self.assertEqual(result['lazy_imported'], [])
+        self.assertLess(result['import_ms'], STARTUP_BUDGET_MS)
+
+    def test_preload_mode_loads_heavy_modules(self):
+        """Test PRELOAD_HEAVY=true : SQLAlchemy et VADER chargés avant le fork des workers"""
+        profile = import_profile('app', {'PRELOAD_HEAVY': 'true'})
+        self.assertIn('sqlalchemy', profile)
+        self.assertIn('vaderSentiment', profile)
+
+    def test_preload_mode_starts_threads_after_fork(self):
+        """Test PRELOAD_HEAVY=true : aucun thread ni verrou dans le maître, démarrage dans chaque worker"""
+        script = textwrap.dedent('''
+            import os, threading
+            import app
+
+            def running():
+                return sorted(t.name for t in threading.enumerate() if t.name in ('market-refresher', 'sentiment-stream'))
+
+            assert running() == [], running()
+            assert app.market_refresher is None and not app.shared_prices.is_owner()
+            pid = os.fork()
+            if pid == 0:
+                with app.app.test_request_context('/'):
+                    app.app.preprocess_request()
+                ok = running() == ['market-refresher', 'sentiment-stream'] and app.shared_prices.is_owner()
+                os._exit(0 if ok else 1)
+            _, status = os.waitpid(pid, 0)
+            assert os.waitstatus_to_exitcode(status) == 0, 'threads non démarrés dans le worker'
+        ''')
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, PRELOAD_HEAVY='true', SENTIMENT_STREAM_ENABLED='true',
+                       SHARED_SNAPSHOT_PATH=os.path.join(tmp, 'prices.snapshot'))
+            result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env,
+                                    capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+if __name__ == '__main__':
+    unittest.main()
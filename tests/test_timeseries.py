@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.timeseries import PriceHistoryStore, upstream_resolution_ms
+
+HOUR_MS = 3600 * 1000
+FIVE_MINUTES_MS = 5 * 60 * 1000
+
+def chart_points(start_ms, end_ms):
+    """Points [ts_ms, prix] d'une plage, au pas que CoinGecko renvoie pour sa durée"""
+    step = upstream_resolution_ms(end_ms - start_ms)
+    first = (start_ms // step + 1) * step
+    return [[ts, 100.0 + ts / step % 10] for ts in range(first, end_ms + 1, step)]
+
+class TestPriceHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = PriceHistoryStore('sqlite://')
+
+    def test_append_is_incremental(self):
+        """Test les points déjà stockés ne sont pas dupliqués"""
+        points = [[0, 100.0], [HOUR_MS, 101.0]]
+
+        self.assertEqual(self.store.append('bitcoin', points), 2)
+        self.assertEqual(self.store.append('bitcoin', points + [[2 * HOUR_MS, 102.0]]), 1)
+        self.assertEqual(len(self.store.query('bitcoin', 0, 10 * HOUR_MS)), 3)
+
+    def test_query_range_per_coin(self):
+        """Test lecture d'une plage, isolée par crypto"""
+        self.store.append('bitcoin', [[i * HOUR_MS, 100.0 + i] for i in range(10)])
+        self.store.append('ethereum', [[i * HOUR_MS, 10.0] for i in range(10)])
+
+        result = self.store.query('bitcoin', 2 * HOUR_MS, 4 * HOUR_MS)
+
+        self.assertEqual(result, [(2 * HOUR_MS, 102.0), (3 * HOUR_MS, 103.0), (4 * HOUR_MS, 104.0)])
+
+    def test_query_downsampled(self):
+        """Test agrégation par intervalles (prix moyen)"""
+        # Un point toutes les 5 minutes pendant 2 heures
+        step = FIVE_MINUTES_MS
+        self.store.append('bitcoin', [[i * step, float(i)] for i in range(24)])
+
+        result = self.store.query('bitcoin', 0, 2 * HOUR_MS, bucket_ms=HOUR_MS)
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0], (0, 5.5))
+        self.assertEqual(result[1], (HOUR_MS, 17.5))
+
+    def test_missing_ranges(self):
+        """Test seules les plages manquantes sont à récupérer"""
+        self.assertEqual(self.store.missing_ranges('bitcoin', 0, 10 * HOUR_MS, HOUR_MS),
+                         [(0, 10 * HOUR_MS)])
+
+        self.store.mark_fetched('bitcoin', 4 * HOUR_MS, 8 * HOUR_MS, FIVE_MINUTES_MS)
+
+        self.assertEqual(self.store.missing_ranges('bitcoin', 0, 12 * HOUR_MS, HOUR_MS),
+                         [(0, 4 * HOUR_MS), (8 * HOUR_MS, 12 * HOUR_MS)])
+        self.assertEqual(self.store.missing_ranges('bitcoin', 4 * HOUR_MS, 8 * HOUR_MS + 10, HOUR_MS), [])
+
+        # Plages contiguës fusionnées ; un trou entre deux plages est à récupérer
+        self.store.mark_fetched('bitcoin', 8 * HOUR_MS, 9 * HOUR_MS, FIVE_MINUTES_MS)
+        self.store.mark_fetched('bitcoin', 11 * HOUR_MS, 12 * HOUR_MS, FIVE_MINUTES_MS)
+        self.assertEqual(self.store.missing_ranges('bitcoin', 4 * HOUR_MS, 12 * HOUR_MS, HOUR_MS),
+                         [(9 * HOUR_MS, 11 * HOUR_MS)])
+
+    def test_coarse_range_does_not_cover_finer_read(self):
+        """Test un an de points journaliers ne couvre pas un graphique 24h (pas plus fin)"""
+        now = 400 * 24 * HOUR_MS
+
+        def sync(start_ms, end_ms):
+            for range_start, range_end in self.store.missing_ranges('bitcoin', start_ms, end_ms, FIVE_MINUTES_MS):
+                self.store.append('bitcoin', chart_points(range_start, range_end))
+                self.store.mark_fetched('bitcoin', range_start, range_end,
+                                        upstream_resolution_ms(range_end - range_start))
+
+        sync(now - 365 * 24 * HOUR_MS, now)
+        day_start = now - 24 * HOUR_MS
+        self.assertLessEqual(len(self.store.query('bitcoin', day_start, now)), 2)
+        self.assertEqual(self.store.missing_ranges('bitcoin', day_start, now, FIVE_MINUTES_MS), [(day_start, now)])
+
+        sync(day_start, now)
+        self.assertEqual(self.store.missing_ranges('bitcoin', day_start, now, FIVE_MINUTES_MS), [])
+        self.assertEqual(len(self.store.query('bitcoin', day_start, now - 1, bucket_ms=HOUR_MS)), 24)
+        # L'historique long reste couvert à son pas journalier
+        self.assertEqual(self.store.missing_ranges('bitcoin', now - 365 * 24 * HOUR_MS, now, HOUR_MS), [])
+
+    def test_query_series_matches_query(self):
+        """Test lecture en colonnes identique à la lecture par tuples"""
+        self.store.append('bitcoin', [[i * HOUR_MS, 100.0 + i] for i in range(10)])
+        series = self.store.query_series('bitcoin', 2 * HOUR_MS, 8 * HOUR_MS, bucket_ms=2 * HOUR_MS)
+        expected = self.store.query('bitcoin', 2 * HOUR_MS, 8 * HOUR_MS, bucket_ms=2 * HOUR_MS)
+        self.assertEqual(list(zip(series.timestamps.tolist(), series.prices.tolist())), expected)
+        self.assertEqual(len(self.store.query_series('ethereum', 0, HOUR_MS)), 0)
+
+    def test_bounds_empty(self):
+        """Test plage couverte vide"""
+        self.assertEqual(self.store.bounds('bitcoin'), (None, None))
+
+if __name__ == '__main__':
+    unittest.main()
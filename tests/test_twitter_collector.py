@@ -0,0 +1,148 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+import requests
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_upstream import TWEET_ID_BASE, UpstreamStub
+from utils.bloom import BloomFilter
+from utils.twitter_collector import TwitterCollector
+
+# Un tweet toutes les 1000 s : le flux simulé ne bouge pas pendant un test
+RATE = 0.001
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_membership(self):
+        """Test aucun faux négatif, doublon détecté, faux positifs rares"""
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+        self.assertTrue(all(bloom.add(TWEET_ID_BASE + i) for i in range(5000)))
+        self.assertFalse(bloom.add(TWEET_ID_BASE + 42))
+        self.assertIn(str(TWEET_ID_BASE + 42), bloom)
+        self.assertEqual(len(bloom), 5000)
+        false_positives = sum((TWEET_ID_BASE * 2 + i) in bloom for i in range(10_000))
+        self.assertLess(false_positives / 10_000, 0.01)
+        self.assertLess(bloom.nbytes, 10_000 * 10 / 8 + 1)
+
+    def test_save_and_load(self):
+        """Test enregistrement et relecture (avec l'état de l'appelant)"""
+        bloom = BloomFilter(capacity=1000)
+        bloom.add('a')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'seen.bloom')
+            bloom.save(path, {'since_id': '5'})
+            loaded, extra = BloomFilter.load(path)
+        self.assertIn('a', loaded)
+        self.assertNotIn('b', loaded)
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(extra, {'since_id': '5'})
+
+class TestTwitterCollector(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = UpstreamStub(tweet_rate=RATE).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+
+    def setUp(self):
+        # Flux de 51 tweets (n°0 à 50)
+        self.stub.tweet_epoch = time.time() - 50.5 / RATE
+        self.stub.requests.clear()
+        self.scored = []
+
+    def fetch_page(self, params):
+        response = requests.get(f'{self.stub.twitter_url}/tweets/search/recent', params=params, timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+    def score_batch(self, texts):
+        self.scored.extend(texts)
+        return [0.5] * len(texts)
+
+    def publish(self, count):
+        """Publie `count` nouveaux tweets dans le flux simulé"""
+        self.stub.tweet_epoch -= count / RATE
+
+    def collector(self, **kwargs):
+        options = {'max_results': 10, 'max_pages': 2, 'min_interval': 0}
+        options.update(kwargs)
+        return TwitterCollector(self.fetch_page, self.score_batch, ['bitcoin'], **options)
+
+    def test_first_poll_reads_one_page(self):
+        """Test premier passage : une seule page, les plus récents, triés"""
+        collector = self.collector()
+        self.assertEqual(collector.poll(), 10)
+        recent = collector.recent()
+        self.assertEqual(recent[0]['id'], str(TWEET_ID_BASE + 50))
+        self.assertEqual([int(t['id']) for t in recent], sorted((int(t['id']) for t in recent), reverse=True))
+        self.assertEqual(recent[0]['score'], 0.5)
+        self.assertEqual(self.stub.stats()['requests'], {'tweets': 1})
+
+    def test_only_new_tweets_fetched_and_scored(self):
+        """Test since_id : un passage sans nouveauté ne rapporte et ne score rien"""
+        collector = self.collector()
+        collector.poll()
+        self.assertEqual(collector.poll(), 0)
+        self.publish(3)
+        self.assertEqual(collector.poll(), 3)
+        self.assertEqual(len(self.scored), 13)
+        self.assertEqual(collector.recent(1)[0]['id'], str(TWEET_ID_BASE + 53))
+        stats = collector.stats()
+        self.assertEqual((stats['fetched'], stats['new'], stats['duplicates']), (13, 13, 0))
+
+    def test_backfill_resumes_with_next_token(self):
+        """Test rattrapage de 35 tweets en pages de 10, 2 pages par passage"""
+        collector = self.collector()
+        collector.poll()
+        self.publish(35)
+        self.assertEqual(collector.poll(), 20)
+        self.assertEqual(collector.stats()['backfilling'], 1)
+        self.assertEqual(collector.poll(), 15)
+        self.assertEqual(collector.stats()['backfilling'], 0)
+        self.publish(1)
+        self.assertEqual(collector.poll(), 1)
+        self.assertEqual(collector.stats()['duplicates'], 0)
+        ids = [int(t['id']) for t in collector.recent()]
+        self.assertEqual(ids, list(range(TWEET_ID_BASE + 86, TWEET_ID_BASE + 40, -1)))
+
+    def test_poll_if_due_limits_upstream_calls(self):
+        """Test un seul appel amont par intervalle, quel que soit le nombre de lectures"""
+        now = [0.0]
+        collector = self.collector(min_interval=15, clock=lambda: now[0])
+        for _ in range(5):
+            collector.poll_if_due()
+        self.assertEqual(self.stub.stats()['requests'], {'tweets': 1})
+        now[0] = 16
+        collector.poll_if_due()
+        self.assertEqual(self.stub.stats()['requests'], {'tweets': 2})
+
+    def test_duplicates_not_rescored(self):
+        """Test pages qui se chevauchent : les IDs déjà vus ne sont pas rescorés"""
+        page = {'data': [{'id': '1', 'text': 'a'}, {'id': '2', 'text': 'b'}], 'meta': {'newest_id': '2'}}
+        collector = TwitterCollector(lambda params: page, self.score_batch, ['bitcoin'], min_interval=0)
+        collector.poll()
+        collector._states['bitcoin'].since_id = None
+        self.assertEqual(collector.poll(), 0)
+        self.assertEqual(self.scored, ['a', 'b'])
+        self.assertEqual(collector.stats()['duplicates'], 2)
+
+    def test_state_persisted(self):
+        """Test curseurs et IDs vus relus au redémarrage"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'twitter.state')
+            self.collector(state_path=path).poll()
+            self.publish(2)
+            restarted = self.collector(state_path=path)
+            self.assertEqual(restarted.poll(), 2)
+        self.assertEqual(len(self.scored), 12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,273 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Seuils de la correspondance variation de prix -> sentiment (en %)
+SENTIMENT_THRESHOLD = 0.5
+SENTIMENT_CAP = 0.8
+
+# Poids d'EMA négligeables en dessous de ce seuil (troncature du noyau)
+EMA_WEIGHT_EPSILON = 1e-12
+
+
+def as_price_arrays(prices: Sequence[Sequence[float]]):
+    """
+    Convertit des points [ts_ms, prix] en deux tableaux NumPy
+
+    Args:
+        prices (Sequence): Points au format CoinGecko [[ts_ms, prix], ...]
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (horodatages en ms, prix)
+    """
+    data = np.asarray(prices, dtype=np.float64).reshape(-1, 2)
+    return data[:, 0], data[:, 1]
+
+
+def returns_pct(prices: np.ndarray) -> np.ndarray:
+    """
+    Variation en % entre points consécutifs (0 pour le premier point)
+
+    Args:
+        prices (np.ndarray): Série de prix
+
+    Returns:
+        np.ndarray: Variations en pourcentage, même longueur que `prices`
+    """
+    changes = np.zeros_like(prices, dtype=np.float64)
+    if prices.size > 1:
+        changes[1:] = (prices[1:] - prices[:-1]) / prices[:-1] * 100
+    return changes
+
+
+def price_sentiment(prices: np.ndarray) -> np.ndarray:
+    """
+    Sentiment dérivé de la tendance du prix (même correspondance que l'historique)
+
+    - hausse > 0.5 % : min(0.8, 0.2 + variation / 10)
+    - baisse < -0.5 % : max(-0.8, -0.2 + variation / 10)
+    - sinon : variation / 20 (neutre avec légère variation)
+
+    Args:
+        prices (np.ndarray): Série de prix
+
+    Returns:
+        np.ndarray: Score de sentiment par point (0 pour le premier)
+    """
+    change = returns_pct(prices)
+    return np.where(change > SENTIMENT_THRESHOLD,
+                    np.minimum(SENTIMENT_CAP, 0.2 + change / 10),
+                    np.where(change < -SENTIMENT_THRESHOLD,
+                             np.maximum(-SENTIMENT_CAP, -0.2 + change / 10),
+                             change / 20))
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Moyenne mobile simple (NaN tant que la fenêtre n'est pas remplie)
+
+    Args:
+        values (np.ndarray): Série
+        window (int): Taille de la fenêtre
+
+    Returns:
+        np.ndarray: SMA, même longueur que `values`
+    """
+    result = np.full(values.shape, np.nan)
+    if window < 1 or values.size < window:
+        return result
+    cumsum = np.cumsum(np.insert(values.astype(np.float64), 0, 0.0))
+    result[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    return result
+
+
+def ema(values: np.ndarray, span: Optional[int] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    Moyenne mobile exponentielle (forme "ajustée", sans boucle Python)
+
+    EMA_t = sum(w_k * x_{t-k}) / sum(w_k) avec w_k = (1 - alpha)^k. Le noyau
+    est tronqué quand les poids deviennent négligeables, ce qui permet un
+    calcul par convolution.
+
+    Args:
+        values (np.ndarray): Série
+        span (int): Période (alpha = 2 / (span + 1))
+        alpha (float): Facteur de lissage, prioritaire sur `span`
+
+    Returns:
+        np.ndarray: EMA, même longueur que `values`
+    """
+    if alpha is None:
+        alpha = 2.0 / (span + 1)
+    values = values.astype(np.float64)
+    if values.size == 0:
+        return values
+    decay = 1.0 - alpha
+    if decay <= 0:
+        return values.copy()
+    length = int(np.ceil(np.log(EMA_WEIGHT_EPSILON) / np.log(decay))) + 1
+    length = max(1, min(length, values.size))
+    weights = decay ** np.arange(length)
+    numerator = np.convolve(values, weights)[:values.size]
+    denominator = np.convolve(np.ones_like(values), weights)[:values.size]
+    return numerator / denominator
+
+
+def volatility(prices: np.ndarray, window: int = 24) -> np.ndarray:
+    """
+    Volatilité glissante : écart-type des variations (%) sur `window` points
+
+    Args:
+        prices (np.ndarray): Série de prix
+        window (int): Taille de la fenêtre
+
+    Returns:
+        np.ndarray: Volatilité, NaN tant que la fenêtre n'est pas remplie
+    """
+    changes = returns_pct(prices)
+    mean = sma(changes, window)
+    mean_sq = sma(changes * changes, window)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index (lissage de Wilder, alpha = 1 / période)
+
+    Args:
+        prices (np.ndarray): Série de prix
+        period (int): Période du RSI
+
+    Returns:
+        np.ndarray: RSI entre 0 et 100 (NaN pour les `period` premiers points)
+    """
+    result = np.full(prices.shape, np.nan)
+    if prices.size <= period:
+        return result
+    delta = np.diff(prices.astype(np.float64))
+    avg_gain = ema(np.clip(delta, 0, None), alpha=1.0 / period)
+    avg_loss = ema(np.clip(-delta, 0, None), alpha=1.0 / period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        values = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), 100 - 100 / (1 + rs))
+    result[period:] = values[period - 1:]
+    return result
+
+
+def _local_offsets(seconds: np.ndarray) -> np.ndarray:
+    """
+    Décalage UTC local (secondes) de chaque horodatage
+
+    Un appel à `localtime` par heure distincte (début et fin de l'heure) ;
+    les points d'une heure contenant un changement d'heure sont convertis
+    un par un. Quand les points sont plus espacés qu'une heure, conversion
+    directe de chaque point.
+    """
+    hours, inverse = np.unique(seconds // 3600, return_inverse=True)
+    if 2 * hours.size >= seconds.size:
+        return np.array([time.localtime(ts).tm_gmtoff for ts in seconds.tolist()], dtype=np.int64)
+    starts = (hours * 3600).tolist()
+    at_start = np.array([time.localtime(ts).tm_gmtoff for ts in starts], dtype=np.int64)
+    at_end = np.array([time.localtime(ts + 3599).tm_gmtoff for ts in starts], dtype=np.int64)
+    offsets = at_start[inverse]
+    for i in np.flatnonzero((at_start != at_end)[inverse]).tolist():
+        offsets[i] = time.localtime(int(seconds[i])).tm_gmtoff
+    return offsets
+
+
+def format_times(timestamps_ms: np.ndarray, time_format: str = '%H:%M') -> List[str]:
+    """
+    Formate des horodatages (heure locale) en une seule passe
+
+    Les formats '%H:%M' et '%d/%m %H:%M' sont traités par tableaux, avec le
+    décalage horaire propre à chaque point (une plage peut traverser un ou
+    plusieurs changements d'heure) ; les autres formats sont formatés point
+    par point.
+
+    Args:
+        timestamps_ms (np.ndarray): Horodatages en millisecondes
+        time_format (str): Format strftime
+
+    Returns:
+        List[str]: Heures formatées
+    """
+    if timestamps_ms.size == 0:
+        return []
+    if time_format not in ('%H:%M', '%d/%m %H:%M'):
+        return [datetime.fromtimestamp(ts).strftime(time_format) for ts in (timestamps_ms / 1000).tolist()]
+
+    # 'YYYY-MM-DDTHH:MM' pour chaque point, découpé caractère par caractère
+    seconds = np.floor(timestamps_ms / 1000).astype(np.int64)
+    local = (seconds + _local_offsets(seconds)).astype('datetime64[s]')
+    iso = np.datetime_as_string(local, unit='m').astype('U16')
+    chars = iso.view('U1').reshape(iso.size, 16)
+    if time_format == '%H:%M':
+        columns = chars[:, 11:16]
+    else:
+        separator = np.full((iso.size, 1), '/')
+        space = np.full((iso.size, 1), ' ')
+        columns = np.concatenate([chars[:, 8:10], separator, chars[:, 5:7], space, chars[:, 11:16]], axis=1)
+    return np.ascontiguousarray(columns).view(f'U{columns.shape[1]}').ravel().tolist()
+
+
+def history_points(prices: Sequence[Sequence[float]], time_format: str = '%H:%M') -> List[Dict]:
+    """
+    Points du graphique (heure, prix, sentiment) calculés par tableaux
+
+    Équivalent vectorisé de la boucle d'origine de `build_history_points`.
+
+    Args:
+        prices (Sequence): Points au format CoinGecko [[ts_ms, prix], ...]
+        time_format (str): Format strftime des heures
+
+    Returns:
+        List[Dict]: Points {'time', 'price', 'sentiment'}
+    """
+    timestamps, values = as_price_arrays(prices)
+    return points_from_arrays(timestamps, values, time_format)
+
+
+def points_from_arrays(timestamps: np.ndarray, values: np.ndarray, time_format: str = '%H:%M') -> List[Dict]:
+    """
+    Points du graphique à partir de colonnes déjà séparées (voir `history_points`)
+
+    Args:
+        timestamps (np.ndarray): Horodatages en millisecondes
+        values (np.ndarray): Prix
+        time_format (str): Format strftime des heures
+
+    Returns:
+        List[Dict]: Points {'time', 'price', 'sentiment'}
+    """
+    times = format_times(timestamps, time_format)
+    rounded_prices = np.round(values, 2).tolist()
+    sentiments = np.round(price_sentiment(values), 3).tolist()
+    return [{'time': t, 'price': p, 'sentiment': s} for t, p, s in zip(times, rounded_prices, sentiments)]
+
+
+def indicators(prices: Sequence[float], sma_window: int = 20, ema_span: int = 20,
+               volatility_window: int = 24, rsi_period: int = 14) -> Dict[str, List[Optional[float]]]:
+    """
+    Indicateurs techniques standards sur une série de prix
+
+    Args:
+        prices (Sequence[float]): Série de prix
+
+    Returns:
+        Dict[str, List]: SMA, EMA, volatilité et RSI (None là où non défini)
+    """
+    values = np.asarray(prices, dtype=np.float64)
+
+    def to_list(array: np.ndarray) -> List[Optional[float]]:
+        rounded = np.round(array, 4).astype(object)
+        rounded[np.isnan(array)] = None
+        return rounded.tolist()
+
+    return {
+        'sma': to_list(sma(values, sma_window)),
+        'ema': to_list(ema(values, span=ema_span)),
+        'volatility': to_list(volatility(values, volatility_window)),
+        'rsi': to_list(rsi(values, rsi_period))
+    }
@@ -0,0 +1,216 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Sens des positions par type de signal Telegram (alertes et infos ignorées)
+SIGNAL_DIRECTIONS = {'ACHAT': 1, 'VENTE': -1}
+
+# Données du processus de sweep (envoyées une fois par worker, pas à chaque tâche)
+_worker_data = None
+
+
+class EventLog:
+    """
+    Journal d'événements à rejouer, en colonnes triées par date
+
+    - horodatages en ms (int64)
+    - sens : +1 achat, -1 vente (int8)
+    - intensité entre 0 et 1 (confiance d'un signal, |score| d'un sentiment),
+      comparée au seuil du backtest
+    """
+
+    __slots__ = ('timestamps', 'directions', 'strengths')
+
+    def __init__(self, timestamps: Sequence[int], directions: Sequence[int], strengths: Sequence[float]):
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        order = np.argsort(timestamps, kind='stable')
+        self.timestamps = timestamps[order]
+        self.directions = np.asarray(directions, dtype=np.int8)[order]
+        self.strengths = np.asarray(strengths, dtype=np.float64)[order]
+
+    @classmethod
+    def from_signals(cls, signals: Iterable[Dict]) -> 'EventLog':
+        """
+        Journal depuis des signaux de trading
+
+        Args:
+            signals (Iterable[Dict]): Signaux {'ts' (secondes Unix), 'signal_type',
+                'confidence_score' (0-100)} ; seuls les ACHAT/VENTE sont retenus
+
+        Returns:
+            EventLog: Événements triés par date
+        """
+        rows = [(int(signal['ts'] * 1000), SIGNAL_DIRECTIONS[signal['signal_type']],
+                 signal.get('confidence_score', 100) / 100)
+                for signal in signals if signal.get('signal_type') in SIGNAL_DIRECTIONS]
+        if not rows:
+            return cls([], [], [])
+        timestamps, directions, strengths = zip(*rows)
+        return cls(timestamps, directions, strengths)
+
+    @classmethod
+    def from_sentiment(cls, timestamps: np.ndarray, scores: np.ndarray) -> 'EventLog':
+        """
+        Journal depuis une série de scores de sentiment (un événement par point non nul)
+
+        Args:
+            timestamps (np.ndarray): Horodatages en ms
+            scores (np.ndarray): Scores entre -1 et 1 (sens = signe, intensité = valeur absolue)
+
+        Returns:
+            EventLog: Événements triés par date
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        mask = scores != 0
+        return cls(np.asarray(timestamps)[mask], np.sign(scores[mask]), np.abs(scores[mask]))
+
+    def __len__(self) -> int:
+        return self.timestamps.size
+
+
+def trade_returns(timestamps: np.ndarray, prices: np.ndarray, events: EventLog,
+                  horizon_ms: int) -> np.ndarray:
+    """
+    Rendement de chaque événement tenu `horizon_ms` (NaN si la série ne le couvre pas)
+
+    L'entrée se fait au premier prix connu à la date de l'événement ou après,
+    la sortie au premier prix à `horizon_ms` plus tard : pas de regard vers
+    le futur. Les événements antérieurs à la série sont ignorés. Les deux
+    index sont trouvés par recherche dichotomique sur toute la série à la fois.
+
+    Args:
+        timestamps (np.ndarray): Horodatages de la série (ms, croissants)
+        prices (np.ndarray): Prix
+        events (EventLog): Événements à rejouer
+        horizon_ms (int): Durée de détention
+
+    Returns:
+        np.ndarray: Rendement (fraction, dans le sens de la position) par événement
+    """
+    returns = np.full(len(events), np.nan)
+    if not len(events) or not timestamps.size:
+        return returns
+    entry = np.searchsorted(timestamps, events.timestamps, side='left')
+    exit_ = np.searchsorted(timestamps, events.timestamps + horizon_ms, side='left')
+    valid = (exit_ < timestamps.size) & (events.timestamps >= timestamps[0])
+    entry, exit_ = entry[valid], exit_[valid]
+    returns[valid] = events.directions[valid] * (prices[exit_] / prices[entry] - 1)
+    return returns
+
+
+def summarize(returns: np.ndarray) -> Dict:
+    """
+    Statistiques d'une suite de trades (dans l'ordre chronologique)
+
+    La courbe de capital suppose chaque trade pris avec tout le capital, à la
+    suite ; elle est cumulée en logarithme pour rester stable sur des
+    centaines de milliers de trades.
+
+    Args:
+        returns (np.ndarray): Rendements des trades (fractions)
+
+    Returns:
+        Dict: trades, hit_rate, mean_return_pct, total_return_pct, max_drawdown_pct
+    """
+    if not returns.size:
+        return {'trades': 0, 'hit_rate': None, 'mean_return_pct': None,
+                'total_return_pct': 0.0, 'max_drawdown_pct': 0.0}
+    log_equity = np.cumsum(np.log1p(np.maximum(returns, -0.999999)))
+    peak = np.maximum.accumulate(np.maximum(log_equity, 0.0))
+    return {
+        'trades': int(returns.size),
+        'hit_rate': round(float(np.mean(returns > 0)), 4),
+        'mean_return_pct': round(float(np.mean(returns)) * 100, 4),
+        'total_return_pct': round(float(np.expm1(log_equity[-1])) * 100, 4),
+        'max_drawdown_pct': round(float(1 - np.exp(np.min(log_equity - peak))) * 100, 4)
+    }
+
+
+def backtest(timestamps: np.ndarray, prices: np.ndarray, events: EventLog, horizon_minutes: float,
+             min_strength: float = 0.0, fee_pct: float = 0.0) -> Dict:
+    """
+    Rejoue les événements sur une série de prix
+
+    Args:
+        timestamps (np.ndarray): Horodatages de la série (ms, croissants)
+        prices (np.ndarray): Prix
+        events (EventLog): Événements à rejouer
+        horizon_minutes (float): Durée de détention de chaque position
+        min_strength (float): Intensité minimale d'un événement pour être joué
+        fee_pct (float): Frais aller-retour par trade, en %
+
+    Returns:
+        Dict: Paramètres et statistiques (voir `summarize`)
+    """
+    returns = trade_returns(timestamps, prices, events, int(horizon_minutes * 60_000))
+    return _evaluate(returns, events.strengths, horizon_minutes, min_strength, fee_pct)
+
+
+def _evaluate(returns: np.ndarray, strengths: np.ndarray, horizon_minutes: float,
+              min_strength: float, fee_pct: float) -> Dict:
+    selected = returns[(strengths >= min_strength) & ~np.isnan(returns)] - fee_pct / 100
+    result = {'horizon_minutes': horizon_minutes, 'min_strength': min_strength, 'fee_pct': fee_pct}
+    result.update(summarize(selected))
+    return result
+
+
+def _horizon_results(timestamps: np.ndarray, prices: np.ndarray, events: EventLog, horizon_minutes: float,
+                     thresholds: Sequence[float], fee_pct: float) -> List[Dict]:
+    """Toutes les combinaisons d'un horizon : les rendements sont calculés une seule fois"""
+    returns = trade_returns(timestamps, prices, events, int(horizon_minutes * 60_000))
+    return [_evaluate(returns, events.strengths, horizon_minutes, threshold, fee_pct)
+            for threshold in thresholds]
+
+
+def _init_worker(timestamps: np.ndarray, prices: np.ndarray, events: EventLog) -> None:
+    global _worker_data
+    _worker_data = (timestamps, prices, events)
+
+
+def _sweep_horizon(horizon_minutes: float, thresholds: Sequence[float], fee_pct: float) -> List[Dict]:
+    """Tâche du pool : un horizon, sur les données reçues à l'initialisation du processus"""
+    return _horizon_results(*_worker_data, horizon_minutes, thresholds, fee_pct)
+
+
+def sweep(timestamps: np.ndarray, prices: np.ndarray, events: EventLog, horizons: Sequence[float],
+          thresholds: Sequence[float] = (0.0,), fee_pct: float = 0.0, processes: int = 0) -> List[Dict]:
+    """
+    Backtest de chaque combinaison (horizon, seuil d'intensité)
+
+    Chaque horizon est une tâche : les rendements de tous les événements sont
+    calculés en une passe vectorisée, puis filtrés pour chaque seuil. Avec
+    `processes` > 0, les horizons sont répartis sur un pool de processus ; la
+    série et le journal ne sont transmis qu'une fois par processus.
+
+    Args:
+        timestamps (np.ndarray): Horodatages de la série (ms, croissants)
+        prices (np.ndarray): Prix
+        events (EventLog): Événements à rejouer
+        horizons (Sequence[float]): Durées de détention, en minutes
+        thresholds (Sequence[float]): Intensités minimales
+        fee_pct (float): Frais aller-retour par trade, en %
+        processes (int): Taille du pool (0 : dans le processus courant)
+
+    Returns:
+        List[Dict]: Un résultat par combinaison, horizon par horizon
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    thresholds = list(thresholds)
+    if processes <= 0 or len(horizons) < 2:
+        results = [_horizon_results(timestamps, prices, events, horizon, thresholds, fee_pct)
+                   for horizon in horizons]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(processes, len(horizons)),
+                                 initializer=_init_worker, initargs=(timestamps, prices, events)) as pool:
+            results = list(pool.map(_sweep_horizon, horizons,
+                                    [thresholds] * len(horizons), [fee_pct] * len(horizons)))
+    return [result for horizon_results in results for result in horizon_results]
+
+
+def best(results: List[Dict], key: str = 'total_return_pct', min_trades: int = 1) -> Optional[Dict]:
+    """Meilleure combinaison d'un sweep selon `key` (parmi celles ayant au moins `min_trades` trades)"""
+    candidates = [result for result in results
+                  if result['trades'] >= min_trades and result[key] is not None]
+    return max(candidates, key=lambda result: result[key]) if candidates else None
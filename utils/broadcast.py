@@ -0,0 +1,168 @@
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from utils import metrics
+
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    """
+    Formate un message Server-Sent Events
+
+    Args:
+        data (Any): Contenu sérialisé en JSON
+        event (str): Nom de l'événement (champ `event:`)
+        event_id (int): Identifiant de l'événement (champ `id:`)
+
+    Returns:
+        str: Message SSE terminé par une ligne vide
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    payload = json.dumps(data, separators=(',', ':'))
+    lines.extend(f'data: {line}' for line in payload.splitlines())
+    return '\n'.join(lines) + '\n\n'
+
+
+class Broadcaster:
+    """
+    Diffusion d'événements à tous les abonnés depuis un producteur unique
+
+    Un seul thread producteur interroge les données à intervalle régulier et
+    ne publie que les changements : 1 000 dashboards ouverts coûtent un seul
+    appel amont par intervalle. Chaque abonné a une file bornée ; un abonné
+    trop lent perd ses plus vieux messages au lieu de bloquer les autres.
+    """
+
+    def __init__(self, producers: Dict[str, Callable[[], Any]], interval: float = 10,
+                 queue_size: int = 32):
+        self._producers = producers
+        self.interval = interval
+        self._queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._last: Dict[str, Any] = {}
+        self._last_messages: Dict[str, str] = {}
+        self._sequence = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self) -> 'queue.Queue[str]':
+        """Ajoute un abonné (démarre le producteur au premier abonnement)"""
+        q: 'queue.Queue[str]' = queue.Queue(maxsize=self._queue_size)
+        with self._lock:
+            # Le nouvel abonné reçoit immédiatement le dernier état connu
+            for message in self._last_messages.values():
+                q.put_nowait(message)
+            self._subscribers.add(q)
+        self.start()
+        return q
+
+    def unsubscribe(self, q: 'queue.Queue[str]') -> None:
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Envoie un événement à tous les abonnés"""
+        with self._lock:
+            self._sequence += 1
+            message = format_sse(data, event=event, event_id=self._sequence)
+            self._last_messages[event] = message
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(message)
+            except queue.Full:
+                # Abonné trop lent : on sacrifie le plus vieux message
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+                self.dropped += 1
+                q.put_nowait(message)
+        self.published += 1
+
+    def produce_once(self) -> int:
+        """Interroge les producteurs et publie les valeurs modifiées ; retourne le nombre publié"""
+        count = 0
+        for event, producer in self._producers.items():
+            try:
+                value = producer()
+            except Exception as e:
+                print(f"Erreur producteur {event}: {e}")
+                metrics.record_error('broadcast')
+                continue
+            if value != self._last.get(event):
+                self._last[event] = value
+                self.publish(event, value)
+                count += 1
+        return count
+
+    def start(self) -> None:
+        """Démarre le thread producteur (sans effet s'il tourne déjà)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='sse-producer', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Arrête le thread producteur"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Pas d'appel amont tant que personne n'écoute
+            if self.subscriber_count():
+                self.produce_once()
+            self._stop.wait(self.interval)
+
+    def stream(self, keepalive: float = 15) -> Iterator[str]:
+        """
+        Générateur SSE pour un abonné (à passer à une réponse Flask en streaming)
+
+        Args:
+            keepalive (float): Intervalle des commentaires de maintien de connexion
+
+        Yields:
+            str: Messages SSE
+        """
+        q = self.subscribe()
+        try:
+            yield f'retry: {int(self.interval * 1000)}\n\n'
+            while True:
+                try:
+                    yield q.get(timeout=keepalive)
+                except queue.Empty:
+                    yield f': keep-alive {int(time.time())}\n\n'
+        finally:
+            self.unsubscribe(q)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def stats(self) -> Dict:
+        """
+        Retourne les compteurs de diffusion
+
+        Returns:
+            Dict: Abonnés, événements publiés et messages abandonnés
+        """
+        return {
+            'subscribers': self.subscriber_count(),
+            'published': self.published,
+            'dropped': self.dropped,
+            'interval': self.interval
+        }
@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def make_cache_key(endpoint: str, coin_id: str, params: Optional[Dict] = None) -> Tuple:
+    """
+    Construit une clé de cache stable à partir d'un appel API
+
+    Args:
+        endpoint (str): Nom logique de l'endpoint (ex: 'coin', 'market_chart')
+        coin_id (str): ID de la crypto sur CoinGecko
+        params (Dict): Paramètres de la requête (l'ordre n'a pas d'importance)
+
+    Returns:
+        Tuple: Clé hashable (endpoint, coin_id, params triés)
+    """
+    items = tuple(sorted((params or {}).items()))
+    return (endpoint, coin_id, items)
+
+
+class TTLCache:
+    """
+    Cache LRU borné avec une durée de vie (TTL) par entrée
+
+    Les entrées expirées sont retirées à la lecture (après leur éventuelle
+    fenêtre stale-while-revalidate) ; quand la taille maximale
+    est atteinte, l'entrée la moins récemment utilisée est évincée.
+    Thread-safe : peut être partagé entre les threads du serveur Flask.
+    """
+
+    def __init__(self, max_size: int = 256, default_ttl: float = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size doit être >= 1")
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._data: 'OrderedDict[Hashable, Tuple[Any, float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retourne la valeur associée à la clé si elle est encore valide
+
+        Args:
+            key (Hashable): Clé de cache
+            default (Any): Valeur retournée en cas d'absence ou d'expiration
+
+        Returns:
+            Any: Valeur en cache ou `default`
+        """
+        entry = self.get_entry(key)
+        if entry is None or not entry[1]:
+            return default
+        return entry[0]
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """
+        Retourne la valeur et sa fraîcheur, y compris pendant la fenêtre "stale"
+
+        Une entrée expirée mais encore dans sa fenêtre `stale_ttl` est
+        retournée avec `fresh=False` (stale-while-revalidate).
+
+        Args:
+            key (Hashable): Clé de cache
+
+        Returns:
+            Optional[Tuple[Any, bool]]: (valeur, fresh) ou None si absente
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, stale_until = entry
+            now = self._clock()
+            if now >= stale_until:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            if now >= expires_at:
+                self.misses += 1
+                self.stale_hits += 1
+                return value, False
+
+            self.hits += 1
+            return value, True
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            stale_ttl: float = 0) -> None:
+        """
+        Enregistre une valeur avec son TTL (en secondes)
+
+        Args:
+            key (Hashable): Clé de cache
+            value (Any): Valeur à mettre en cache
+            ttl (float): Durée de vie ; `default_ttl` si non précisée
+            stale_ttl (float): Durée supplémentaire pendant laquelle la valeur
+                expirée reste servie en attendant son rafraîchissement
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            expires_at = self._clock() + ttl
+            self._data[key] = (value, expires_at, expires_at + stale_ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Supprime une entrée ; retourne True si elle existait"""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Vide le cache (les compteurs sont conservés)"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        """
+        Retourne les compteurs du cache
+
+        Returns:
+            Dict: Taille, hits, misses, évictions, expirations et hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and self._clock() < entry[1]
@@ -0,0 +1,389 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import urlencode
+
+from utils.cache import TTLCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# En-tête d'une entrée sérialisée : format, fin de fraîcheur, fin de la fenêtre stale (epoch)
+ENTRY_HEADER = struct.Struct('<Bdd')
+RAW, COMPRESSED = 0, 1
+
+# Les valeurs plus grandes que ce seuil sont compressées (zlib)
+COMPRESS_THRESHOLD = 1024
+
+
+def key_to_str(key: Hashable) -> str:
+    """
+    Représentation texte stable d'une clé (celles de `make_cache_key` en priorité)
+
+    Args:
+        key (Hashable): Clé de cache
+
+    Returns:
+        str: Ex. 'coin:bitcoin:localization=false&tickers=false'
+    """
+    if isinstance(key, tuple) and len(key) == 3 and isinstance(key[2], tuple):
+        endpoint, coin_id, items = key
+        return f"{endpoint}:{coin_id}:{urlencode(items)}"
+    if isinstance(key, tuple):
+        return ':'.join(str(part) for part in key)
+    return str(key)
+
+
+def dumps(value: Any, expires_at: float, stale_until: float) -> bytes:
+    """Sérialise une valeur JSON compacte (compressée au-delà du seuil) avec ses échéances"""
+    payload = orjson.dumps(value) if orjson is not None else \
+        json.dumps(value, separators=(',', ':')).encode('utf-8')
+    flag = RAW
+    if len(payload) > COMPRESS_THRESHOLD:
+        payload = zlib.compress(payload, 6)
+        flag = COMPRESSED
+    return ENTRY_HEADER.pack(flag, expires_at, stale_until) + payload
+
+
+def loads(data: bytes) -> Tuple[Any, float, float]:
+    """Inverse de `dumps` : (valeur, fin de fraîcheur, fin de la fenêtre stale)"""
+    flag, expires_at, stale_until = ENTRY_HEADER.unpack_from(data, 0)
+    payload = data[ENTRY_HEADER.size:]
+    if flag == COMPRESSED:
+        payload = zlib.decompress(payload)
+    value = orjson.loads(payload) if orjson is not None else json.loads(payload)
+    return value, expires_at, stale_until
+
+
+class SerializedCache:
+    """
+    Base des caches partagés (fichiers, Redis) : même interface que `TTLCache`
+
+    Les valeurs sont sérialisées en JSON compact avec leurs échéances
+    (horloge murale, commune à tous les processus et serveurs) ; le stockage
+    sous-jacent conserve l'entrée pendant `ttl + stale_ttl` puis la supprime.
+    Les erreurs du stockage sont comptées et traitées comme des absences :
+    le cache ne doit jamais faire échouer une page.
+    """
+
+    backend = 'base'
+
+    def __init__(self, default_ttl: float = 60, clock: Callable[[], float] = time.time):
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.expirations = 0
+        self.errors = 0
+
+    # --- Stockage (à implémenter) ---
+
+    def _read(self, skey: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _write(self, skey: str, data: bytes, lifetime: float) -> None:
+        raise NotImplementedError
+
+    def _remove(self, skey: str) -> bool:
+        raise NotImplementedError
+
+    def _clear(self) -> None:
+        raise NotImplementedError
+
+    def _size(self) -> Optional[int]:
+        return None
+
+    def acquire(self, key: Hashable, ttl: float) -> bool:
+        """Verrou de remplissage partagé (un seul appel amont par clé)"""
+        raise NotImplementedError
+
+    def release(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    # --- Interface commune ---
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Valeur fraîche associée à la clé, sinon `default`"""
+        entry = self.get_entry(key)
+        if entry is None or not entry[1]:
+            return default
+        return entry[0]
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """
+        Retourne la valeur et sa fraîcheur, y compris pendant la fenêtre "stale"
+
+        Args:
+            key (Hashable): Clé de cache
+
+        Returns:
+            Optional[Tuple[Any, bool]]: (valeur, fresh) ou None si absente
+        """
+        try:
+            data = self._read(key_to_str(key))
+            entry = loads(data) if data is not None else None
+        except Exception as e:
+            print(f"Erreur cache ({self.backend}) : {e}")
+            self._count('errors')
+            entry = None
+
+        if entry is None:
+            self._count('misses')
+            return None
+
+        value, expires_at, stale_until = entry
+        now = self._clock()
+        if now >= stale_until:
+            self.delete(key)
+            self._count('expirations')
+            self._count('misses')
+            return None
+        if now >= expires_at:
+            self._count('misses')
+            self._count('stale_hits')
+            return value, False
+
+        self._count('hits')
+        return value, True
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            stale_ttl: float = 0) -> None:
+        """
+        Enregistre une valeur avec son TTL (en secondes)
+
+        Args:
+            key (Hashable): Clé de cache
+            value (Any): Valeur sérialisable en JSON
+            ttl (float): Durée de vie ; `default_ttl` si non précisée
+            stale_ttl (float): Durée supplémentaire pendant laquelle la valeur
+                expirée reste servie en attendant son rafraîchissement
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl
+        try:
+            self._write(key_to_str(key), dumps(value, expires_at, expires_at + stale_ttl), ttl + stale_ttl)
+        except Exception as e:
+            print(f"Erreur cache ({self.backend}) : {e}")
+            self._count('errors')
+
+    def delete(self, key: Hashable) -> bool:
+        """Supprime une entrée ; retourne True si elle existait"""
+        try:
+            return self._remove(key_to_str(key))
+        except Exception as e:
+            print(f"Erreur cache ({self.backend}) : {e}")
+            self._count('errors')
+            return False
+
+    def clear(self) -> None:
+        """Vide le cache (les compteurs sont conservés)"""
+        self._clear()
+
+    def stats(self) -> Dict:
+        """
+        Retourne les compteurs du cache
+
+        Returns:
+            Dict: Backend, taille, hits, misses, expirations, erreurs et hit ratio
+        """
+        try:
+            size = self._size()
+        except Exception:
+            size = None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': self.backend,
+                'size': size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'expirations': self.expirations,
+                'errors': self.errors,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return self._size() or 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        try:
+            data = self._read(key_to_str(key))
+        except Exception:
+            return False
+        return data is not None and self._clock() < loads(data)[1]
+
+
+class FileSystemCache(SerializedCache):
+    """
+    Cache sur disque : un fichier par clé (nom haché), écriture atomique
+
+    Partageable entre les workers d'un même serveur (répertoire commun).
+    """
+
+    backend = 'filesystem'
+
+    def __init__(self, directory: str, default_ttl: float = 60, clock: Callable[[], float] = time.time):
+        super().__init__(default_ttl, clock)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, skey: str, suffix: str = '.cache') -> str:
+        return os.path.join(self.directory, hashlib.blake2b(skey.encode('utf-8'), digest_size=16).hexdigest() + suffix)
+
+    def _read(self, skey: str) -> Optional[bytes]:
+        try:
+            with open(self._path(skey), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, skey: str, data: bytes, lifetime: float) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(skey))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _remove(self, skey: str) -> bool:
+        try:
+            os.remove(self._path(skey))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(('.cache', '.lock')):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def _size(self) -> int:
+        return sum(1 for name in os.listdir(self.directory) if name.endswith('.cache'))
+
+    def acquire(self, key: Hashable, ttl: float) -> bool:
+        path = self._path(key_to_str(key), '.lock')
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # Verrou abandonné (processus arrêté) : repris après son TTL
+            try:
+                if time.time() - os.path.getmtime(path) < ttl:
+                    return False
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return self.acquire(key, ttl)
+        os.close(fd)
+        return True
+
+    def release(self, key: Hashable) -> None:
+        try:
+            os.remove(self._path(key_to_str(key), '.lock'))
+        except FileNotFoundError:
+            pass
+
+
+class RedisCache(SerializedCache):
+    """
+    Cache Redis (ou compatible : KeyDB, Valkey, fakeredis) partagé entre serveurs
+
+    Les entrées expirent côté Redis après `ttl + stale_ttl` ; le verrou de
+    remplissage (`SET NX PX`) garantit qu'un seul serveur interroge l'API
+    amont pour une clé donnée.
+    """
+
+    backend = 'redis'
+
+    def __init__(self, client, prefix: str = 'crypto-saas:', default_ttl: float = 60,
+                 clock: Callable[[], float] = time.time):
+        super().__init__(default_ttl, clock)
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'RedisCache':
+        """Construit le cache depuis une URL redis:// (dépendance optionnelle `redis`)"""
+        import redis
+        return cls(redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1), **kwargs)
+
+    def _read(self, skey: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + skey)
+
+    def _write(self, skey: str, data: bytes, lifetime: float) -> None:
+        self.client.set(self.prefix + skey, data, px=max(1, int(lifetime * 1000)))
+
+    def _remove(self, skey: str) -> bool:
+        return bool(self.client.delete(self.prefix + skey))
+
+    def _clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + '*', count=500))
+        if keys:
+            self.client.delete(*keys)
+
+    def _size(self) -> int:
+        return sum(1 for key in self.client.scan_iter(match=self.prefix + '*', count=500)
+                   if not key.startswith((self.prefix + 'lock:').encode('utf-8')))
+
+    def acquire(self, key: Hashable, ttl: float) -> bool:
+        try:
+            return bool(self.client.set(self.prefix + 'lock:' + key_to_str(key), b'1',
+                                        nx=True, px=max(1, int(ttl * 1000))))
+        except Exception as e:
+            print(f"Erreur cache ({self.backend}) : {e}")
+            self._count('errors')
+            return True
+
+    def release(self, key: Hashable) -> None:
+        try:
+            self.client.delete(self.prefix + 'lock:' + key_to_str(key))
+        except Exception:
+            pass
+
+
+def build_cache(backend: str = 'memory', max_size: int = 256, default_ttl: float = 60,
+                directory: Optional[str] = None, redis_url: Optional[str] = None,
+                prefix: str = 'crypto-saas:'):
+    """
+    Construit le cache selon le backend configuré
+
+    Args:
+        backend (str): 'memory', 'filesystem' ou 'redis'
+        max_size (int): Taille maximale (backend mémoire)
+        default_ttl (float): TTL par défaut
+        directory (str): Répertoire du backend fichiers
+        redis_url (str): URL du backend Redis
+        prefix (str): Préfixe des clés Redis
+
+    Returns:
+        TTLCache | SerializedCache: Cache avec l'interface de `TTLCache`
+    """
+    if backend == 'memory':
+        return TTLCache(max_size=max_size, default_ttl=default_ttl)
+    if backend == 'filesystem':
+        return FileSystemCache(directory or os.path.join(tempfile.gettempdir(), 'crypto-saas-cache'),
+                               default_ttl=default_ttl)
+    if backend == 'redis':
+        return RedisCache.from_url(redis_url or 'redis://localhost:6379/0', prefix=prefix,
+                                   default_ttl=default_ttl)
+    raise ValueError(f"Backend de cache inconnu : {backend}")
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict
+
+import requests
+
+# États du disjoncteur (codes exportés dans /metrics)
+CLOSED = 'closed'        # appels normaux, taux d'échec surveillé
+OPEN = 'open'            # appels refusés immédiatement : servir le cache ou un fallback
+HALF_OPEN = 'half_open'  # quelques appels d'essai décident de la réouverture
+STATE_CODES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+
+class CircuitOpen(requests.RequestException):
+    """Disjoncteur ouvert pour cet hôte : servir le cache ou un fallback sans attendre"""
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur par amont (fermé / ouvert / semi-ouvert)
+
+    En état fermé, l'issue des `window` derniers appels est gardée : dès que
+    `min_calls` appels sont connus et que la part d'échecs atteint
+    `failure_threshold`, le disjoncteur s'ouvre. Ouvert, il refuse tout appel
+    (l'appelant sert sa dernière valeur connue ou son fallback, sans subir
+    de timeout). Après `open_seconds`, il passe semi-ouvert et laisse passer
+    au plus `half_open_calls` appels d'essai : un succès le referme, un échec
+    le rouvre pour une durée doublée à chaque réouverture consécutive
+    (plafonnée à `max_open_seconds`).
+    """
+
+    def __init__(self, failure_threshold: float = 0.5, min_calls: int = 5, window: int = 20,
+                 open_seconds: float = 30, max_open_seconds: float = 300, half_open_calls: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        if not 0 < failure_threshold <= 1:
+            raise ValueError("failure_threshold doit être dans ]0, 1]")
+        self.failure_threshold = failure_threshold
+        self.min_calls = max(1, min_calls)
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max(open_seconds, max_open_seconds)
+        self.half_open_calls = max(1, half_open_calls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[bool] = deque(maxlen=max(window, self.min_calls))
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._open_for = open_seconds
+        self._reopenings = 0
+        self._probes = 0
+        self._counters = {'opened': 0, 'rejected': 0, 'successes': 0, 'failures': 0}
+
+    @classmethod
+    def from_env(cls, prefix: str) -> 'CircuitBreaker':
+        """Construit le disjoncteur depuis les variables `<PREFIX>_BREAKER_*`"""
+        return cls(failure_threshold=float(os.getenv(f'{prefix}_BREAKER_FAILURE_RATE', 0.5)),
+                   min_calls=int(os.getenv(f'{prefix}_BREAKER_MIN_CALLS', 5)),
+                   window=int(os.getenv(f'{prefix}_BREAKER_WINDOW', 20)),
+                   open_seconds=float(os.getenv(f'{prefix}_BREAKER_OPEN_SECONDS', 30)),
+                   max_open_seconds=float(os.getenv(f'{prefix}_BREAKER_MAX_OPEN_SECONDS', 300)))
+
+    def _refresh_state(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self._open_for:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    def _open(self) -> None:
+        self._open_for = min(self.max_open_seconds, self.open_seconds * (2 ** self._reopenings))
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._counters['opened'] += 1
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Indique si un appel peut partir (réserve un essai en état semi-ouvert)
+
+        Returns:
+            bool: False si le disjoncteur est ouvert, ou semi-ouvert avec
+                tous ses appels d'essai déjà en cours
+        """
+        with self._lock:
+            self._refresh_state()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return True
+            self._counters['rejected'] += 1
+            return False
+
+    def release(self) -> None:
+        """Rend un essai réservé par `allow` sans issue à enregistrer (appel abandonné)"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record(self, success: bool) -> None:
+        """Enregistre l'issue d'un appel autorisé par `allow`"""
+        with self._lock:
+            self._counters['successes' if success else 'failures'] += 1
+            if self._state == HALF_OPEN:
+                if success:
+                    self._state = CLOSED
+                    self._reopenings = 0
+                    self._outcomes.clear()
+                else:
+                    self._reopenings += 1
+                    self._open()
+                return
+            if self._state == OPEN:
+                # Appel parti avant l'ouverture : son issue ne change rien
+                return
+            self._outcomes.append(success)
+            if len(self._outcomes) >= self.min_calls and self._failure_rate() >= self.failure_threshold:
+                self._open()
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def stats(self) -> Dict:
+        """
+        Retourne l'état et les compteurs du disjoncteur
+
+        Returns:
+            Dict: État (et son code), taux d'échec de la fenêtre, secondes
+                avant le prochain essai, ouvertures, appels refusés, succès et échecs
+        """
+        with self._lock:
+            self._refresh_state()
+            retry_in = max(0.0, self._opened_at + self._open_for - self._clock()) if self._state == OPEN else 0.0
+            return dict(self._counters,
+                        state=self._state,
+                        state_code=STATE_CODES[self._state],
+                        failure_rate=round(self._failure_rate(), 3),
+                        retry_in=round(retry_in, 3))
@@ -1,5 +1,6 @@
 import requests
-from typing import Dict, Optional
+from utils import http_client
+from typing import Dict, List, Optional, Tuple
 
 def get_crypto_data(crypto_id: str = 'bitcoin') -> Dict:
     """
@@ -11,10 +12,10 @@ def get_crypto_data(crypto_id: str = 'bitcoin') -> Dict:
     Returns:
         Dict: Données de la cryptomonnaie (nom, prix, variation)
     """
-    url = f"https://api.coingecko.com/api/v3/simple/price?ids={crypto_id}&vs_currencies=usd&include_24hr_change=true"
+    url = f"{http_client.COINGECKO_API_URL}/simple/price?ids={crypto_id}&vs_currencies=usd&include_24hr_change=true"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -63,6 +64,34 @@ def get_crypto_data(crypto_id: str = 'bitcoin') -> Dict:
             'image': None
         }
 
+# Nombre maximal d'IDs par appel /simple/price (limite de longueur d'URL côté CoinGecko)
+MAX_IDS_PER_REQUEST = 250
+
+def chunk_ids(crypto_ids: List[str], chunk_size: int = MAX_IDS_PER_REQUEST) -> List[List[str]]:
+    """
+    Découpe une liste d'IDs en lots pour minimiser le nombre d'appels API
+
+    Args:
+        crypto_ids (list): Liste des IDs des cryptos (les doublons sont ignorés)
+        chunk_size (int): Nombre maximal d'IDs par appel
+
+    Returns:
+        List[List[str]]: Lots d'IDs, dans l'ordre d'origine
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size doit être >= 1")
+    unique_ids = list(dict.fromkeys(crypto_id for crypto_id in crypto_ids if crypto_id))
+    return [unique_ids[i:i + chunk_size] for i in range(0, len(unique_ids), chunk_size)]
+
+def _fetch_simple_price(crypto_ids: List[str]) -> Dict:
+    """Appel /simple/price pour un lot d'IDs ; lève une exception en cas d'échec"""
+    crypto_string = ','.join(crypto_ids)
+    url = f"{http_client.COINGECKO_API_URL}/simple/price?ids={crypto_string}&vs_currencies=usd&include_24hr_change=true"
+    
+    response = http_client.get(url, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
 def get_multiple_cryptos(crypto_ids: list) -> Dict:
     """
     Récupère les données de plusieurs cryptomonnaies
@@ -73,14 +102,44 @@ def get_multiple_cryptos(crypto_ids: list) -> Dict:
     Returns:
         Dict: Données de toutes les cryptomonnaies
     """
-    crypto_string = ','.join(crypto_ids)
-    url = f"https://api.coingecko.com/api/v3/simple/price?ids={crypto_string}&vs_currencies=usd&include_24hr_change=true"
-    
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return _fetch_simple_price(crypto_ids)
     
-    except requests.RequestException as e:
+    except Exception as e:
         print(f"Erreur API : {e}")
-        return {}
\ No newline at end of file
+        return {}
+
+def fetch_prices_batch(crypto_ids: List[str], chunk_size: int = MAX_IDS_PER_REQUEST) -> Tuple[Dict, Dict]:
+    """
+    Récupère les prix d'une liste arbitraire d'IDs en un minimum d'appels
+    
+    Les IDs sont découpés en lots de `chunk_size` ; l'échec d'un lot ou
+    l'absence d'une crypto dans la réponse est signalé par crypto, sans
+    invalider les autres résultats.
+    
+    Args:
+        crypto_ids (list): Liste des IDs des cryptos
+        chunk_size (int): Nombre maximal d'IDs par appel
+    
+    Returns:
+        Tuple[Dict, Dict]: (prix par crypto, erreur par crypto)
+    """
+    results = {}
+    errors = {}
+    
+    for chunk in chunk_ids(crypto_ids, chunk_size):
+        try:
+            data = _fetch_simple_price(chunk)
+        except Exception as e:
+            print(f"Erreur API : {e}")
+            for crypto_id in chunk:
+                errors[crypto_id] = str(e)
+            continue
+        
+        for crypto_id in chunk:
+            if crypto_id in data and 'usd' in data[crypto_id]:
+                results[crypto_id] = data[crypto_id]
+            else:
+                errors[crypto_id] = f"Crypto '{crypto_id}' non trouvée"
+    
+    return results, errors
@@ -0,0 +1,60 @@
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils import metrics
+
+# Pool partagé pour les appels amont concurrents (indépendant des workers Flask)
+FANOUT_MAX_WORKERS = int(os.getenv('FANOUT_MAX_WORKERS', 16))
+_executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix='fanout')
+
+
+def fan_out(tasks: Dict[str, Tuple[Callable[[], Any], Callable[[], Any]]], timeout: float,
+            executor: Optional[ThreadPoolExecutor] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Exécute des sources de données indépendantes en parallèle avec une échéance commune
+
+    La latence totale devient celle de la source la plus lente (bornée par
+    `timeout`) au lieu de la somme des latences. Une source en erreur ou
+    non terminée à l'échéance est remplacée par son fallback ; une source en
+    retard continue en arrière-plan (et alimente le cache pour la suite).
+
+    Args:
+        tasks (Dict): nom -> (fonction, fallback), tous deux sans argument
+        timeout (float): Échéance globale en secondes
+        executor (ThreadPoolExecutor): Pool à utiliser (pool partagé par défaut)
+
+    Returns:
+        Tuple[Dict, Dict]: (résultat par nom, statut par nom : 'ok', 'error'
+        ou 'timeout')
+    """
+    executor = executor or _executor
+    started = time.monotonic()
+    # Chaque source s'exécute dans une copie du contexte (priorité des appels amont)
+    futures = {name: executor.submit(contextvars.copy_context().run, fn) for name, (fn, _) in tasks.items()}
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    status = {}
+    for name, future in futures.items():
+        fallback = tasks[name][1]
+        if not future.done():
+            future.cancel()
+            status[name] = 'timeout'
+            metrics.record_error('fanout_timeout')
+            results[name] = fallback()
+        elif future.exception() is not None:
+            print(f"Erreur source {name}: {future.exception()}")
+            metrics.record_error('fanout')
+            status[name] = 'error'
+            results[name] = fallback()
+        else:
+            status[name] = 'ok'
+            results[name] = future.result()
+
+    elapsed = time.monotonic() - started
+    if elapsed >= timeout:
+        print(f"Fan-out: échéance de {timeout}s atteinte ({status})")
+    return results, status
@@ -0,0 +1,278 @@
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import metrics
+from utils.circuit_breaker import CircuitBreaker, CircuitOpen
+from utils.rate_budget import BudgetExhausted, RateBudget
+
+# URLs de base des API externes (surchargeables, ex: serveur simulé local pour les benchmarks)
+COINGECKO_API_URL = os.getenv('COINGECKO_API_URL', 'https://api.coingecko.com/api/v3').rstrip('/')
+TWITTER_API_URL = os.getenv('TWITTER_API_URL', 'https://api.twitter.com/2').rstrip('/')
+
+# Codes HTTP pour lesquels une nouvelle tentative a du sens
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class HostConfig:
+    """Timeout par tentative et budget total (retries compris) pour un hôte"""
+
+    def __init__(self, timeout: float = 10, budget: float = 20):
+        self.timeout = timeout
+        self.budget = budget
+
+
+class HttpClient:
+    """
+    Client HTTP partagé par toutes les intégrations (CoinGecko, Twitter...)
+
+    - une session `requests` par hôte, avec pool de connexions keep-alive ;
+    - nouvelles tentatives sur 429/5xx et erreurs réseau, avec backoff
+      exponentiel à jitter complet (respecte `Retry-After` si présent) ;
+    - budget de temps par hôte : les retries s'arrêtent quand il est épuisé ;
+    - budget d'appels optionnel par hôte (token bucket à priorités) : chaque
+      tentative consomme un jeton, un appel sans jeton lève `BudgetExhausted` ;
+    - disjoncteur optionnel par hôte : quand l'amont échoue trop souvent, les
+      appels lèvent `CircuitOpen` immédiatement au lieu d'attendre le timeout ;
+    - compteurs de requêtes, retries et réutilisation des connexions.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20,
+                 max_retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 8,
+                 hosts: Optional[Dict[str, HostConfig]] = None,
+                 default_host: Optional[HostConfig] = None,
+                 budgets: Optional[Dict[str, RateBudget]] = None,
+                 breakers: Optional[Dict[str, CircuitBreaker]] = None,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hosts = dict(hosts or {})
+        self.default_host = default_host or HostConfig()
+        self.budgets = dict(budgets or {})
+        self.breakers = dict(breakers or {})
+        self._sleep = sleep
+        self._clock = clock
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_env(cls) -> 'HttpClient':
+        """Construit le client à partir des variables d'environnement"""
+        coingecko_host = urlsplit(COINGECKO_API_URL).netloc
+        twitter_host = urlsplit(TWITTER_API_URL).netloc
+        return cls(
+            pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', 10)),
+            pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', 20)),
+            max_retries=int(os.getenv('HTTP_MAX_RETRIES', 2)),
+            hosts={
+                coingecko_host: HostConfig(
+                    timeout=float(os.getenv('COINGECKO_TIMEOUT', 10)),
+                    budget=float(os.getenv('COINGECKO_TIMEOUT_BUDGET', 15))),
+                twitter_host: HostConfig(
+                    timeout=float(os.getenv('TWITTER_TIMEOUT', 10)),
+                    budget=float(os.getenv('TWITTER_TIMEOUT_BUDGET', 15)))
+            },
+            budgets={coingecko_host: RateBudget.from_env('COINGECKO')},
+            breakers={coingecko_host: CircuitBreaker.from_env('COINGECKO'),
+                      twitter_host: CircuitBreaker.from_env('TWITTER')}
+        )
+
+    def session_for(self, host: str) -> requests.Session:
+        """Retourne (en la créant si besoin) la session keep-alive d'un hôte"""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                                      pool_maxsize=self.pool_maxsize,
+                                      max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[host] = session
+                self._counters[host] = {'requests': 0, 'retries': 0, 'failures': 0, 'throttled': 0,
+                                        'short_circuited': 0}
+            return session
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None) -> requests.Response:
+        """
+        Requête GET avec retries et budget de temps de l'hôte
+
+        Args:
+            url (str): URL complète
+            params (Dict): Paramètres de requête
+            headers (Dict): En-têtes HTTP
+            timeout (float): Timeout par tentative (sinon celui de l'hôte)
+
+        Returns:
+            requests.Response: Dernière réponse reçue (éventuellement en erreur)
+
+        Raises:
+            requests.RequestException: Si aucune réponse n'a pu être obtenue
+                (`BudgetExhausted` si le budget d'appels de l'hôte est épuisé,
+                `CircuitOpen` si son disjoncteur est ouvert)
+        """
+        host = urlsplit(url).netloc
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            return self._get(host, url, params, headers, timeout)
+        if not breaker.allow():
+            self.session_for(host)
+            self._incr(self._counters[host], 'short_circuited')
+            raise CircuitOpen(f"Disjoncteur ouvert pour {host}")
+        success = None
+        try:
+            response = self._get(host, url, params, headers, timeout)
+            # Un 429 signale notre débit, pas une panne de l'amont
+            success = response.status_code < 500
+            return response
+        except BudgetExhausted:
+            # Aucun appel n'est parti : rien à enregistrer
+            raise
+        except requests.RequestException:
+            success = False
+            raise
+        finally:
+            # Sans issue connue (budget épuisé, erreur inattendue), l'essai réservé est rendu
+            if success is None:
+                breaker.release()
+            else:
+                breaker.record(success)
+
+    def _get(self, host: str, url: str, params: Optional[Dict], headers: Optional[Dict],
+             timeout: Optional[float]) -> requests.Response:
+        config = self.hosts.get(host, self.default_host)
+        attempt_timeout = timeout if timeout is not None else config.timeout
+        session = self.session_for(host)
+        counters = self._counters[host]
+        deadline = self._clock() + config.budget
+        rate_budget = self.budgets.get(host)
+
+        attempt = 0
+        response = None
+        while True:
+            if rate_budget is not None:
+                try:
+                    # Les retries n'attendent pas de jeton : on garde la dernière réponse
+                    rate_budget.acquire(max_wait=None if attempt == 0 else 0)
+                except BudgetExhausted:
+                    self._incr(counters, 'throttled')
+                    if response is not None:
+                        return response
+                    raise
+            remaining = deadline - self._clock()
+            self._incr(counters, 'requests')
+            started = time.perf_counter()
+            try:
+                response = session.get(url, params=params, headers=headers,
+                                       timeout=max(0.1, min(attempt_timeout, remaining)))
+            except (requests.ConnectionError, requests.Timeout):
+                metrics.upstream_request_duration.observe(time.perf_counter() - started, host=host)
+                metrics.upstream_responses_total.inc(host=host, status='error')
+                response = None
+                if not self._should_retry(attempt, deadline, None):
+                    self._incr(counters, 'failures')
+                    raise
+            else:
+                metrics.upstream_request_duration.observe(time.perf_counter() - started, host=host)
+                metrics.upstream_responses_total.inc(host=host, status=response.status_code)
+                if response.status_code == 429 and rate_budget is not None:
+                    rate_budget.drain()
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                if not self._should_retry(attempt, deadline, response):
+                    self._incr(counters, 'failures')
+                    return response
+
+            self._incr(counters, 'retries')
+            self._sleep(self._backoff(attempt, response, deadline))
+            attempt += 1
+
+    def _should_retry(self, attempt: int, deadline: float,
+                      response: Optional[requests.Response]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return self._backoff_floor(response) < deadline - self._clock()
+
+    def _backoff_floor(self, response: Optional[requests.Response]) -> float:
+        """Attente minimale imposée par le serveur (en-tête Retry-After)"""
+        if response is None:
+            return 0
+        try:
+            return min(float(response.headers.get('Retry-After', 0)), self.backoff_max)
+        except (TypeError, ValueError):
+            return 0
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response], deadline: float) -> float:
+        # Backoff exponentiel "full jitter", borné par le budget restant
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = max(self._backoff_floor(response), random.uniform(0, ceiling))
+        return max(0, min(delay, deadline - self._clock()))
+
+    def _incr(self, counters: Dict[str, int], name: str) -> None:
+        with self._lock:
+            counters[name] += 1
+
+    def stats(self) -> Dict:
+        """
+        Retourne les compteurs par hôte
+
+        Returns:
+            Dict: Requêtes, retries, échecs et connexions créées/réutilisées
+        """
+        with self._lock:
+            hosts = {}
+            for host, session in self._sessions.items():
+                created, served = 0, 0
+                adapter = session.get_adapter('https://')
+                for key in adapter.poolmanager.pools.keys():
+                    pool = adapter.poolmanager.pools.get(key)
+                    if pool is not None:
+                        created += pool.num_connections
+                        served += pool.num_requests
+                hosts[host] = dict(self._counters[host],
+                                   connections_created=created,
+                                   connections_reused=max(0, served - created))
+            budgets = {host: budget.stats() for host, budget in self.budgets.items()}
+            breakers = {host: breaker.stats() for host, breaker in self.breakers.items()}
+            return {
+                'pool_connections': self.pool_connections,
+                'pool_maxsize': self.pool_maxsize,
+                'max_retries': self.max_retries,
+                'hosts': hosts,
+                'budgets': budgets,
+                'breakers': breakers
+            }
+
+    def close(self) -> None:
+        """Ferme toutes les sessions (et leurs connexions)"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# Client par défaut, partagé par tout le processus
+default_client = HttpClient.from_env()
+
+
+def get(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+        timeout: Optional[float] = None) -> requests.Response:
+    """Requête GET via le client partagé (voir `HttpClient.get`)"""
+    return default_client.get(url, params=params, headers=headers, timeout=timeout)
+
+
+def stats() -> Dict:
+    """Compteurs du client partagé"""
+    return default_client.stats()
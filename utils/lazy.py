@@ -0,0 +1,87 @@
+import gc
+import threading
+import time
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Toutes les valeurs paresseuses déclarées, pour le préchargement et les statistiques
+_registry: List['Lazy'] = []
+_registry_lock = threading.Lock()
+
+
+class Lazy(Generic[T]):
+    """
+    Valeur coûteuse (lexique, module lourd, moteur SQL) construite au premier accès
+
+    La construction est protégée par un verrou (double vérification) : elle
+    n'a lieu qu'une fois, même si plusieurs threads la demandent en même
+    temps ; les accès suivants ne prennent pas le verrou. Un échec n'est pas
+    mémorisé : l'accès suivant retente la construction.
+    """
+
+    def __init__(self, factory: Callable[[], T], name: str, register: bool = True):
+        self._factory = factory
+        self.name = name
+        self._value: Optional[T] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+        if register:
+            with _registry_lock:
+                _registry.append(self)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> T:
+        """Retourne la valeur, construite au premier appel"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    start = time.perf_counter()
+                    self._value = self._factory()
+                    self.load_seconds = time.perf_counter() - start
+                    self._loaded = True
+        return self._value
+
+
+def preload(names: Optional[List[str]] = None, freeze: bool = True) -> Dict[str, float]:
+    """
+    Construit dès maintenant les valeurs paresseuses (mode préchargement)
+
+    À appeler dans le processus maître avant le fork des workers (gunicorn
+    --preload) : les workers héritent des objets déjà construits et partagent
+    leurs pages mémoire en copie sur écriture. `gc.freeze()` sort ces objets
+    des passes du ramasse-miettes, qui sinon écriraient dans chaque page et
+    casseraient le partage.
+
+    Args:
+        names (List[str]): Valeurs à charger (toutes par défaut)
+        freeze (bool): Geler les objets existants (gc.freeze) après chargement
+
+    Returns:
+        Dict[str, float]: Durée de chargement (secondes) par valeur
+    """
+    with _registry_lock:
+        values = [value for value in _registry if names is None or value.name in names]
+    for value in values:
+        value.get()
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return {value.name: value.load_seconds for value in values}
+
+
+def stats() -> Dict[str, Dict]:
+    """
+    État des valeurs paresseuses
+
+    Returns:
+        Dict[str, Dict]: {'loaded', 'load_seconds'} par valeur
+    """
+    with _registry_lock:
+        values = list(_registry)
+    return {value.name: {'loaded': value.loaded, 'load_seconds': value.load_seconds or 0.0}
+            for value in values}
@@ -0,0 +1,273 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Bornes (secondes) des histogrammes de latence : de 1 ms à 10 s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Échantillon produit par un collecteur : (nom, type, aide, [(labels, valeur)])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    escaped = (k + '="' + str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+               for k, v in labels.items())
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Compteur monotone, décliné par combinaison de labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f'{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}'
+                for key, value in items]
+
+
+class Histogram:
+    """
+    Histogramme cumulatif (format Prometheus)
+
+    Une observation coûte une recherche dichotomique et quelques additions :
+    assez léger pour rester actif en production.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [compte par intervalle (+Inf en dernier), somme, total]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series[0]), series[1], series[2]) for key, series in self._series.items()]
+        lines = []
+        for key, counts, total, count in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{_format_labels(dict(labels, le=_format_value(bound)))} '
+                             f'{cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {count}')
+        return lines
+
+
+class Registry:
+    """
+    Ensemble des métriques exposées sur /metrics
+
+    Les compteurs déjà tenus ailleurs (cache, budget d'appels, client HTTP)
+    ne sont pas dupliqués : des collecteurs les lisent au moment de l'export.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Ajoute une fonction appelée à chaque export, qui retourne des échantillons"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Export au format texte Prometheus (version 0.0.4)
+
+        Returns:
+            str: Contenu de la réponse /metrics
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render())
+
+        # Un même nom peut venir de plusieurs collecteurs (ex: un par hôte) :
+        # une seule ligne HELP/TYPE par métrique
+        collected: Dict[str, Tuple[str, str, list]] = {}
+        for collector in collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                print(f"Erreur collecteur de métriques : {e}")
+                errors_total.inc(source='metrics_collector')
+                continue
+            for name, kind, help, values in samples:
+                collected.setdefault(name, (kind, help, []))[2].extend(values)
+
+        for name, (kind, help, values) in collected.items():
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(f'{name}{_format_labels(labels)} {_format_value(value)}'
+                         for labels, value in values if value is not None)
+        return '\n'.join(lines) + '\n'
+
+
+# Registre par défaut et métriques communes à toute l'application
+REGISTRY = Registry()
+
+http_request_duration = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Durée de traitement des requêtes HTTP', ('route', 'method'))
+http_requests_total = REGISTRY.counter(
+    'http_requests_total', 'Requêtes HTTP traitées', ('route', 'method', 'status'))
+function_duration = REGISTRY.histogram(
+    'function_duration_seconds', 'Durée des fonctions de données', ('function',))
+upstream_request_duration = REGISTRY.histogram(
+    'upstream_request_duration_seconds', 'Durée des appels aux API externes (par tentative)', ('host',))
+upstream_responses_total = REGISTRY.counter(
+    'upstream_responses_total', 'Réponses des API externes par code HTTP (error = pas de réponse)',
+    ('host', 'status'))
+errors_total = REGISTRY.counter(
+    'errors_total', 'Erreurs rencontrées (appels amont, rafraîchissements, fonctions)', ('source',))
+
+
+def record_error(source: str) -> None:
+    """Compte une erreur pour `source` (ex: 'coingecko_price', 'refresher')"""
+    errors_total.inc(source=source)
+
+
+def timed(name: str) -> Callable:
+    """
+    Décorateur : durée de la fonction et erreurs (exceptions propagées)
+
+    Args:
+        name (str): Valeur du label `function`
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                errors_total.inc(source=name)
+                raise
+            finally:
+                function_duration.observe(time.perf_counter() - started, function=name)
+        return wrapper
+    return decorator
+
+
+def instrument_app(app) -> None:
+    """
+    Mesure la durée et le statut de chaque requête Flask
+
+    Le label `route` est la règle de routage (ex: '/api/crypto/<crypto_id>'),
+    pas l'URL : le nombre de séries reste borné.
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = getattr(g, '_metrics_started', None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            http_request_duration.observe(time.perf_counter() - started, route=route, method=request.method)
+            http_requests_total.inc(route=route, method=request.method, status=response.status_code)
+        return response
+
+
+def stats_samples(prefix: str, stats: Dict, help: str, labels: Optional[Dict[str, str]] = None,
+                  kinds: Optional[Dict[str, str]] = None) -> List[Sample]:
+    """
+    Convertit un dictionnaire de compteurs (`stats()` d'un composant) en échantillons
+
+    Seules les valeurs numériques de premier niveau sont exportées ; les
+    champs listés dans `kinds` ('counter' ou 'gauge') fixent le type, les
+    autres sont des jauges.
+
+    Args:
+        prefix (str): Préfixe des noms (ex: 'market_cache')
+        stats (Dict): Compteurs du composant
+        help (str): Description commune
+        labels (Dict): Labels ajoutés à chaque échantillon
+    """
+    samples = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        kind = (kinds or {}).get(key, 'gauge')
+        name = f'{prefix}_{key}_total' if kind == 'counter' else f'{prefix}_{key}'
+        samples.append((name, kind, f'{help} ({key})', [(labels or {}, value)]))
+    return samples
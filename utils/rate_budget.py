@@ -0,0 +1,181 @@
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+import requests
+
+# Classes de priorité, de la plus à la moins prioritaire
+CRITICAL = 'critical'      # données de la page principale
+BACKGROUND = 'background'  # rafraîchissements d'arrière-plan
+ADHOC = 'adhoc'            # requêtes utilisateur ponctuelles (/api/crypto/<id>...)
+PRIORITIES = (CRITICAL, BACKGROUND, ADHOC)
+
+# Part de la capacité gardée en réserve pour les classes plus prioritaires :
+# une classe ne consomme un jeton que s'il en reste plus que sa réserve
+DEFAULT_RESERVES = {CRITICAL: 0.0, BACKGROUND: 0.2, ADHOC: 0.5}
+
+# Attente maximale d'un jeton (secondes) avant d'abandonner l'appel
+DEFAULT_MAX_WAIT = {CRITICAL: 2.0, BACKGROUND: 10.0, ADHOC: 0.0}
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar('upstream_priority', default=ADHOC)
+
+
+@contextmanager
+def priority(name: str) -> Iterator[None]:
+    """
+    Fixe la priorité des appels amont effectués dans ce contexte
+
+    Exemple :
+        with priority(CRITICAL):
+            get_crypto_data('bitcoin')
+    """
+    if name not in PRIORITIES:
+        raise ValueError(f"Priorité inconnue : {name}")
+    token = _current_priority.set(name)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> str:
+    """Priorité du contexte courant (`adhoc` par défaut)"""
+    return _current_priority.get()
+
+
+def with_priority(name: str, fn: Callable) -> Callable:
+    """Enveloppe `fn` pour qu'elle s'exécute avec la priorité `name`"""
+    def wrapper(*args, **kwargs):
+        with priority(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+class BudgetExhausted(requests.RequestException):
+    """Budget d'appels épuisé pour cette priorité : servir le cache ou un fallback"""
+
+
+class RateBudget:
+    """
+    Budget d'appels amont (token bucket) avec classes de priorité
+
+    Le seau se remplit de `rate_per_minute` jetons par minute, jusqu'à
+    `capacity`. Chaque appel consomme un jeton ; une classe de priorité ne
+    peut puiser que dans la part du seau au-dessus de sa réserve, ce qui
+    garde des jetons pour les appels plus importants. Un appel sans jeton
+    attend au plus `max_wait[priorité]` secondes, puis lève `BudgetExhausted`
+    (l'appelant sert alors le cache ou son fallback).
+    """
+
+    def __init__(self, rate_per_minute: float = 30, capacity: Optional[float] = None,
+                 reserves: Optional[Dict[str, float]] = None,
+                 max_wait: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute doit être > 0")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.reserves = dict(DEFAULT_RESERVES, **(reserves or {}))
+        self.max_wait = dict(DEFAULT_MAX_WAIT, **(max_wait or {}))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._cond = threading.Condition()
+        self._counters = {name: {'granted': 0, 'waited': 0, 'rejected': 0, 'wait_seconds': 0.0}
+                          for name in PRIORITIES}
+
+    @classmethod
+    def from_env(cls, prefix: str) -> 'RateBudget':
+        """Construit le budget depuis `<PREFIX>_RATE_PER_MINUTE` et `<PREFIX>_BURST`"""
+        rate = float(os.getenv(f'{prefix}_RATE_PER_MINUTE', 30))
+        burst = os.getenv(f'{prefix}_BURST')
+        return cls(rate_per_minute=rate, capacity=float(burst) if burst else None)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _floor(self, name: str) -> float:
+        """Jetons à laisser dans le seau pour les classes plus prioritaires"""
+        return self.reserves.get(name, 0.0) * self.capacity
+
+    def try_acquire(self, name: Optional[str] = None) -> bool:
+        """Consomme un jeton sans attendre ; False si la priorité n'y a pas droit"""
+        name = name or current_priority()
+        with self._cond:
+            self._refill()
+            if self._tokens - 1 >= self._floor(name) - 1e-9:
+                self._tokens -= 1
+                self._counters[name]['granted'] += 1
+                return True
+            return False
+
+    def acquire(self, name: Optional[str] = None, max_wait: Optional[float] = None) -> None:
+        """
+        Consomme un jeton, en attendant au besoin le remplissage du seau
+
+        Args:
+            name (str): Priorité (celle du contexte par défaut)
+            max_wait (float): Attente maximale (sinon celle de la priorité)
+
+        Raises:
+            BudgetExhausted: Si aucun jeton n'est disponible à temps
+        """
+        name = name or current_priority()
+        if self.try_acquire(name):
+            return
+
+        max_wait = self.max_wait.get(name, 0.0) if max_wait is None else max_wait
+        started = self._clock()
+        deadline = started + max_wait
+        with self._cond:
+            while True:
+                self._refill()
+                needed = self._floor(name) + 1 - self._tokens
+                if needed <= 1e-9:
+                    self._tokens -= 1
+                    counters = self._counters[name]
+                    counters['granted'] += 1
+                    counters['waited'] += 1
+                    counters['wait_seconds'] += self._clock() - started
+                    return
+                delay = needed / self.rate
+                remaining = deadline - self._clock()
+                if delay > remaining:
+                    self._counters[name]['rejected'] += 1
+                    raise BudgetExhausted(f"Budget d'appels épuisé (priorité {name})")
+                self._cond.wait(delay)
+
+    def drain(self) -> None:
+        """Vide le seau (l'API a répondu 429 : le quota réel est déjà atteint)"""
+        with self._cond:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+    def tokens(self) -> float:
+        """Jetons actuellement disponibles"""
+        with self._cond:
+            self._refill()
+            return self._tokens
+
+    def stats(self) -> Dict:
+        """
+        Retourne l'état du budget
+
+        Returns:
+            Dict: Débit, capacité, jetons disponibles et compteurs par priorité
+        """
+        with self._cond:
+            self._refill()
+            return {
+                'rate_per_minute': round(self.rate * 60, 2),
+                'capacity': self.capacity,
+                'tokens': round(self._tokens, 2),
+                'utilization': round(1 - self._tokens / self.capacity, 3),
+                'priorities': {name: dict(counters, wait_seconds=round(counters['wait_seconds'], 3))
+                               for name, counters in self._counters.items()}
+            }
@@ -0,0 +1,142 @@
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+from utils import metrics
+
+
+class RefreshJob:
+    """Tâche de rafraîchissement périodique (fonction sans argument + cadence)"""
+
+    def __init__(self, fn: Callable[[], Any], interval: float):
+        self.fn = fn
+        self.interval = interval
+        self.next_run = 0.0
+        self.runs = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+
+class MarketDataRefresher:
+    """
+    Rafraîchissement des données de marché dans un thread d'arrière-plan
+
+    Chaque tâche est exécutée à sa propre cadence et son résultat est publié
+    dans un snapshot immuable. Les routes Flask ne font que lire ce snapshot :
+    la latence des pages ne dépend plus de la disponibilité de CoinGecko.
+    En cas d'échec d'une tâche, la dernière valeur publiée est conservée.
+    """
+
+    def __init__(self, jobs: Dict[Hashable, RefreshJob], tick: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 on_publish: Optional[Callable[[Mapping[Hashable, Any]], None]] = None):
+        self._jobs = jobs
+        self._on_publish = on_publish
+        self._tick = tick
+        self._clock = clock
+        self._snapshot: Mapping[Hashable, Any] = MappingProxyType({})
+        self._published_at: Optional[float] = None
+        self._publish_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Démarre le thread de rafraîchissement (sans effet s'il tourne déjà)"""
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='market-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Arrête le thread de rafraîchissement"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh_once(self, force: bool = False) -> int:
+        """
+        Exécute les tâches arrivées à échéance et publie un nouveau snapshot
+
+        Args:
+            force (bool): Exécuter toutes les tâches, échues ou non
+
+        Returns:
+            int: Nombre de tâches exécutées
+        """
+        now = self._clock()
+        updates = {}
+        executed = 0
+
+        for key, job in self._jobs.items():
+            if not force and now < job.next_run:
+                continue
+            executed += 1
+            job.runs += 1
+            job.next_run = now + job.interval
+            try:
+                updates[key] = job.fn()
+            except Exception as e:
+                job.errors += 1
+                job.last_error = str(e)
+                print(f"Erreur rafraîchissement {key}: {e}")
+                metrics.record_error('refresher')
+
+        if updates:
+            self._publish(updates)
+            if self._on_publish is not None:
+                try:
+                    self._on_publish(self._snapshot)
+                except Exception as e:
+                    print(f"Erreur publication du snapshot : {e}")
+                    metrics.record_error('refresher_publish')
+        return executed
+
+    def _publish(self, updates: Dict[Hashable, Any]) -> None:
+        # Copie puis remplacement atomique de la référence : les lecteurs ne
+        # voient jamais un snapshot partiellement mis à jour
+        with self._publish_lock:
+            snapshot = dict(self._snapshot)
+            snapshot.update(updates)
+            self._snapshot = MappingProxyType(snapshot)
+            self._published_at = time.time()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh_once()
+            self._stop.wait(self._tick)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Lit une valeur du dernier snapshot publié"""
+        return self._snapshot.get(key, default)
+
+    def snapshot(self) -> Mapping[Hashable, Any]:
+        """Retourne le dernier snapshot publié (lecture seule)"""
+        return self._snapshot
+
+    def stats(self) -> Dict:
+        """
+        Retourne l'état du rafraîchisseur
+
+        Returns:
+            Dict: État du thread, date de publication et compteurs par tâche
+        """
+        return {
+            'running': self.is_running(),
+            'published_at': self._published_at,
+            'entries': len(self._snapshot),
+            'jobs': {
+                ':'.join(str(part) for part in (key if isinstance(key, tuple) else (key,))): {
+                    'interval': job.interval,
+                    'runs': job.runs,
+                    'errors': job.errors,
+                    'last_error': job.last_error
+                }
+                for key, job in self._jobs.items()
+            }
+        }
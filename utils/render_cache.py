@@ -0,0 +1,134 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Response
+
+
+def _json_default(value: Any) -> Any:
+    return value.to_dict() if hasattr(value, 'to_dict') else str(value)
+
+
+def content_hash(data: Any) -> str:
+    """
+    Empreinte stable des données d'entrée d'une page
+
+    Args:
+        data (Any): Données sérialisables en JSON (les enregistrements
+            sont pris via leur `to_dict()`, les autres types inconnus, ex.
+            datetime, sont convertis en texte)
+
+    Returns:
+        str: Empreinte hexadécimale (blake2b, 16 octets)
+    """
+    encoded = json.dumps(data, sort_keys=True, separators=(',', ':'), default=_json_default, ensure_ascii=False)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class RenderedPage:
+    """Page rendue : contenu encodé, ETag (empreinte des entrées) et date de rendu"""
+
+    __slots__ = ('body', 'etag', 'last_modified')
+
+    def __init__(self, body: bytes, etag: str, last_modified: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class RenderCache:
+    """
+    Cache des pages rendues, indexé par (nom de la page, empreinte des entrées)
+
+    Tant que les données d'entrée d'un dashboard ne changent pas, la page
+    déjà rendue est réutilisée : ni scoring, ni rendu Jinja. Les entrées les
+    moins récemment utilisées sont évincées au-delà de `max_size`.
+    """
+
+    def __init__(self, max_size: int = 64, clock: Callable[[], float] = time.time):
+        if max_size < 1:
+            raise ValueError("max_size doit être >= 1")
+        self.max_size = max_size
+        self._clock = clock
+        self._pages: 'OrderedDict[Tuple[str, str], RenderedPage]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.renders = 0
+
+    def get_or_render(self, name: str, inputs: Any, render: Callable[[], str]) -> RenderedPage:
+        """
+        Retourne la page rendue pour ces entrées, en la rendant si nécessaire
+
+        Args:
+            name (str): Nom de la page (ex: 'telegram')
+            inputs (Any): Données dont dépend le rendu
+            render (Callable): Rendu complet (scoring + template), appelé
+                uniquement si les entrées ont changé
+
+        Returns:
+            RenderedPage: Page rendue
+        """
+        key = (name, content_hash(inputs))
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+                self.hits += 1
+                return page
+
+        page = RenderedPage(render().encode('utf-8'), key[1], self._clock())
+        with self._lock:
+            self.renders += 1
+            # Une page identique déjà rendue par une requête concurrente garde sa date
+            existing = self._pages.get(key)
+            if existing is not None:
+                return existing
+            self._pages[key] = page
+            while len(self._pages) > self.max_size:
+                self._pages.popitem(last=False)
+        return page
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+    def stats(self) -> Dict:
+        """
+        Retourne les compteurs du cache
+
+        Returns:
+            Dict: Taille, pages servies depuis le cache, rendus et hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.renders
+            return {
+                'size': len(self._pages),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'renders': self.renders,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+def conditional_response(page: RenderedPage, request, max_age: Optional[int] = 0) -> Response:
+    """
+    Réponse HTML avec ETag/Last-Modified ; 304 si le client a déjà cette version
+
+    Args:
+        page (RenderedPage): Page rendue
+        request: Requête Flask courante (If-None-Match, If-Modified-Since)
+        max_age (int): Durée de fraîcheur côté client ; 0 impose une revalidation
+
+    Returns:
+        Response: 200 avec le contenu, ou 304 sans corps
+    """
+    response = Response(page.body, mimetype='text/html')
+    response.set_etag(page.etag)
+    response.last_modified = page.last_modified
+    if max_age is not None:
+        response.cache_control.max_age = max_age
+        response.cache_control.must_revalidate = True
+    return response.make_conditional(request)
@@ -0,0 +1,210 @@
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Types de contenu compressés (les images, flux SSE... ne le sont pas)
+COMPRESSIBLE_TYPES = frozenset({'application/json', 'text/html', 'text/css', 'text/plain',
+                                'application/javascript', 'text/javascript', 'image/svg+xml'})
+
+# En dessous de cette taille, la compression coûte plus qu'elle ne rapporte
+DEFAULT_MIN_SIZE = 1024
+
+# Versions compressées gardées pour les réponses à ETag (pages servies par le cache de rendu)
+COMPRESSED_CACHE_SIZE = 128
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Sérialisation JSON des réponses Flask via orjson (si installé)
+
+    Même sortie que le fournisseur par défaut (clés triées, dates HTTP,
+    enregistrements via `to_dict()`), 5 à 10 fois plus rapide sur les gros
+    historiques. Sans orjson, le module `json` standard est utilisé.
+    """
+
+    @staticmethod
+    def default(value: Any) -> Any:
+        if hasattr(value, 'to_dict'):
+            return value.to_dict()
+        if hasattr(value, 'tolist'):  # scalaires et tableaux NumPy
+            return value.tolist()
+        return DefaultJSONProvider.default(value)
+
+    def _orjson_options(self) -> int:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            kwargs.setdefault('default', self.default)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if orjson is None or (self.compact is None and self._app.debug) or self.compact is False:
+            # Sortie indentée (mode debug) : fournisseur standard
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_options())
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def negotiate_encoding(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """
+    Choisit l'encodage de contenu à partir de l'en-tête Accept-Encoding
+
+    Args:
+        accept_encoding (str): En-tête du client (ex: 'gzip, deflate, br;q=0.9')
+        available (Sequence[str]): Encodages supportés, par ordre de préférence
+
+    Returns:
+        Optional[str]: Encodage retenu, None si aucun n'est accepté
+    """
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def available_encodings() -> List[str]:
+    """Encodages disponibles, du plus compact au moins compact (brotli si installé)"""
+    return (['br'] if brotli is not None else []) + ['gzip']
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    """Compresse `body` avec l'encodage négocié ('br' ou 'gzip')"""
+    if encoding == 'br':
+        # Qualité brotli (0-11) : 5 est un bon compromis pour des réponses dynamiques
+        return brotli.compress(body, quality=min(11, max(0, level - 1)))
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def init_compression(app, min_size: int = DEFAULT_MIN_SIZE, level: int = 6,
+                     encodings: Optional[Sequence[str]] = None) -> None:
+    """
+    Compresse les réponses (gzip ou brotli) selon l'Accept-Encoding du client
+
+    Les réponses en flux (SSE), déjà encodées, trop petites ou d'un type non
+    compressible sont laissées telles quelles. Un ETag fort devient faible :
+    le contenu encodé n'est pas identique octet pour octet à l'original.
+    Pour les réponses à ETag fort, la version compressée est mémorisée par
+    (ETag, encodage) : une page servie depuis le cache n'est compressée qu'une fois.
+
+    Args:
+        app (Flask): Application
+        min_size (int): Taille minimale (octets) d'une réponse compressée
+        level (int): Niveau de compression (1-9)
+        encodings (Sequence[str]): Encodages proposés (par défaut `available_encodings()`)
+    """
+    from flask import request
+
+    encodings = list(encodings or available_encodings())
+    compressed_cache: 'OrderedDict[tuple, bytes]' = OrderedDict()
+    lock = threading.Lock()
+
+    def compressed_body(body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        if etag is None:
+            return compress(body, encoding, level)
+        key = (etag, encoding, len(body))
+        with lock:
+            cached = compressed_cache.get(key)
+            if cached is not None:
+                compressed_cache.move_to_end(key)
+                return cached
+        cached = compress(body, encoding, level)
+        with lock:
+            compressed_cache[key] = cached
+            while len(compressed_cache) > COMPRESSED_CACHE_SIZE:
+                compressed_cache.popitem(last=False)
+        return cached
+
+    @app.after_request
+    def _compress_response(response):
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code >= 300
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''), encodings)
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        strong_etag = etag if etag and not weak else None
+        response.set_data(compressed_body(body, encoding, strong_etag))
+        response.headers['Content-Encoding'] = encoding
+        if strong_etag:
+            response.set_etag(strong_etag, weak=True)
+        return response
+
+
+def columnar(points: Iterable[Dict], fields: Sequence[str]) -> Dict[str, List]:
+    """
+    Convertit une liste de points en colonnes : {'time': [...], 'price': [...]}
+
+    Les clés ne sont plus répétées à chaque point : la réponse est plus
+    petite et se compresse mieux.
+
+    Args:
+        points (Iterable[Dict]): Points {'time', 'price', ...}
+        fields (Sequence[str]): Champs à exporter
+
+    Returns:
+        Dict[str, List]: Une liste de valeurs par champ
+    """
+    columns: Dict[str, List] = {field: [] for field in fields}
+    appends = [(columns[field].append, field) for field in fields]
+    for point in points:
+        for append, field in appends:
+            append(point.get(field))
+    return columns
+
+
+def json_bytes(value: Any) -> bytes:
+    """JSON compact d'une valeur, en octets (orjson si disponible)"""
+    if orjson is not None:
+        return orjson.dumps(value, default=FastJSONProvider.default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(',', ':'), default=FastJSONProvider.default).encode('utf-8')
@@ -0,0 +1,147 @@
+import hashlib
+import os
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from utils import metrics
+from utils.cache import TTLCache
+from utils.lazy import Lazy
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+
+def _load_analyzer() -> 'SentimentIntensityAnalyzer':
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+# Analyseur VADER partagé (lexique et emojis chargés au premier score, ou
+# avant le fork en mode préchargement) ; chaque processus du pool a le sien
+VADER = Lazy(_load_analyzer, 'vader')
+
+
+def _score_texts(texts: List[str]) -> List[float]:
+    """Score VADER d'un lot de textes dans un processus du pool"""
+    analyzer = VADER.get()
+    return [analyzer.polarity_scores(text)['compound'] for text in texts]
+
+
+def content_key(text: str) -> bytes:
+    """Empreinte compacte du texte, utilisée comme clé de cache"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class SentimentScorer:
+    """
+    Service de scoring VADER partagé par toutes les analyses de sentiment
+
+    Les scores `compound` sont mémorisés dans un cache LRU indexé par
+    l'empreinte du texte : les posts, titres et signaux fixes ne sont scorés
+    qu'une fois. `score_batch` déduplique ses entrées et, au-delà de
+    `process_threshold` textes à scorer, peut déléguer à un pool de processus
+    pour ne pas bloquer le worker Flask. Sans analyseur fourni, l'analyseur
+    partagé `VADER` n'est chargé qu'au premier texte à scorer.
+    """
+
+    def __init__(self, analyzer: Optional['SentimentIntensityAnalyzer'] = None,
+                 cache_size: int = 4096, process_threshold: int = 500,
+                 processes: int = 0, chunk_size: int = 250):
+        self._analyzer = analyzer
+        self._cache = TTLCache(max_size=cache_size, default_ttl=float('inf'))
+        self.process_threshold = process_threshold
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self._pool: Optional['ProcessPoolExecutor'] = None
+        self.scored = 0
+
+    @classmethod
+    def from_env(cls, analyzer: Optional['SentimentIntensityAnalyzer'] = None) -> 'SentimentScorer':
+        """Construit le service à partir des variables d'environnement"""
+        return cls(
+            analyzer=analyzer,
+            cache_size=int(os.getenv('SCORING_CACHE_SIZE', 4096)),
+            process_threshold=int(os.getenv('SCORING_PROCESS_THRESHOLD', 500)),
+            processes=int(os.getenv('SCORING_PROCESSES', 0))
+        )
+
+    def score(self, text: str) -> float:
+        """
+        Score `compound` d'un texte (entre -1 et 1)
+
+        Args:
+            text (str): Texte à analyser
+
+        Returns:
+            float: Score compound VADER
+        """
+        return self.score_batch([text])[0]
+
+    @metrics.timed('score_batch')
+    def score_batch(self, texts: Iterable[str]) -> List[float]:
+        """
+        Scores `compound` d'une liste de textes, dans l'ordre d'entrée
+
+        Args:
+            texts (Iterable[str]): Textes à analyser (doublons autorisés)
+
+        Returns:
+            List[float]: Score compound de chaque texte
+        """
+        texts = list(texts)
+        keys = [content_key(text) for text in texts]
+        scores: Dict[bytes, float] = {}
+        missing: Dict[bytes, str] = {}
+
+        for key, text in zip(keys, texts):
+            if key in scores or key in missing:
+                continue
+            cached = self._cache.get(key)
+            if cached is not None:
+                scores[key] = cached
+            else:
+                missing[key] = text
+
+        if missing:
+            computed = self._compute(list(missing.values()))
+            for key, compound in zip(missing, computed):
+                self._cache.set(key, compound)
+                scores[key] = compound
+            self.scored += len(missing)
+
+        return [scores[key] for key in keys]
+
+    def _compute(self, texts: List[str]) -> List[float]:
+        if self.processes > 0 and len(texts) >= self.process_threshold:
+            chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+            results = []
+            for chunk_scores in self._get_pool().map(_score_texts, chunks):
+                results.extend(chunk_scores)
+            return results
+        analyzer = self._analyzer or VADER.get()
+        return [analyzer.polarity_scores(text)['compound'] for text in texts]
+
+    def _get_pool(self) -> 'ProcessPoolExecutor':
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self._pool
+
+    def shutdown(self) -> None:
+        """Arrête le pool de processus éventuel"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def stats(self) -> Dict:
+        """
+        Retourne les compteurs du service
+
+        Returns:
+            Dict: Textes réellement scorés et statistiques du cache
+        """
+        return {
+            'scored': self.scored,
+            'processes': self.processes,
+            'cache': self._cache.stats()
+        }
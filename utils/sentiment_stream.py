@@ -0,0 +1,345 @@
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional
+
+from utils import metrics
+
+# Fenêtres glissantes par défaut (nom -> durée en secondes)
+DEFAULT_WINDOWS = {'1m': 60, '5m': 300, '1h': 3600}
+
+# Seuils de classification identiques aux dashboards
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+
+class TextEvent:
+    """Texte reçu d'une source, avant ou après scoring"""
+    __slots__ = ('source', 'text', 'ts', 'event_id', 'meta', 'score')
+
+    def __init__(self, source: str, text: str, ts: Optional[float] = None,
+                 event_id: Optional[str] = None, meta: Optional[Dict] = None):
+        self.source = source
+        self.text = text
+        self.ts = time.time() if ts is None else ts
+        self.event_id = event_id
+        self.meta = meta or {}
+        self.score: Optional[float] = None
+
+
+class SentimentSource:
+    """Source de textes interrogée périodiquement par le pipeline"""
+    name = 'source'
+
+    def poll(self) -> Iterable[TextEvent]:
+        raise NotImplementedError
+
+
+class CallableSource(SentimentSource):
+    """
+    Source générique construite à partir d'une fonction
+
+    La fonction retourne une liste de dicts avec au moins `text`, et
+    optionnellement `id`, `ts` et toute métadonnée utile à l'affichage.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], List[Dict]]):
+        self.name = name
+        self._fetch = fetch
+
+    def poll(self) -> List[TextEvent]:
+        events = []
+        for item in self._fetch():
+            meta = {k: v for k, v in item.items() if k not in ('text', 'id', 'ts')}
+            events.append(TextEvent(self.name, item['text'], ts=item.get('ts'),
+                                    event_id=item.get('id'), meta=meta))
+        return events
+
+
+class ReplaySource(SentimentSource):
+    """
+    Source de rejeu (tests, démonstrations) à partir d'un fichier ou d'une liste
+
+    Fichier : une ligne par texte, ou une ligne JSON par événement
+    (`{"text": ..., "id": ...}`). Chaque appel à `poll` émet au plus
+    `batch_size` textes ; avec `loop=True` le rejeu recommence à la fin.
+    """
+
+    def __init__(self, name: str = 'replay', path: Optional[str] = None,
+                 texts: Optional[Iterable] = None, batch_size: int = 10, loop: bool = False):
+        self.name = name
+        self.batch_size = batch_size
+        self.loop = loop
+        self._items = list(texts or []) if path is None else self._load(path)
+        self._position = 0
+
+    @staticmethod
+    def _load(path: str) -> List:
+        items = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith('{'):
+                    items.append(json.loads(line))
+                else:
+                    items.append(line)
+        return items
+
+    def poll(self) -> List[TextEvent]:
+        events = []
+        while len(events) < self.batch_size and self._items:
+            if self._position >= len(self._items):
+                if not self.loop:
+                    break
+                self._position = 0
+            item = self._items[self._position]
+            self._position += 1
+            if isinstance(item, dict):
+                events.append(TextEvent(self.name, item['text'], event_id=item.get('id')))
+            else:
+                events.append(TextEvent(self.name, item))
+        return events
+
+
+class RollingWindow:
+    """
+    Agrégats de sentiment sur une fenêtre glissante, mis à jour en O(1)
+
+    La fenêtre est découpée en seaux (`buckets`) dans un anneau ; les totaux
+    courants sont ajustés à l'ajout d'un événement et à l'expiration d'un
+    seau, sans jamais reparcourir les événements.
+    """
+
+    def __init__(self, seconds: float, buckets: int = 60):
+        self.seconds = seconds
+        self.bucket_seconds = seconds / buckets
+        self._size = buckets
+        self._count = [0] * buckets
+        self._sum = [0.0] * buckets
+        self._positive = [0] * buckets
+        self._negative = [0] * buckets
+        self._slot_index = [None] * buckets
+        self.count = 0
+        self.total = 0.0
+        self.positive = 0
+        self.negative = 0
+
+    def _reset(self, slot: int, index: Optional[int]) -> None:
+        # Le seau contient une période expirée : on le retire des totaux
+        self.count -= self._count[slot]
+        self.total -= self._sum[slot]
+        self.positive -= self._positive[slot]
+        self.negative -= self._negative[slot]
+        self._count[slot] = 0
+        self._sum[slot] = 0.0
+        self._positive[slot] = 0
+        self._negative[slot] = 0
+        self._slot_index[slot] = index
+        if self.count == 0:
+            self.total = 0.0
+
+    def add(self, ts: float, score: float) -> bool:
+        """
+        Ajoute un score horodaté à la fenêtre
+
+        Returns:
+            bool: False si l'événement est trop ancien pour la fenêtre
+        """
+        index = int(ts // self.bucket_seconds)
+        slot = index % self._size
+        current = self._slot_index[slot]
+        if current is not None and index < current:
+            return False
+        if current != index:
+            self._reset(slot, index)
+
+        self._count[slot] += 1
+        self._sum[slot] += score
+        self.count += 1
+        self.total += score
+        if score >= POSITIVE_THRESHOLD:
+            self._positive[slot] += 1
+            self.positive += 1
+        elif score <= NEGATIVE_THRESHOLD:
+            self._negative[slot] += 1
+            self.negative += 1
+        return True
+
+    def expire(self, now: float) -> None:
+        """Retire des totaux les seaux sortis de la fenêtre à l'instant `now`"""
+        oldest = int(now // self.bucket_seconds) - self._size
+        for slot, index in enumerate(self._slot_index):
+            if index is not None and index <= oldest:
+                self._reset(slot, None)
+
+    def summary(self, now: Optional[float] = None) -> Dict:
+        """
+        Retourne les agrégats courants de la fenêtre
+
+        Returns:
+            Dict: Nombre d'événements, score moyen, répartition et hype meter
+        """
+        if now is not None:
+            self.expire(now)
+        average = self.total / self.count if self.count else 0.0
+        return {
+            'count': self.count,
+            'average_score': round(average, 3),
+            'positive': self.positive,
+            'negative': self.negative,
+            'neutral': self.count - self.positive - self.negative,
+            'hype_meter': max(0, min(100, int((average + 1) * 50)))
+        }
+
+
+class SentimentStream:
+    """
+    Pipeline d'ingestion continue : sources -> scoring unique -> agrégats glissants
+
+    Chaque texte est scoré une seule fois (via le service de scoring partagé)
+    puis ajouté aux fenêtres de sa source et à la fenêtre globale. Les
+    dashboards lisent les agrégats courants au lieu de scorer à la demande.
+    """
+
+    def __init__(self, sources: List[SentimentSource], score_batch: Callable[[List[str]], List[float]],
+                 windows: Optional[Dict[str, float]] = None, interval: float = 15,
+                 recent_size: int = 50, seen_size: int = 10000,
+                 clock: Callable[[], float] = time.time):
+        self.sources = sources
+        self._score_batch = score_batch
+        self._window_specs = windows or DEFAULT_WINDOWS
+        self.interval = interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows: Dict[str, Dict[str, RollingWindow]] = {}
+        self._recent: Dict[str, Deque[TextEvent]] = {}
+        self._recent_size = recent_size
+        self._seen: 'OrderedDict[str, None]' = OrderedDict()
+        self._seen_size = seen_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.ingested = 0
+        self.duplicates = 0
+
+    def _windows_for(self, name: str) -> Dict[str, RollingWindow]:
+        windows = self._windows.get(name)
+        if windows is None:
+            windows = {label: RollingWindow(seconds) for label, seconds in self._window_specs.items()}
+            self._windows[name] = windows
+            self._recent[name] = deque(maxlen=self._recent_size)
+        return windows
+
+    def _is_duplicate(self, event: TextEvent) -> bool:
+        if event.event_id is None:
+            return False
+        key = f'{event.source}:{event.event_id}'
+        if key in self._seen:
+            return True
+        self._seen[key] = None
+        if len(self._seen) > self._seen_size:
+            self._seen.popitem(last=False)
+        return False
+
+    def ingest(self, events: Iterable[TextEvent]) -> int:
+        """
+        Score et agrège des événements (les doublons d'ID sont ignorés)
+
+        Args:
+            events (Iterable[TextEvent]): Événements reçus
+
+        Returns:
+            int: Nombre d'événements ajoutés aux agrégats
+        """
+        with self._lock:
+            fresh = []
+            for event in events:
+                if self._is_duplicate(event):
+                    self.duplicates += 1
+                else:
+                    fresh.append(event)
+
+        if not fresh:
+            return 0
+
+        scores = self._score_batch([event.text for event in fresh])
+
+        with self._lock:
+            for event, score in zip(fresh, scores):
+                event.score = score
+                for name in (event.source, 'all'):
+                    for window in self._windows_for(name).values():
+                        window.add(event.ts, score)
+                self._recent[event.source].append(event)
+            self.ingested += len(fresh)
+        return len(fresh)
+
+    def poll_once(self) -> int:
+        """Interroge toutes les sources une fois ; retourne le nombre d'événements ajoutés"""
+        added = 0
+        for source in self.sources:
+            try:
+                added += self.ingest(source.poll())
+            except Exception as e:
+                print(f"Erreur source {source.name}: {e}")
+                metrics.record_error('sentiment_source')
+        return added
+
+    def start(self) -> None:
+        """Démarre l'ingestion continue dans un thread d'arrière-plan"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sentiment-stream', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Arrête l'ingestion continue"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval)
+
+    def aggregates(self, source: str = 'all') -> Dict[str, Dict]:
+        """
+        Agrégats courants d'une source pour chaque fenêtre
+
+        Args:
+            source (str): Nom de la source, ou 'all' pour toutes les sources
+
+        Returns:
+            Dict[str, Dict]: fenêtre -> agrégats (voir `RollingWindow.summary`)
+        """
+        now = self._clock()
+        with self._lock:
+            windows = self._windows.get(source)
+            if windows is None:
+                return {label: RollingWindow(seconds).summary() for label, seconds in self._window_specs.items()}
+            return {label: window.summary(now) for label, window in windows.items()}
+
+    def recent(self, source: str, limit: Optional[int] = None) -> List[TextEvent]:
+        """Derniers événements scorés d'une source (du plus récent au plus ancien)"""
+        with self._lock:
+            events = list(reversed(self._recent.get(source, ())))
+        return events[:limit] if limit else events
+
+    def stats(self) -> Dict:
+        """
+        Retourne les compteurs du pipeline
+
+        Returns:
+            Dict: Événements ingérés, doublons ignorés et sources actives
+        """
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'ingested': self.ingested,
+            'duplicates': self.duplicates,
+            'sources': [source.name for source in self.sources]
+        }
@@ -0,0 +1,290 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou inter-processus, chaque processus est propriétaire
+    fcntl = None
+
+# En-tête : magic, version du format, séquence, date de publication, taille des données
+MAGIC = b'CSNP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHxxQdI')
+HEADER_SIZE = 32
+SEQ_OFFSET = 8
+SEQ = struct.Struct('<Q')
+
+DEFAULT_SIZE = 1024 * 1024
+
+# Tentatives de lecture avant d'abandonner si l'écrivain publie en continu
+READ_RETRIES = 100
+
+
+def encode_prices(prices: Dict[str, Dict]) -> bytes:
+    """
+    Sérialise un dictionnaire {crypto: {champ: valeur}} de façon compacte
+
+    Les champs numériques sont rangés dans une matrice float64 (crypto x
+    champ, NaN si absent) ; les autres (nom, symbole, image...) dans une
+    courte section JSON.
+
+    Args:
+        prices (Dict): Données par crypto
+
+    Returns:
+        bytes: Données encodées
+    """
+    coins = list(prices)
+    fields = []
+    text = {}
+    for coin_id in coins:
+        for field, value in prices[coin_id].items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if field not in fields:
+                    fields.append(field)
+            else:
+                text.setdefault(coin_id, {})[field] = value
+
+    matrix = np.full((len(coins), len(fields)), np.nan, dtype='<f8')
+    column = {field: j for j, field in enumerate(fields)}
+    for i, coin_id in enumerate(coins):
+        for field, value in prices[coin_id].items():
+            if field in column and not isinstance(value, bool):
+                matrix[i, column[field]] = value
+
+    meta = json.dumps({'coins': coins, 'fields': fields, 'text': text}, separators=(',', ':')).encode('utf-8')
+    padding = b'\0' * (-(4 + len(meta)) % 8)
+    return struct.pack('<I', len(meta)) + meta + padding + matrix.tobytes()
+
+
+def decode_prices(buffer) -> Dict[str, Dict]:
+    """
+    Décode les données produites par `encode_prices`
+
+    La matrice est lue directement dans le tampon (`np.frombuffer`), sans
+    copie intermédiaire.
+
+    Args:
+        buffer: bytes, memoryview ou mmap
+
+    Returns:
+        Dict: Données par crypto
+    """
+    (meta_len,) = struct.unpack_from('<I', buffer, 0)
+    meta = json.loads(bytes(buffer[4:4 + meta_len]))
+    offset = 4 + meta_len
+    offset += -offset % 8
+    coins, fields, text = meta['coins'], meta['fields'], meta['text']
+    matrix = np.frombuffer(buffer, dtype='<f8', count=len(coins) * len(fields),
+                           offset=offset).reshape(len(coins), len(fields))
+
+    result = {}
+    for coin_id, row in zip(coins, matrix.tolist()):
+        entry = {field: value for field, value in zip(fields, row) if value == value}
+        entry.update(text.get(coin_id, {}))
+        result[coin_id] = entry
+    return result
+
+
+class SharedPriceSnapshot:
+    """
+    Snapshot de prix partagé entre processus via un fichier mappé en mémoire
+
+    Un seul processus (le propriétaire, élu par verrou sur `<path>.lock`)
+    interroge CoinGecko et publie ; les autres workers se contentent de lire.
+    Les écritures suivent un protocole "seqlock" : la séquence est impaire
+    pendant l'écriture et paire une fois les données complètes. Un lecteur
+    relit tant que la séquence change pendant sa lecture, et ne décode les
+    données que lorsque la séquence a avancé depuis sa dernière lecture.
+    """
+
+    def __init__(self, path: str, size: int = DEFAULT_SIZE):
+        if size <= HEADER_SIZE:
+            raise ValueError("size doit dépasser la taille de l'en-tête")
+        self.path = path
+        self.size = size
+        self._lock = threading.Lock()
+        self._map: Optional[mmap.mmap] = None
+        self._file = None
+        self._writable = False
+        self._owner_file = None
+        self._cached_seq = 0
+        self._cached: Dict[str, Dict] = {}
+        self._cached_at: Optional[float] = None
+        self._stats = {'publishes': 0, 'decodes': 0, 'retries': 0}
+
+    # --- Propriété (un seul processus publie) ---
+
+    def try_acquire_owner(self) -> bool:
+        """
+        Tente de devenir le processus propriétaire (non bloquant)
+
+        Returns:
+            bool: True si ce processus publie le snapshot
+        """
+        with self._lock:
+            if self._owner_file is not None:
+                return True
+            lock_file = open(self.path + '.lock', 'a+b')
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    lock_file.close()
+                    return False
+            self._owner_file = lock_file
+            return True
+
+    def is_owner(self) -> bool:
+        return self._owner_file is not None
+
+    def release_owner(self) -> None:
+        """Libère le rôle de propriétaire (un autre processus pourra le prendre)"""
+        with self._lock:
+            if self._owner_file is not None:
+                self._owner_file.close()
+                self._owner_file = None
+
+    # --- Accès au fichier ---
+
+    def _open(self, writable: bool) -> Optional[mmap.mmap]:
+        if self._map is not None and (self._writable or not writable):
+            return self._map
+        if writable:
+            self._close_map()
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._file = os.fdopen(fd, 'r+b')
+            if os.fstat(fd).st_size < self.size:
+                self._file.truncate(self.size)
+            self._map = mmap.mmap(fd, self.size, access=mmap.ACCESS_WRITE)
+            self._writable = True
+        else:
+            try:
+                self._file = open(self.path, 'rb')
+            except FileNotFoundError:
+                return None
+            file_size = os.fstat(self._file.fileno()).st_size
+            if file_size < HEADER_SIZE:
+                self._file.close()
+                self._file = None
+                return None
+            self._map = mmap.mmap(self._file.fileno(), file_size, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._writable = False
+
+    # --- Écriture ---
+
+    def publish(self, prices: Dict[str, Dict]) -> int:
+        """
+        Publie un nouveau snapshot (réservé au propriétaire)
+
+        Args:
+            prices (Dict): Données par crypto
+
+        Returns:
+            int: Nouvelle séquence (paire)
+        """
+        payload = encode_prices(prices)
+        if HEADER_SIZE + len(payload) > self.size:
+            raise ValueError(f"Snapshot trop volumineux ({len(payload)} octets)")
+
+        with self._lock:
+            mm = self._open(writable=True)
+            magic, _, seq, _, _ = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or seq % 2:
+                seq = seq + 1 if magic == MAGIC else 0
+            # Séquence impaire : écriture en cours
+            SEQ.pack_into(mm, SEQ_OFFSET, seq + 1)
+            mm[HEADER_SIZE:HEADER_SIZE + len(payload)] = payload
+            HEADER.pack_into(mm, 0, MAGIC, FORMAT_VERSION, seq + 1, time.time(), len(payload))
+            SEQ.pack_into(mm, SEQ_OFFSET, seq + 2)
+            self._stats['publishes'] += 1
+            return seq + 2
+
+    # --- Lecture ---
+
+    def sequence(self) -> int:
+        """Séquence courante (0 si rien n'a encore été publié)"""
+        with self._lock:
+            mm = self._open(writable=False)
+            if mm is None or mm[:4] != MAGIC:
+                return 0
+            return SEQ.unpack_from(mm, SEQ_OFFSET)[0]
+
+    def read(self) -> Tuple[int, Dict[str, Dict]]:
+        """
+        Lit le dernier snapshot complet
+
+        Les données ne sont décodées que si la séquence a changé depuis la
+        lecture précédente ; sinon la version déjà décodée est renvoyée.
+
+        Returns:
+            Tuple[int, Dict]: (séquence, données par crypto)
+        """
+        with self._lock:
+            mm = self._open(writable=False)
+            if mm is None:
+                return self._cached_seq, self._cached
+
+            for _ in range(READ_RETRIES):
+                magic, version, seq, published_at, length = HEADER.unpack_from(mm, 0)
+                if magic != MAGIC or version != FORMAT_VERSION or seq == 0:
+                    return self._cached_seq, self._cached
+                if seq == self._cached_seq:
+                    return seq, self._cached
+                if seq % 2:
+                    self._stats['retries'] += 1
+                    time.sleep(0)
+                    continue
+                try:
+                    data = decode_prices(memoryview(mm)[HEADER_SIZE:HEADER_SIZE + length])
+                except (ValueError, struct.error):
+                    data = None
+                if SEQ.unpack_from(mm, SEQ_OFFSET)[0] == seq and data is not None:
+                    self._cached_seq, self._cached, self._cached_at = seq, data, published_at
+                    self._stats['decodes'] += 1
+                    return seq, data
+                self._stats['retries'] += 1
+
+            # Écrivain trop actif : on garde la dernière version lue
+            return self._cached_seq, self._cached
+
+    def get(self, coin_id: str) -> Optional[Dict]:
+        """Données d'une crypto dans le dernier snapshot"""
+        return self.read()[1].get(coin_id)
+
+    def age(self) -> Optional[float]:
+        """Ancienneté (secondes) du dernier snapshot lu, None si aucun"""
+        self.read()
+        return None if self._cached_at is None else time.time() - self._cached_at
+
+    def stats(self) -> Dict:
+        """Rôle du processus, séquence lue et compteurs"""
+        return {
+            'path': self.path,
+            'owner': self.is_owner(),
+            'sequence': self._cached_seq,
+            'coins': len(self._cached),
+            **self._stats
+        }
+
+    def close(self) -> None:
+        """Ferme le fichier mappé et libère le rôle de propriétaire"""
+        with self._lock:
+            self._close_map()
+        self.release_owner()
@@ -0,0 +1,236 @@
+import contextvars
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from utils import metrics
+from utils.cache import TTLCache
+from utils.rate_budget import PRIORITIES, BudgetExhausted, current_priority
+
+# Caches partagés entre serveurs : durée du verrou de remplissage et attente
+# maximale de la valeur remplie par un autre serveur (secondes)
+FILL_LOCK_TTL = 10
+FILL_WAIT = 2
+FILL_POLL_INTERVAL = 0.05
+
+
+class FillInProgress(Exception):
+    """Un autre serveur remplit déjà cette clé : le rafraîchissement d'arrière-plan est abandonné"""
+
+
+class _Call:
+    """Appel en cours partagé par tous les appelants d'une même clé"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        # Priorité des appels amont de l'appel partagé (celle de l'appelant qui l'a lancé)
+        self.priority = current_priority()
+
+
+class SingleFlight:
+    """
+    Coalescence des requêtes concurrentes (single-flight)
+
+    Pour une clé donnée, un seul appel amont est exécuté à la fois : les
+    appelants concurrents attendent son résultat au lieu de lancer leur
+    propre requête (évite l'effet "thundering herd" à l'expiration du cache).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Exécute `fn` une seule fois pour tous les appelants concurrents de `key`
+
+        Args:
+            key (Hashable): Clé identifiant l'appel amont
+            fn (Callable): Fonction sans argument qui effectue l'appel
+
+        Returns:
+            Any: Résultat de `fn` (l'exception éventuelle est relancée
+            chez chaque appelant)
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is not None:
+                    self.shared += 1
+                    leader = False
+                else:
+                    call = _Call()
+                    self._calls[key] = call
+                    self.executions += 1
+                    leader = True
+
+            if leader:
+                self._run(key, call, fn)
+                break
+            call.done.wait()
+            if not self._retry_joined(call):
+                break
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _retry_joined(self, call: _Call) -> bool:
+        """Un appelant qui a rejoint `call` doit-il relancer l'appel avec sa propre `fn` ?"""
+        # Rafraîchissement d'arrière-plan abandonné : il n'a produit aucune valeur
+        if isinstance(call.error, FillInProgress):
+            return True
+        # Budget refusé à une priorité plus basse : l'appelant retente avec la sienne
+        return (isinstance(call.error, BudgetExhausted)
+                and PRIORITIES.index(current_priority()) < PRIORITIES.index(call.priority))
+
+    def do_async(self, key: Hashable, fn: Callable[[], Any],
+                 on_error: Optional[Callable[[BaseException], None]] = None) -> bool:
+        """
+        Lance `fn` dans un thread d'arrière-plan si aucun appel n'est en cours
+
+        L'erreur éventuelle reste celle de l'appel : un appelant de `do` qui le
+        rejoint la reçoit, `on_error` ne sert qu'à la signaler.
+
+        Args:
+            key (Hashable): Clé identifiant l'appel amont
+            fn (Callable): Fonction sans argument qui effectue l'appel
+            on_error (Callable): Appelée avec l'exception de `fn` (journalisation)
+
+        Returns:
+            bool: True si un rafraîchissement a été lancé, False s'il y en
+            avait déjà un en cours pour cette clé
+        """
+        with self._lock:
+            if key in self._calls:
+                self.shared += 1
+                return False
+            call = _Call()
+            self._calls[key] = call
+            self.executions += 1
+
+        # Le rafraîchissement garde le contexte de l'appelant (priorité des appels amont)
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(self._run_async, key, call, fn, on_error),
+                                  daemon=True)
+        thread.start()
+        return True
+
+    def _run_async(self, key: Hashable, call: _Call, fn: Callable[[], Any],
+                   on_error: Optional[Callable[[BaseException], None]]) -> None:
+        self._run(key, call, fn)
+        if call.error is not None and on_error is not None:
+            on_error(call.error)
+
+    def _run(self, key: Hashable, call: _Call, fn: Callable[[], Any]) -> None:
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Nombre d'appels amont actuellement en cours"""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict:
+        """
+        Retourne les compteurs de coalescence
+
+        Returns:
+            Dict: Appels exécutés, appels partagés et appels en cours
+        """
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'shared': self.shared,
+                'in_flight': len(self._calls)
+            }
+
+
+def fetch_with_cache(cache: TTLCache, flight: SingleFlight, key: Hashable,
+                     fetch: Callable[[], Any], ttl: float, stale_ttl: float = 0) -> Any:
+    """
+    Lecture du cache avec coalescence des misses et stale-while-revalidate
+
+    - entrée fraîche : retournée directement ;
+    - entrée expirée dans sa fenêtre stale : retournée immédiatement, un seul
+      rafraîchissement est lancé en arrière-plan ;
+    - absence : un seul appel amont, partagé par les appelants concurrents.
+
+    Avec un cache partagé (backend offrant `acquire`/`release`), la
+    coalescence s'étend à tous les serveurs : seul le détenteur du verrou de
+    remplissage appelle l'API amont, les autres attendent sa valeur.
+
+    Args:
+        cache (TTLCache): Cache partagé
+        flight (SingleFlight): Coalesceur des appels amont
+        key (Hashable): Clé de cache
+        fetch (Callable): Appel amont ; doit lever une exception en cas d'échec
+        ttl (float): Durée de vie des valeurs récupérées
+        stale_ttl (float): Fenêtre pendant laquelle une valeur expirée reste servie
+
+    Returns:
+        Any: Valeur fraîche ou périmée (l'exception de `fetch` est propagée
+        uniquement s'il n'existe aucune valeur à servir)
+    """
+    entry = cache.get_entry(key)
+    if entry is not None and entry[1]:
+        return entry[0]
+
+    def refresh():
+        value = fetch()
+        cache.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+        return value
+
+    if entry is not None:
+        flight.do_async(key, _coordinated(cache, key, refresh, wait=False), on_error=_log_refresh_error)
+        return entry[0]
+
+    return flight.do(key, _coordinated(cache, key, refresh, wait=True))
+
+
+def _coordinated(cache, key: Hashable, refresh: Callable[[], Any], wait: bool) -> Callable[[], Any]:
+    """
+    Enveloppe un remplissage avec le verrou partagé du cache, s'il en a un
+
+    Sans le verrou : en rafraîchissement d'arrière-plan (`wait=False`) on
+    laisse faire le serveur qui le détient ; sur un miss on attend sa valeur
+    au plus `FILL_WAIT` secondes avant d'appeler l'API soi-même.
+    """
+    if not hasattr(cache, 'acquire'):
+        return refresh
+
+    def run():
+        if cache.acquire(key, FILL_LOCK_TTL):
+            try:
+                return refresh()
+            finally:
+                cache.release(key)
+        if not wait:
+            raise FillInProgress(key)
+        deadline = time.monotonic() + FILL_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(FILL_POLL_INTERVAL)
+            entry = cache.get_entry(key)
+            if entry is not None:
+                return entry[0]
+        return refresh()
+
+    return run
+
+
+def _log_refresh_error(error: BaseException) -> None:
+    """Journalise l'échec d'un rafraîchissement d'arrière-plan"""
+    if isinstance(error, FillInProgress):
+        return
+    print(f"Erreur rafraîchissement cache: {error}")
+    metrics.record_error('cache_refresh')
@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence
+
+from utils.bloom import BloomFilter
+
+
+class QueryState:
+    """Curseurs d'une requête de recherche : dernier ID vu et pagination en cours"""
+
+    __slots__ = ('since_id', 'next_token', 'pending_newest_id')
+
+    def __init__(self, since_id: Optional[str] = None, next_token: Optional[str] = None,
+                 pending_newest_id: Optional[str] = None):
+        # Tweets plus récents que `since_id` : ceux qu'il reste à collecter
+        self.since_id = since_id
+        # Rattrapage interrompu : page suivante (plus ancienne) à demander, et
+        # nouveau `since_id` une fois le rattrapage terminé
+        self.next_token = next_token
+        self.pending_newest_id = pending_newest_id
+
+    def to_dict(self) -> Dict:
+        return {'since_id': self.since_id, 'next_token': self.next_token,
+                'pending_newest_id': self.pending_newest_id}
+
+
+class TwitterCollector:
+    """
+    Collecte incrémentale de /2/tweets/search/recent
+
+    Pour chaque requête, seuls les tweets postérieurs au dernier ID vu sont
+    demandés (`since_id`), page par page (`next_token`, au plus `max_pages`
+    pages par passage ; un rattrapage plus long reprend au passage suivant).
+    Les IDs vus sont gardés dans un filtre de Bloom : un tweet n'est scoré
+    qu'une fois, même s'il revient dans une page qui chevauche. Un passage
+    n'a lieu qu'une fois par `min_interval` : le quota amont et le scoring
+    suivent le volume de nouveaux tweets, pas le nombre de pages vues.
+
+    Le premier passage d'une requête ne lit qu'une page (pas de rattrapage
+    sur les 7 jours de l'API). Avec `state_path`, les curseurs et le filtre
+    sont enregistrés après chaque passage ayant collecté des tweets.
+    """
+
+    def __init__(self, fetch_page: Callable[[Dict], Dict], score_batch: Callable[[List[str]], List[float]],
+                 queries: Sequence[str], max_results: int = 100, max_pages: int = 3,
+                 min_interval: float = 15, recent_size: int = 100, seen: Optional[BloomFilter] = None,
+                 state_path: Optional[str] = None, clock: Callable[[], float] = time.monotonic):
+        self._fetch_page = fetch_page
+        self._score_batch = score_batch
+        self.queries = list(queries)
+        self.max_results = max(10, min(100, max_results))
+        self.max_pages = max(1, max_pages)
+        self.min_interval = min_interval
+        self.state_path = state_path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_poll: Optional[float] = None
+        self._seen = seen if seen is not None else BloomFilter()
+        self._states: Dict[str, QueryState] = {query: QueryState() for query in self.queries}
+        self._recent: Deque[Dict] = deque(maxlen=recent_size)
+        self._stats = {'polls': 0, 'requests': 0, 'fetched': 0, 'new': 0, 'duplicates': 0}
+        if state_path and os.path.exists(state_path):
+            self._load(state_path)
+
+    def _load(self, path: str) -> None:
+        try:
+            self._seen, extra = BloomFilter.load(path)
+        except (OSError, ValueError) as e:
+            print(f"État du collecteur Twitter illisible ({path}): {e}")
+            return
+        for query, state in extra.get('queries', {}).items():
+            if query in self._states:
+                self._states[query] = QueryState(**state)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Enregistre les curseurs et le filtre des IDs vus"""
+        path = path or self.state_path
+        with self._lock:
+            self._seen.save(path, {'queries': {query: state.to_dict() for query, state in self._states.items()}})
+
+    def poll_if_due(self) -> int:
+        """Lance un passage si le dernier date de plus de `min_interval` ; retourne les tweets ajoutés"""
+        with self._lock:
+            now = self._clock()
+            if self._last_poll is not None and now - self._last_poll < self.min_interval:
+                return 0
+            self._last_poll = now
+        return self.poll()
+
+    def poll(self) -> int:
+        """
+        Un passage sur toutes les requêtes
+
+        Returns:
+            int: Nombre de nouveaux tweets (scorés et ajoutés aux récents)
+        """
+        added = 0
+        for query in self.queries:
+            added += self._poll_query(query)
+        with self._lock:
+            self._stats['polls'] += 1
+        if added and self.state_path:
+            self.save()
+        return added
+
+    def _poll_query(self, query: str) -> int:
+        with self._lock:
+            state = self._states[query]
+            since_id, next_token, newest_id = state.since_id, state.next_token, state.pending_newest_id
+        first_run = since_id is None
+
+        tweets: List[Dict] = []
+        for _ in range(1 if first_run else self.max_pages):
+            params = {'query': query, 'max_results': self.max_results,
+                      'tweet.fields': 'created_at,author_id,public_metrics'}
+            if since_id:
+                params['since_id'] = since_id
+            if next_token:
+                params['next_token'] = next_token
+            page = self._fetch_page(params)
+            with self._lock:
+                self._stats['requests'] += 1
+            meta = page.get('meta', {})
+            tweets.extend(page.get('data', []))
+            if newest_id is None:
+                # La première page d'un parcours porte l'ID le plus récent
+                newest_id = meta.get('newest_id')
+            next_token = meta.get('next_token')
+            if not next_token:
+                break
+
+        with self._lock:
+            if next_token and not first_run:
+                # Rattrapage à poursuivre au prochain passage, avec le même since_id
+                self._states[query] = QueryState(since_id, next_token, newest_id)
+            else:
+                self._states[query] = QueryState(newest_id or since_id)
+            fresh = [tweet for tweet in tweets if self._seen.add(tweet['id'])]
+            self._stats['fetched'] += len(tweets)
+            self._stats['duplicates'] += len(tweets) - len(fresh)
+
+        if not fresh:
+            return 0
+        scores = self._score_batch([tweet['text'] for tweet in fresh])
+        collected = [{
+            'id': tweet['id'],
+            'text': tweet['text'],
+            'created_at': tweet.get('created_at', ''),
+            'author_id': tweet.get('author_id', 'unknown'),
+            'is_mock': False,
+            'score': score
+        } for tweet, score in zip(fresh, scores)]
+        with self._lock:
+            # Du plus ancien au plus récent (un rattrapage apporte des tweets plus anciens)
+            merged = sorted([*self._recent, *collected], key=lambda tweet: int(tweet['id']))
+            self._recent = deque(merged, maxlen=self._recent.maxlen)
+            self._stats['new'] += len(collected)
+        return len(collected)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict]:
+        """Derniers tweets collectés, du plus récent au plus ancien (avec leur `score`)"""
+        with self._lock:
+            tweets = list(reversed(self._recent))
+        return tweets[:limit] if limit else tweets
+
+    def stats(self) -> Dict:
+        """
+        Retourne les compteurs du collecteur
+
+        Returns:
+            Dict: Passages, requêtes amont, tweets reçus, nouveaux (les seuls
+                scorés) et doublons, taille du filtre des IDs vus
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['seen'] = len(self._seen)
+            stats['seen_bytes'] = self._seen.nbytes
+            stats['backfilling'] = sum(1 for state in self._states.values() if state.next_token)
+        return stats